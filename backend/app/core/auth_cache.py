@@ -0,0 +1,90 @@
+# app/core/auth_cache.py
+"""
+Caché en memoria de los usuarios autenticados.
+
+`get_current_user` valida el JWT en cada petición; con esta caché los datos
+del usuario (id, rol, activo...) se leen de la base de datos solo una vez
+por TTL en lugar de en cada petición. Cada entrada guarda la versión de la
+tabla `users` del almacén compartido de app.core.cache y solo se sirve
+mientras no cambie, así que un usuario desactivado o con otro rol deja de
+estar en caché en todos los procesos en cuanto se confirma el cambio, sea
+cual sea el worker que lo hizo.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+from fastapi.concurrency import run_in_threadpool
+from app.core.cache import table_versions
+from app.core.security import ACCESS_TOKEN_EXPIRE_MINUTES
+from app.schemas.user import UserOut
+
+# El TTL nunca supera la vida de un token
+AUTH_CACHE_TTL = min(float(os.getenv("AUTH_CACHE_TTL", 60)), ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", 1024))
+
+class PrincipalCache:
+    """LRU con caducidad por entrada, segura entre hilos."""
+
+    def __init__(self, maxsize: int = AUTH_CACHE_SIZE, ttl: float = AUTH_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, username: str, version: int) -> Optional[UserOut]:
+        """Usuario guardado si no ha caducado y `users` sigue en `version`."""
+        with self._lock:
+            entry = self._entries.get(username)
+            if entry is None or entry[1] <= time.monotonic() or entry[2] != version:
+                if entry is not None:
+                    del self._entries[username]
+                    if entry[2] != version:
+                        self.invalidations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(username)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, username: str, principal: UserOut, version: int):
+        with self._lock:
+            self._entries[username] = (principal, time.monotonic() + self.ttl, version)
+            self._entries.move_to_end(username)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, username: Optional[str] = None):
+        """Elimina un usuario de la caché, o todos si no se indica ninguno."""
+        with self._lock:
+            if username is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(username, None)
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+            }
+
+principal_cache = PrincipalCache()
+
+async def users_version() -> int:
+    """
+    Versión actual de la tabla `users`. Se lee antes de consultar al usuario:
+    si un commit llega entre medias, la entrada queda ya invalidada.
+    """
+    if table_versions.remote:
+        return (await run_in_threadpool(table_versions.get, ("users",)))[0]
+    return table_versions.get(("users",))[0]
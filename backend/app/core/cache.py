@@ -0,0 +1,378 @@
+# app/core/cache.py
+"""
+Contadores de versión por tabla y resultados cacheados que dependen de ellos.
+
+Cada commit que escribe en una tabla incrementa su versión. Un resultado se
+guarda junto a las versiones de las tablas de las que depende y solo se
+sirve mientras esas versiones no cambien, así que la invalidación es
+exacta y no depende de un TTL:
+
+    @cached("projects", "teams")
+    def get_programmers_by_framework(db, framework): ...
+
+Las escrituras se detectan en la sesión: los objetos del flush (after_flush)
+y las sentencias INSERT/UPDATE/DELETE ejecutadas con `session.execute`
+(importaciones masivas, `query.update`). Se aplican al confirmar la
+transacción y se descartan si se deshace.
+
+Las versiones se guardan fuera del proceso, junto a la base de datos: en un
+fichero SQLite al lado del de la base (app.db → app.versions.db) o, con un
+servidor de base de datos, en una tabla de la propia base. Así las ven todos
+los procesos que escriben: los workers de uvicorn y las herramientas de
+línea de órdenes como app.utils.bulk_import. Cada proceso mantiene sus
+propios resultados, pero ninguno sirve uno calculado antes de un commit
+hecho en otro. CACHE_VERSION_STORE cambia el almacén (una ruta o una URL de
+SQLAlchemy); `memory` deja las versiones en el proceso, solo válido si es
+el único que escribe.
+"""
+import functools
+import os
+import sqlite3
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Iterable, Optional, Tuple
+from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine, event, inspect, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import ONETOMANY, Session, make_transient_to_detached
+from sqlalchemy.orm.state import InstanceState
+
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 1024))  # 0 desactiva la caché
+CACHE_VERSION_STORE = os.getenv("CACHE_VERSION_STORE")  # por defecto, junto a DATABASE_URL
+
+_PENDING_KEY = "cache_pending_tables"
+
+class TableVersions:
+    """
+    Versión de cada tabla en este proceso (bases en memoria o
+    CACHE_VERSION_STORE=memory). La época distingue las versiones de este
+    arranque de las de uno anterior, que también empezaban en 0.
+    """
+
+    # Leer las versiones no sale de la máquina (no hace falta un hilo aparte)
+    remote = False
+
+    def __init__(self):
+        self.epoch = uuid.uuid4().hex[:8]
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, tables: Iterable[str]) -> Tuple[int, ...]:
+        with self._lock:
+            return tuple(self._versions.get(table, 0) for table in tables)
+
+    def bump(self, tables: Iterable[str]):
+        with self._lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+
+class SharedTableVersions(TableVersions):
+    """Versiones guardadas en un fichero SQLite compartido entre procesos."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._epoch = None
+
+    def _connection(self) -> sqlite3.Connection:
+        # El fichero se abre en el primer uso: importar el módulo no lo crea
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # autocommit: cada incremento es visible para los demás procesos al instante
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+            if self._epoch is None:
+                self._prepare(conn)
+        return conn
+
+    def _prepare(self, conn: sqlite3.Connection):
+        with self._lock:
+            if self._epoch is not None:
+                return
+            conn.execute("CREATE TABLE IF NOT EXISTS table_versions (name TEXT PRIMARY KEY, version INTEGER NOT NULL)")
+            # La época se guarda con las versiones: es la misma en todos los procesos
+            conn.execute("CREATE TABLE IF NOT EXISTS store_epoch (epoch TEXT NOT NULL)")
+            conn.execute(
+                "INSERT INTO store_epoch (epoch) SELECT ? WHERE NOT EXISTS (SELECT 1 FROM store_epoch)",
+                (uuid.uuid4().hex[:8],),
+            )
+            self._epoch = conn.execute("SELECT epoch FROM store_epoch").fetchone()[0]
+
+    @property
+    def epoch(self) -> str:
+        self._connection()
+        return self._epoch
+
+    def get(self, tables: Iterable[str]) -> Tuple[int, ...]:
+        tables = tuple(tables)
+        placeholders = ", ".join("?" * len(tables))
+        rows = dict(self._connection().execute(
+            f"SELECT name, version FROM table_versions WHERE name IN ({placeholders})", tables
+        ))
+        return tuple(rows.get(table, 0) for table in tables)
+
+    def bump(self, tables: Iterable[str]):
+        self._connection().executemany(
+            "INSERT INTO table_versions (name, version) VALUES (?, 1) "
+            "ON CONFLICT(name) DO UPDATE SET version = version + 1",
+            [(table,) for table in tables],
+        )
+
+class DatabaseTableVersions(TableVersions):
+    """
+    Versiones en una tabla de un servidor de base de datos (PostgreSQL),
+    para workers repartidos en varias máquinas.
+    """
+
+    remote = True
+
+    def __init__(self, url: str):
+        self.url = url
+        self._engine = None
+        self._epoch = None
+        self._lock = threading.Lock()
+        metadata = MetaData()
+        self._versions = Table(
+            "cache_table_versions", metadata,
+            Column("name", String, primary_key=True),
+            Column("version", Integer, nullable=False),
+        )
+        self._epochs = Table("cache_store_epoch", metadata, Column("epoch", String, primary_key=True))
+        self._metadata = metadata
+
+    def _connect(self):
+        # Se conecta en el primer uso: importar el módulo no abre conexiones
+        with self._lock:
+            if self._engine is None:
+                engine = create_engine(self.url, pool_pre_ping=True)
+                self._metadata.create_all(engine)
+                with engine.begin() as conn:
+                    epoch = conn.execute(select(self._epochs.c.epoch)).scalar()
+                    if epoch is None:
+                        epoch = uuid.uuid4().hex[:8]
+                        conn.execute(self._epochs.insert().values(epoch=epoch))
+                self._epoch = epoch
+                self._engine = engine
+        return self._engine
+
+    @property
+    def epoch(self) -> str:
+        self._connect()
+        return self._epoch
+
+    def get(self, tables: Iterable[str]) -> Tuple[int, ...]:
+        tables = tuple(tables)
+        with self._connect().connect() as conn:
+            rows = dict(conn.execute(
+                select(self._versions.c.name, self._versions.c.version).where(self._versions.c.name.in_(tables))
+            ).all())
+        return tuple(rows.get(table, 0) for table in tables)
+
+    def bump(self, tables: Iterable[str]):
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+        statement = pg_insert(self._versions).on_conflict_do_update(
+            index_elements=[self._versions.c.name], set_={"version": self._versions.c.version + 1}
+        )
+        with self._connect().begin() as conn:
+            conn.execute(statement, [{"name": table, "version": 1} for table in sorted(tables)])
+
+def default_version_store(database_url: str) -> str:
+    """Almacén de versiones junto a la base de datos de `database_url`."""
+    url = make_url(database_url)
+    if url.get_backend_name() != "sqlite":
+        return database_url
+    if url.database in (None, "", ":memory:"):
+        # Solo la ve este proceso: las versiones tampoco necesitan salir de él
+        return "memory"
+    root, _ = os.path.splitext(url.database)
+    return root + ".versions.db"
+
+def open_version_store(store: str) -> TableVersions:
+    if store == "memory":
+        return TableVersions()
+    if "://" not in store:
+        return SharedTableVersions(store)
+    url = make_url(store)
+    if url.get_backend_name() == "sqlite":
+        return SharedTableVersions(url.database)
+    return DatabaseTableVersions(store)
+
+table_versions = open_version_store(
+    CACHE_VERSION_STORE or default_version_store(os.getenv("DATABASE_URL", "sqlite:///./app.db"))
+)
+
+# ─── Resultados cacheados ───
+
+class ResultCache:
+    """LRU de (versiones, resultado), segura entre hilos."""
+
+    def __init__(self, maxsize: int = CACHE_MAX_ENTRIES):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, versions: Tuple[int, ...]):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != versions:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: Hashable, versions: Tuple[int, ...], value):
+        with self._lock:
+            self._entries[key] = (versions, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._entries), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+result_cache = ResultCache()
+
+def _detach(value):
+    """
+    Copia los objetos ORM del resultado como instancias separadas de la
+    sesión, con solo sus columnas: así la entrada no depende de la sesión
+    que la calculó (ni de que esta los expire al confirmar).
+    """
+    if isinstance(value, list):
+        return [_detach(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_detach(item) for item in value)
+    if isinstance(value, dict):
+        return {key: _detach(item) for key, item in value.items()}
+    state = inspect(value, raiseerr=False)
+    if not isinstance(state, InstanceState) or state.key is None:
+        return value
+    copy = state.mapper.class_manager.new_instance()
+    copy.__dict__.update(
+        (attr.key, state.dict[attr.key]) for attr in state.mapper.column_attrs if attr.key in state.dict
+    )
+    make_transient_to_detached(copy)
+    return copy
+
+def _attach(session: Session, value):
+    """Incorpora a `session` (sin consultas) los objetos ORM de una entrada."""
+    if isinstance(value, list):
+        return [_attach(session, item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_attach(session, item) for item in value)
+    if isinstance(value, dict):
+        return {key: _attach(session, item) for key, item in value.items()}
+    if isinstance(inspect(value, raiseerr=False), InstanceState):
+        return session.merge(value, load=False)
+    return value
+
+def cached_result(key: Hashable, tables: Tuple[str, ...], compute: Callable[[], object],
+                  session: Optional[Session] = None):
+    """
+    Devuelve el resultado guardado para `key` si ninguna de `tables` ha
+    cambiado desde que se calculó; si no, lo calcula y lo guarda.
+
+    Con `session`, los objetos ORM del resultado se devuelven incorporados a
+    ella, y la caché no se usa si la sesión tiene escrituras sin confirmar
+    en `tables` (debe ver sus propios cambios).
+    """
+    if result_cache.maxsize <= 0:
+        return compute()
+    if session is not None and (
+        session.new or session.dirty or session.deleted
+        or not _pending(session).isdisjoint(tables)
+    ):
+        return compute()
+
+    # Las versiones se leen antes de calcular: si un commit llega durante
+    # el cálculo, el resultado queda guardado con versiones ya superadas.
+    versions = table_versions.get(tables)
+    entry = result_cache.get(key, versions)
+    if entry is not None:
+        return _attach(session, entry[1]) if session is not None else entry[1]
+
+    # Si la transacción de la sesión ya estaba abierta, su instantánea puede
+    # ser anterior a las versiones leídas: se calcula pero no se guarda.
+    store = session is None or not session.in_transaction()
+    value = compute()
+    if store:
+        result_cache.put(key, versions, _detach(value) if session is not None else value)
+    return value
+
+def cached(*tables: str):
+    """
+    Cachea una función `func(db, *args, **kwargs)` por nombre y argumentos
+    hasta el próximo commit que escriba en alguna de `tables`.
+    """
+    def decorator(func):
+        name = f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(db, *args, **kwargs):
+            key = (name, args, tuple(sorted(kwargs.items())))
+            return cached_result(key, tables, lambda: func(db, *args, **kwargs), session=db)
+
+        wrapper.uncached = func
+        return wrapper
+    return decorator
+
+# ─── Detección de escrituras ───
+
+def _pending(session: Session) -> set:
+    return session.info.setdefault(_PENDING_KEY, set())
+
+def _flushed_tables(obj, created_or_deleted: bool) -> set:
+    state = inspect(obj)
+    # Con herencia por tablas (workers → programmers) son varias
+    tables = {table.name for table in state.mapper.tables}
+    for rel in state.mapper.relationships:
+        if rel.secondary is None and rel.direction is not ONETOMANY:
+            continue
+        if created_or_deleted or state.attrs[rel.key].history.has_changes():
+            # Filas de la tabla de asociación, o la clave ajena del otro lado
+            # (varias tablas si el destino usa herencia: team → programmers)
+            if rel.secondary is not None:
+                tables.add(rel.secondary.name)
+            else:
+                tables.update(table.name for table in rel.mapper.tables)
+    return tables
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_tables(session, flush_context):
+    pending = _pending(session)
+    for obj in session.dirty:
+        pending.update(_flushed_tables(obj, False))
+    for obj in list(session.new) + list(session.deleted):
+        pending.update(_flushed_tables(obj, True))
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_statement_tables(orm_execute_state):
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    pending = _pending(orm_execute_state.session)
+    for mapper in orm_execute_state.all_mappers:
+        pending.update(table.name for table in mapper.tables)
+    table = getattr(orm_execute_state.statement, "table", None)
+    if table is not None and getattr(table, "name", None):
+        pending.add(table.name)
+
+@event.listens_for(Session, "after_commit")
+def _bump_committed_tables(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        table_versions.bump(pending)
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending_tables(session, previous_transaction):
+    session.info.pop(_PENDING_KEY, None)
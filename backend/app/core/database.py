@@ -1,21 +1,263 @@
 # app/core/database.py
-from sqlalchemy import create_engine
+import hashlib
+import os
+from datetime import datetime
+from functools import lru_cache
+from sqlalchemy import Column, DateTime, String, Table, create_engine, event, inspect, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool, StaticPool
+from sqlalchemy.schema import CreateColumn, CreateIndex, CreateTable
+from typing import AsyncGenerator, Dict, Generator, Optional
+# Registra en todas las sesiones la detección de escrituras de la caché
+from app.core import cache  # noqa: F401
+from app.core.metrics import instrument_pool, timed_pool_class
+from app.core.sql_timing import instrument_engine
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./app.db"  # Adjust if your URL is different
+SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./app.db")
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
+# Driver asíncrono equivalente a cada driver síncrono
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
+# Hilos del threadpool de la API (por defecto 40 en anyio). El pool de
+# conexiones se dimensiona igual para que ningún hilo espere una conexión.
+THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", 40))
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", THREADPOOL_SIZE))
+# Con 0 el arranque solo comprueba el esquema y la migración se hace aparte
+# (python -m app.migrate), p. ej. antes de levantar varios workers
+MIGRATE_ON_STARTUP = os.getenv("MIGRATE_ON_STARTUP", "1") == "1"
+
+# Conexiones extra para trabajos en segundo plano y respuestas en streaming
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+# El motor asíncrono no depende del threadpool; con aiosqlite cada conexión
+# es además un hilo propio.
+ASYNC_DB_POOL_SIZE = int(os.getenv("ASYNC_DB_POOL_SIZE", THREADPOOL_SIZE))
+
+# Perfiles de PRAGMA aplicados a cada conexión SQLite nueva
+SQLITE_PROFILES: Dict[str, Dict[str, object]] = {
+    # Comportamiento original de SQLite
+    "default": {},
+    "production": {
+        "journal_mode": "WAL",  # los lectores no se bloquean durante un commit
+        "synchronous": "NORMAL",  # con WAL no se pierde integridad, solo el último commit ante un corte de luz
+        "cache_size": int(os.getenv("SQLITE_CACHE_SIZE", -64000)),  # negativo = KiB (64 MiB)
+        "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", 256 * 1024 * 1024)),
+        "temp_store": "MEMORY",
+        "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT", 5000)),  # ms
+        "foreign_keys": "ON",
+    },
+}
+SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", "production")
+
+def _sqlite_pragmas(url, profile: str) -> Dict[str, object]:
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f"Perfil de SQLite no válido: {profile}")
+    pragmas = dict(SQLITE_PROFILES[profile])
+    if url.database in (None, "", ":memory:"):
+        # WAL y mmap no se aplican a bases de datos en memoria
+        pragmas.pop("journal_mode", None)
+        pragmas.pop("mmap_size", None)
+    return pragmas
+
+def make_engine(url: str = SQLALCHEMY_DATABASE_URL, profile: str = SQLITE_PROFILE):
+    """
+    Crea el motor de la aplicación. Con SQLite aplica los PRAGMA del perfil
+    al abrir cada conexión; con otros motores solo dimensiona el pool.
+    """
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "sqlite":
+        engine = create_engine(
+            url, poolclass=timed_pool_class(QueuePool),
+            pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW, pool_pre_ping=True,
+        )
+        instrument_engine(engine)
+        return engine
+
+    connect_args = {"check_same_thread": False}
+    if parsed.database in (None, "", ":memory:"):
+        # Una sola conexión compartida; si no, cada conexión vería una base vacía
+        engine = create_engine(url, connect_args=connect_args, poolclass=StaticPool)
+    else:
+        engine = create_engine(
+            url, connect_args=connect_args, poolclass=timed_pool_class(QueuePool),
+            pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW,
+        )
+
+    _set_pragmas_on_connect(engine, _sqlite_pragmas(parsed, profile))
+    instrument_engine(engine)
+    return engine
+
+def _set_pragmas_on_connect(engine, pragmas: Dict[str, object]):
+    if not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+def async_url(url: str) -> str:
+    """URL con el driver asíncrono del mismo motor (sqlite+aiosqlite, postgresql+asyncpg)."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No hay driver asíncrono configurado para {backend}")
+    return parsed.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+def make_async_engine(url: str = SQLALCHEMY_DATABASE_URL, profile: str = SQLITE_PROFILE):
+    """Motor asíncrono sobre la misma base de datos y con el mismo perfil."""
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "sqlite":
+        engine = create_async_engine(
+            async_url(url), poolclass=timed_pool_class(AsyncAdaptedQueuePool),
+            pool_size=ASYNC_DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW, pool_pre_ping=True,
+        )
+        instrument_engine(engine.sync_engine)
+        return engine
+    if parsed.database in (None, "", ":memory:"):
+        engine = create_async_engine(async_url(url), poolclass=StaticPool)
+    else:
+        engine = create_async_engine(
+            async_url(url), poolclass=timed_pool_class(AsyncAdaptedQueuePool),
+            pool_size=ASYNC_DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW,
+        )
+    _set_pragmas_on_connect(engine.sync_engine, _sqlite_pragmas(parsed, profile))
+    instrument_engine(engine.sync_engine)
+    return engine
+
+@lru_cache(maxsize=None)
+def get_async_sessionmaker():
+    """
+    Fábrica de AsyncSession, creada al primer uso para que el driver
+    asíncrono solo sea necesario si se usan endpoints asíncronos.
+    """
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    # expire_on_commit=False: tras el commit la respuesta se serializa sin
+    # volver a consultar la base de datos.
+    async_engine = make_async_engine()
+    instrument_pool(async_engine.sync_engine, "async")
+    return async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+engine = make_engine()
+instrument_pool(engine, "sync")
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
+# Huella del esquema de los modelos aplicada en la última migración
+schema_version = Table(
+    "schema_version",
+    Base.metadata,
+    Column("fingerprint", String, primary_key=True),
+    Column("applied_at", DateTime, nullable=False),
+)
+
 # Add this function to create all tables
-def create_tables():
-    Base.metadata.create_all(bind=engine)
+def create_tables(bind=None):
+    bind = bind or engine
+    Base.metadata.create_all(bind=bind)
+    # create_all no añade columnas ni índices a tablas que ya existían
+    add_missing_columns(bind)
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=bind, checkfirst=True)
+    update_statistics(bind)
+
+def add_missing_columns(bind=None):
+    """
+    Añade con ALTER TABLE las columnas nuevas de los modelos. Solo admite
+    columnas que aceptan NULL: las filas existentes no tienen valor.
+    """
+    bind = bind or engine
+    with bind.begin() as connection:
+        inspector = inspect(connection)
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                if not column.nullable:
+                    raise RuntimeError(f"No se puede añadir la columna obligatoria {table.name}.{column.name}")
+                ddl = CreateColumn(column).compile(dialect=connection.dialect)
+                name = connection.dialect.identifier_preparer.format_table(table)
+                connection.exec_driver_sql(f"ALTER TABLE {name} ADD COLUMN {ddl}")
+
+def update_statistics(bind=None):
+    """
+    Estadísticas del planificador de SQLite. Sin ellas, en las uniones de
+    varias tablas SQLite puede preferir recorrer una tabla entera a usar
+    un índice. La primera vez se ejecuta ANALYZE; después, PRAGMA optimize
+    solo vuelve a analizar las tablas que lo necesitan.
+    """
+    bind = bind or engine
+    if bind.dialect.name != "sqlite":
+        return
+    with bind.begin() as connection:
+        analyzed = connection.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+        ).first()
+        connection.exec_driver_sql("PRAGMA optimize" if analyzed else "ANALYZE")
+
+def schema_fingerprint(bind=None) -> str:
+    """Huella del DDL de todas las tablas e índices declarados en los modelos."""
+    bind = bind or engine
+    # Registra en Base.metadata todas las tablas
+    import app.models  # noqa: F401
+    import app.models.user  # noqa: F401
+
+    ddl = []
+    for table in Base.metadata.sorted_tables:
+        ddl.append(str(CreateTable(table).compile(dialect=bind.dialect)))
+        for index in sorted(table.indexes, key=lambda index: index.name or ""):
+            ddl.append(str(CreateIndex(index).compile(dialect=bind.dialect)))
+    return hashlib.blake2b("\n".join(ddl).encode(), digest_size=16).hexdigest()
+
+def current_schema_version(bind=None) -> Optional[str]:
+    bind = bind or engine
+    with bind.connect() as connection:
+        if not inspect(connection).has_table(schema_version.name):
+            return None
+        return connection.execute(select(schema_version.c.fingerprint)).scalar()
+
+def migrate(bind=None) -> bool:
+    """
+    Crea las tablas e índices que falten si los modelos cambiaron desde la
+    última migración (o la base está vacía). Devuelve si hubo cambios.
+    """
+    bind = bind or engine
+    fingerprint = schema_fingerprint(bind)
+    if current_schema_version(bind) == fingerprint:
+        return False
+    try:
+        create_tables(bind)
+    except DBAPIError:
+        # Otro proceso migró a la vez y creó antes alguna tabla
+        if current_schema_version(bind) == fingerprint:
+            return False
+        raise
+    with bind.begin() as connection:
+        connection.execute(schema_version.delete())
+        connection.execute(schema_version.insert().values(fingerprint=fingerprint, applied_at=datetime.utcnow()))
+    return True
+
+def prepare_schema(bind=None):
+    """
+    Comprobación del esquema al arrancar: una consulta si está al día. Con
+    MIGRATE_ON_STARTUP=0 un esquema desactualizado impide arrancar.
+    """
+    if MIGRATE_ON_STARTUP:
+        migrate(bind)
+    elif current_schema_version(bind) != schema_fingerprint(bind):
+        raise RuntimeError("El esquema de la base de datos no está al día: ejecuta python -m app.migrate")
 
 def get_db() -> Generator[Session, None, None]:
     db = SessionLocal()
@@ -23,3 +265,12 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+async def get_async_db() -> AsyncGenerator:
+    """
+    Sesión asíncrona para endpoints `async def`: las consultas no bloquean
+    el bucle de eventos. El código CRUD síncrono se reutiliza con
+    `await db.run_sync(funcion, *args)`.
+    """
+    async with get_async_sessionmaker()() as db:
+        yield db
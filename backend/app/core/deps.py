@@ -1,23 +1,27 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import jwt, JWTError
-from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.models.user import User
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.auth_cache import principal_cache, users_version
+from app.core.database import get_async_db
 from app.crud.user import get_user_by_username
 from app.core.security import SECRET_KEY, ALGORITHM
-from app.schemas.user import TokenPayload
+from app.schemas.user import TokenPayload, UserOut
+from app.utils.schema_utils import orm_to_dict
 
 # Configuración del endpoint de token
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 async def get_current_user(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     token: str = Depends(oauth2_scheme)
-) -> User:
+) -> UserOut:
     """
-    Obtiene el usuario actual basado en el token JWT
+    Obtiene el usuario actual basado en el token JWT. Los datos del usuario
+    se sirven desde `principal_cache` mientras no caduquen o cambien.
     """
+    # python-jose se carga con la primera petición autenticada
+    from jose import JWTError, jwt
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="No se pudieron validar las credenciales",
@@ -32,9 +36,14 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
         
-    user = get_user_by_username(db, username=token_data.sub)
+    version = await users_version()
+    user = principal_cache.get(token_data.sub, version)
     if user is None:
-        raise credentials_exception
+        db_user = await db.run_sync(get_user_by_username, token_data.sub)
+        if db_user is None:
+            raise credentials_exception
+        user = UserOut(**orm_to_dict(UserOut, db_user))
+        principal_cache.put(token_data.sub, user, version)
     if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -42,7 +51,7 @@ async def get_current_user(
         )
     return user
 
-async def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
+async def get_current_active_user(current_user: UserOut = Depends(get_current_user)) -> UserOut:
     """
     Verifica que el usuario actual está activo
     """
@@ -53,7 +62,7 @@ async def get_current_active_user(current_user: User = Depends(get_current_user)
         )
     return current_user
 
-def get_current_admin_user(current_user: User = Depends(get_current_active_user)) -> User:
+def get_current_admin_user(current_user: UserOut = Depends(get_current_active_user)) -> UserOut:
     """
     Verifica que el usuario actual tiene rol de administrador
     """
@@ -0,0 +1,82 @@
+# app/core/hashing.py
+"""
+Hash y verificación de contraseñas en un pool de procesos.
+
+bcrypt consume unos 250 ms de CPU por llamada con el GIL tomado; ejecutado
+en el threadpool, una ráfaga de inicios de sesión deja sin hilos al resto
+de endpoints. Aquí cada cálculo va a un proceso aparte, con un límite de
+operaciones simultáneas y una cola acotada: si la cola se llena se responde
+503 en lugar de acumular peticiones.
+"""
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+from fastapi import HTTPException, status
+from app.core import security
+
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", os.cpu_count() or 1))
+HASH_CONCURRENCY = int(os.getenv("HASH_CONCURRENCY", HASH_WORKERS))
+HASH_MAX_QUEUE = int(os.getenv("HASH_MAX_QUEUE", 256))
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+_semaphore: Optional[asyncio.Semaphore] = None
+_stats = {"in_flight": 0, "waiting": 0, "max_waiting": 0, "completed": 0, "rejected": 0}
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # spawn: el proceso de la API tiene hilos (threadpool, aiosqlite)
+            # y un fork podría heredar un lock tomado
+            _executor = ProcessPoolExecutor(
+                max_workers=HASH_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _executor
+
+async def _run(func, *args):
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(HASH_CONCURRENCY)
+    if _semaphore.locked() and _stats["waiting"] >= HASH_MAX_QUEUE:
+        _stats["rejected"] += 1
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Demasiadas peticiones de autenticación, inténtalo de nuevo",
+            headers={"Retry-After": "1"},
+        )
+
+    _stats["waiting"] += 1
+    _stats["max_waiting"] = max(_stats["max_waiting"], _stats["waiting"])
+    try:
+        await _semaphore.acquire()
+    finally:
+        _stats["waiting"] -= 1
+    _stats["in_flight"] += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_executor(), func, *args)
+    finally:
+        _stats["in_flight"] -= 1
+        _stats["completed"] += 1
+        _semaphore.release()
+
+async def hash_password(password: str) -> str:
+    return await _run(security.get_password_hash, password)
+
+async def verify_password(password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """(válida, hash nuevo si el coste configurado cambió)"""
+    return await _run(security.verify_and_update_password, password, hashed_password)
+
+def stats() -> Dict[str, int]:
+    return {**_stats, "workers": HASH_WORKERS, "concurrency": HASH_CONCURRENCY, "max_queue": HASH_MAX_QUEUE}
+
+def shutdown():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
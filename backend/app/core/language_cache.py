@@ -0,0 +1,99 @@
+# app/core/language_cache.py
+"""
+Caché de la tabla `languages` (nombre -> id) compartida por todo el proceso.
+
+La tabla es pequeña y solo crece: se carga entera al arrancar y se amplía
+con cada lenguaje nuevo. Los nombres que no están en la caché se resuelven
+con dos sentencias sea cual sea su número: un INSERT que ignora los nombres
+ya existentes (otra petición puede estar creando el mismo lenguaje; con la
+restricción UNIQUE un INSERT normal fallaría) y un SELECT ... IN de sus ids.
+
+Los ids leídos dentro de una transacción se publican en la caché tras su
+commit y se descartan si hay rollback, igual que las versiones de tabla de
+app.core.cache.
+"""
+import threading
+from typing import Dict, Iterable
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session
+from app.core.database import SessionLocal
+from app.models.worker import Language
+
+_PENDING_KEY = "language_cache_pending"
+
+class LanguageCache:
+    """Diccionario nombre -> id de lenguajes, seguro entre hilos."""
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, db: Session):
+        """Carga la tabla entera."""
+        ids = dict(db.query(Language.name, Language.id).all())
+        self.publish(ids)
+
+    def publish(self, ids: Dict[str, int]):
+        with self._lock:
+            self._ids.update(ids)
+
+    def resolve(self, db: Session, names: Iterable[str]) -> Dict[str, int]:
+        """
+        Ids de `names`, creando en la transacción de `db` los lenguajes que
+        no existan todavía.
+        """
+        names = set(names)
+        with self._lock:
+            ids = {name: self._ids[name] for name in names if name in self._ids}
+            self.hits += len(ids)
+            self.misses += len(names) - len(ids)
+        # Resueltos antes en esta misma transacción, aún sin publicar
+        pending = db.info.get(_PENDING_KEY, {})
+        ids.update((name, pending[name]) for name in names - ids.keys() if name in pending)
+
+        missing = names - ids.keys()
+        if missing:
+            db.execute(_insert_ignoring_duplicates(db), [{"name": name} for name in sorted(missing)])
+            found = dict(db.query(Language.name, Language.id).filter(Language.name.in_(missing)).all())
+            db.info.setdefault(_PENDING_KEY, {}).update(found)
+            ids.update(found)
+        return ids
+
+    def clear(self):
+        with self._lock:
+            self._ids.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._ids), "hits": self.hits, "misses": self.misses}
+
+language_cache = LanguageCache()
+
+def _insert_ignoring_duplicates(db: Session):
+    table = Language.__table__
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        # Sin INSERT ... ON CONFLICT: la restricción UNIQUE decide
+        return insert(table)
+    return dialect_insert(table).on_conflict_do_nothing(index_elements=[table.c.name])
+
+def warm():
+    """Carga la caché al arrancar el proceso."""
+    with SessionLocal() as db:
+        language_cache.load(db)
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        language_cache.publish(pending)
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending(session, previous_transaction):
+    session.info.pop(_PENDING_KEY, None)
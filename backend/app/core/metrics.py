@@ -0,0 +1,272 @@
+# app/core/metrics.py
+"""
+Métricas del proceso en el formato de texto de Prometheus, sin dependencias
+ni servicios externos.
+
+`MetricsMiddleware` cuenta las peticiones y su latencia por método y plantilla
+de ruta (`/workers/programmers/{programmer_id}`, no la URL concreta), así que
+cualquier router incluido en app.main queda instrumentado sin tocarlo. El
+resto (pool de conexiones, threadpool, cola de bcrypt, cachés) se lee en el
+momento de servir `/metrics`.
+
+El middleware y `render` corren en el bucle de eventos, de modo que las
+métricas de rutas no necesitan cerrojo; la espera del pool se observa desde
+los hilos del threadpool y sí lo usa.
+"""
+import functools
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Si se define, /metrics exige `Authorization: Bearer <METRICS_TOKEN>`
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+# Segundos
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+POOL_WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+class Histogram:
+    """Histograma de buckets fijos; los acumulados se calculan al exportar."""
+
+    __slots__ = ("buckets", "counts", "sum", "count", "_lock")
+
+    def __init__(self, buckets: Tuple[float, ...], lock: bool = False):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # el último es +Inf
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock() if lock else None
+
+    def observe(self, value: float):
+        if self._lock is None:
+            self._observe(value)
+        else:
+            with self._lock:
+                self._observe(value)
+
+    def _observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self, name: str, labels: str) -> Iterable[str]:
+        prefix = labels + "," if labels else ""
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            yield f'{name}_bucket{{{prefix}le="{bound}"}} {cumulative}'
+        yield f'{name}_bucket{{{prefix}le="+Inf"}} {self.count}'
+        braces = f"{{{labels}}}" if labels else ""
+        yield f"{name}_sum{braces} {self.sum}"
+        yield f"{name}_count{braces} {self.count}"
+
+class RouteStats:
+    __slots__ = ("latency", "statuses")
+
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.statuses: Dict[int, int] = {}
+
+# (método, plantilla de ruta) -> estadísticas
+_routes: Dict[Tuple[str, str], RouteStats] = {}
+_in_progress = 0
+
+# Motores cuyo pool se exporta: nombre -> motor (su pool se lee al exportar:
+# engine.dispose() lo sustituye por otro)
+_engines: Dict[str, object] = {}
+_pool_wait: Dict[str, Histogram] = {}
+
+def _route_label(scope) -> str:
+    route = scope.get("route")
+    # Sin ruta (404) se agrupa todo en una etiqueta para no crear una serie por URL
+    return getattr(route, "path", None) or "unmatched"
+
+class MetricsMiddleware:
+    """Peticiones, peticiones en curso y latencia por método y ruta."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        global _in_progress
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        _in_progress += 1
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            _in_progress -= 1
+            key = (scope["method"], _route_label(scope))
+            stats = _routes.get(key)
+            if stats is None:
+                stats = _routes[key] = RouteStats()
+            stats.latency.observe(elapsed)
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+
+def request_count(route: Optional[str] = None) -> int:
+    """Peticiones terminadas desde el arranque, de una ruta o de todas."""
+    return sum(
+        sum(stats.statuses.values()) for (_, path), stats in list(_routes.items())
+        if route is None or path == route
+    )
+
+class _TimedPool:
+    """
+    Mezcla para las clases de pool de SQLAlchemy: mide cuánto tarda
+    `connect()` en entregar una conexión. `recreate()` (engine.dispose())
+    crea el pool nuevo con la misma clase; aquí conserva además el nombre.
+    """
+
+    metrics_name: Optional[str] = None
+
+    def connect(self):
+        histogram = _pool_wait.get(self.metrics_name) if self.metrics_name else None
+        if histogram is None:
+            return super().connect()
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            histogram.observe(time.perf_counter() - start)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics_name = self.metrics_name
+        return pool
+
+@functools.lru_cache(maxsize=None)
+def timed_pool_class(base: type) -> type:
+    """Subclase de `base` (QueuePool, AsyncAdaptedQueuePool...) para `poolclass`."""
+    return type(f"Timed{base.__name__}", (_TimedPool, base), {})
+
+def instrument_pool(engine, name: str):
+    """
+    Exporta el pool de `engine` (el `sync_engine` en los asíncronos) con el
+    nombre `name`. La espera solo se mide si el motor se creó con un pool de
+    `timed_pool_class`.
+    """
+    pool = engine.pool
+    if isinstance(pool, _TimedPool):
+        _pool_wait[name] = Histogram(POOL_WAIT_BUCKETS, lock=True)
+        pool.metrics_name = name
+    _engines[name] = engine
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _header(lines: List[str], name: str, kind: str, help_text: str):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {kind}")
+
+def _routes_section(lines: List[str]):
+    routes = sorted(_routes.items())
+    _header(lines, "http_requests_total", "counter", "Peticiones HTTP por método, ruta y estado.")
+    for (method, route), stats in routes:
+        for status, count in sorted(stats.statuses.items()):
+            lines.append(
+                f'http_requests_total{{method="{method}",route="{_escape(route)}",status="{status}"}} {count}'
+            )
+    _header(lines, "http_request_duration_seconds", "histogram", "Latencia de las peticiones HTTP.")
+    for (method, route), stats in routes:
+        lines.extend(stats.latency.samples(
+            "http_request_duration_seconds", f'method="{method}",route="{_escape(route)}"'
+        ))
+    _header(lines, "http_requests_in_progress", "gauge", "Peticiones HTTP en curso.")
+    lines.append(f"http_requests_in_progress {_in_progress}")
+
+def _pool_section(lines: List[str]):
+    if not _engines:
+        return
+    if _pool_wait:
+        _header(lines, "db_pool_checkout_wait_seconds", "histogram", "Espera hasta obtener una conexión del pool.")
+    for name, histogram in _pool_wait.items():
+        lines.extend(histogram.samples("db_pool_checkout_wait_seconds", f'engine="{name}"'))
+    pools = {name: engine.pool for name, engine in _engines.items()}
+    gauges = {
+        "db_pool_size": ("Conexiones permanentes del pool.", lambda pool: pool.size()),
+        "db_pool_checked_out": ("Conexiones en uso.", lambda pool: pool.checkedout()),
+        # QueuePool cuenta el desbordamiento desde -pool_size
+        "db_pool_overflow": ("Conexiones por encima del tamaño del pool.", lambda pool: max(0, pool.overflow())),
+    }
+    for metric, (help_text, read) in gauges.items():
+        # StaticPool (SQLite en memoria) no tiene tamaño ni desbordamiento
+        values = [(name, read(pool)) for name, pool in pools.items() if hasattr(pool, "overflow")]
+        if values:
+            _header(lines, metric, "gauge", help_text)
+            lines.extend(f'{metric}{{engine="{name}"}} {value}' for name, value in values)
+
+def _threadpool_section(lines: List[str]):
+    from anyio import to_thread
+
+    limiter = to_thread.current_default_thread_limiter()
+    statistics = limiter.statistics()
+    _header(lines, "threadpool_threads_busy", "gauge", "Hilos del threadpool ocupados.")
+    lines.append(f"threadpool_threads_busy {statistics.borrowed_tokens}")
+    _header(lines, "threadpool_threads_limit", "gauge", "Tamaño máximo del threadpool.")
+    lines.append(f"threadpool_threads_limit {statistics.total_tokens}")
+    _header(lines, "threadpool_tasks_waiting", "gauge", "Tareas esperando un hilo libre.")
+    lines.append(f"threadpool_tasks_waiting {statistics.tasks_waiting}")
+
+def _hashing_section(lines: List[str]):
+    from app.core import hashing
+
+    stats = hashing.stats()
+    _header(lines, "password_hash_queue_depth", "gauge", "Operaciones de bcrypt esperando turno.")
+    lines.append(f"password_hash_queue_depth {stats['waiting']}")
+    _header(lines, "password_hash_in_flight", "gauge", "Operaciones de bcrypt en curso.")
+    lines.append(f"password_hash_in_flight {stats['in_flight']}")
+    _header(lines, "password_hash_queue_max_depth", "gauge", "Mayor cola de bcrypt desde el arranque.")
+    lines.append(f"password_hash_queue_max_depth {stats['max_waiting']}")
+    _header(lines, "password_hash_completed_total", "counter", "Operaciones de bcrypt terminadas.")
+    lines.append(f"password_hash_completed_total {stats['completed']}")
+    _header(lines, "password_hash_rejected_total", "counter", "Operaciones de bcrypt rechazadas con 503.")
+    lines.append(f"password_hash_rejected_total {stats['rejected']}")
+
+def _caches() -> Dict[str, dict]:
+    from app.core.auth_cache import principal_cache
+    from app.core.cache import result_cache
+    from app.core.language_cache import language_cache
+    from app.utils.compression import compressed_cache
+
+    return {
+        "auth_principal": principal_cache.stats(),
+        "logic_results": result_cache.stats(),
+        "compressed_responses": compressed_cache.stats(),
+        "languages": language_cache.stats(),
+    }
+
+def _cache_section(lines: List[str]):
+    caches = _caches()
+    for metric, key, help_text in (
+        ("cache_hits_total", "hits", "Aciertos de la caché."),
+        ("cache_misses_total", "misses", "Fallos de la caché."),
+    ):
+        _header(lines, metric, "counter", help_text)
+        lines.extend(f'{metric}{{cache="{name}"}} {stats[key]}' for name, stats in caches.items())
+    _header(lines, "cache_hit_ratio", "gauge", "Aciertos / consultas desde el arranque.")
+    for name, stats in caches.items():
+        lookups = stats["hits"] + stats["misses"]
+        lines.append(f'cache_hit_ratio{{cache="{name}"}} {stats["hits"] / lookups if lookups else 0.0}')
+    _header(lines, "cache_entries", "gauge", "Entradas guardadas en la caché.")
+    for name, stats in caches.items():
+        lines.append(f'cache_entries{{cache="{name}"}} {stats.get("size", stats.get("entries", 0))}')
+
+def render() -> str:
+    """Todas las métricas en el formato de texto de Prometheus (0.0.4)."""
+    lines: List[str] = []
+    for section in (_routes_section, _pool_section, _threadpool_section, _hashing_section, _cache_section):
+        section(lines)
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,133 @@
+# app/core/profiler.py
+"""
+Perfilador estadístico bajo demanda para el proceso en marcha.
+
+Mientras está activo, un hilo toma cada PROFILE_INTERVAL_MS la pila de todos
+los hilos (`sys._current_frames`) y cuenta cuántas veces aparece cada una.
+El resultado sale en formato "collapsed" (una pila por línea, marcos
+separados por `;` y el número de muestras), el que esperan flamegraph.pl,
+speedscope o inferno. Inactivo no hay hilo ni gancho alguno: coste cero.
+
+El filtro por ruta se aplica sobre las muestras: solo se guardan las pilas
+que pasan por la función del endpoint. Los endpoints síncronos se ven
+enteros en su hilo del threadpool; de los asíncronos solo el tramo que
+corre en el bucle de eventos.
+"""
+import inspect
+import os
+import sys
+import threading
+from collections import Counter
+from typing import Dict, FrozenSet, Optional
+
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", 5))
+PROFILE_MAX_SECONDS = float(os.getenv("PROFILE_MAX_SECONDS", 300))
+
+# Hilos parados esperando trabajo: (fichero, función) del marco superior
+IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+    ("thread.py", "_worker"),
+}
+
+class SamplingProfiler:
+    """Muestreo periódico de las pilas de todos los hilos del proceso."""
+
+    def __init__(
+        self,
+        interval: float = PROFILE_INTERVAL_MS / 1000,
+        only_codes: Optional[FrozenSet] = None,
+        include_idle: bool = False,
+    ):
+        self.interval = interval
+        self.only_codes = only_codes
+        self.include_idle = include_idle
+        self.samples: Counter = Counter()
+        self.ticks = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident != own:
+                    self._sample(names.get(ident, str(ident)), frame)
+            self.ticks += 1
+
+    def _sample(self, thread_name: str, frame):
+        leaf = frame.f_code
+        if not self.include_idle and (os.path.basename(leaf.co_filename), leaf.co_name) in IDLE_FRAMES:
+            return
+        codes = []
+        while frame is not None:
+            codes.append(frame.f_code)
+            frame = frame.f_back
+        if self.only_codes is not None and self.only_codes.isdisjoint(codes):
+            return
+        codes.reverse()
+        self.samples[(thread_name, tuple(codes))] += 1
+
+    def collapsed(self) -> str:
+        """Pilas en formato collapsed, de la raíz a la hoja."""
+        labels: Dict[object, str] = {}
+        lines = []
+        for (thread_name, codes), count in self.samples.most_common():
+            frames = [_clean(thread_name)]
+            for code in codes:
+                label = labels.get(code)
+                if label is None:
+                    label = labels[code] = _label(code)
+                frames.append(label)
+            lines.append(f"{';'.join(frames)} {count}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+def _clean(text: str) -> str:
+    # `;` separa marcos y el espacio final separa el contador
+    return text.replace(";", ":").replace("\n", " ")
+
+def _short_path(filename: str) -> str:
+    for prefix in sorted(sys.path, key=len, reverse=True):
+        if prefix and filename.startswith(prefix + os.sep):
+            return filename[len(prefix) + 1:]
+    return filename
+
+def _label(code) -> str:
+    return _clean(f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})")
+
+# Solo un perfil a la vez por proceso
+_lock = threading.Lock()
+
+def acquire() -> bool:
+    return _lock.acquire(blocking=False)
+
+def release():
+    _lock.release()
+
+def _iter_routes(routes):
+    for route in routes:
+        # FastAPI reciente no copia las rutas de include_router: las deja en su router
+        original = getattr(route, "original_router", None)
+        if original is not None:
+            yield from _iter_routes(original.routes)
+        else:
+            yield route
+
+def endpoint_codes(routes, path: str) -> FrozenSet:
+    """Código de las funciones de los endpoints con esa plantilla de ruta."""
+    endpoints = [
+        inspect.unwrap(route.endpoint) for route in _iter_routes(routes)
+        if getattr(route, "path", None) == path and getattr(route, "endpoint", None) is not None
+    ]
+    return frozenset(endpoint.__code__ for endpoint in endpoints if hasattr(endpoint, "__code__"))
@@ -1,7 +1,7 @@
+import os
 from datetime import datetime, timedelta
-from typing import Optional
-from jose import jwt
-from passlib.context import CryptContext
+from functools import lru_cache
+from typing import Optional, Tuple
 from pydantic import EmailStr
 
 # Configuración para JWT
@@ -9,19 +9,42 @@ SECRET_KEY = "CAMBIA_ESTO_POR_UNA_CLAVE_SEGURA_EN_PRODUCCION"  # En producción,
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-# Configuración para password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Configuración para password hashing. Los hashes con un coste distinto de
+# BCRYPT_ROUNDS se consideran obsoletos y se regeneran al iniciar sesión.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+
+@lru_cache(maxsize=None)
+def pwd_context():
+    # passlib y bcrypt se cargan con el primer hash, no al arrancar la API
+    from passlib.context import CryptContext
+
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=BCRYPT_ROUNDS,
+        bcrypt__min_rounds=BCRYPT_ROUNDS,
+        bcrypt__max_rounds=BCRYPT_ROUNDS,
+    )
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verifica que la contraseña coincida con el hash almacenado"""
-    return pwd_context.verify(plain_password, hashed_password)
+    return pwd_context().verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
     """Genera un hash para la contraseña"""
-    return pwd_context.hash(password)
+    return pwd_context().hash(password)
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verifica la contraseña y, si el hash usa un coste obsoleto, devuelve
+    también el hash nuevo (o None si no hace falta cambiarlo)
+    """
+    return pwd_context().verify_and_update(plain_password, hashed_password)
 
 def create_access_token(subject: str, role: str = "user", expires_delta: Optional[timedelta] = None) -> str:
     """Genera un token JWT"""
+    from jose import jwt
+
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
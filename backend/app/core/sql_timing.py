@@ -0,0 +1,141 @@
+# app/core/sql_timing.py
+"""
+Consultas SQL por petición: número, tiempo total en la base de datos y la
+sentencia más lenta.
+
+Los eventos before/after_cursor_execute de los motores de app.core.database
+anotan cada sentencia en las estadísticas de la petición en curso (una
+ContextVar, que también ven los hilos del threadpool y `run_sync`).
+`SQLTimingMiddleware` las abre al empezar la petición, las envía en la
+cabecera Server-Timing y, al terminar, las escribe como una línea JSON en
+el logger `app.sql`:
+
+    Server-Timing: db;dur=12.41;desc="7 consultas", db-slowest;dur=5.02
+
+Las sentencias que superan SQL_SLOW_QUERY_MS y las peticiones con más de
+SQL_MANY_QUERIES sentencias (típico de un N+1) se registran como aviso. Los
+parámetros nunca se escriben, solo cuántos había.
+"""
+import json
+import logging
+import os
+import time
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import event
+
+SQL_SLOW_QUERY_MS = float(os.getenv("SQL_SLOW_QUERY_MS", 100))
+SQL_MANY_QUERIES = int(os.getenv("SQL_MANY_QUERIES", 50))
+# Incluir el texto de la sentencia más lenta en Server-Timing (visible para el cliente)
+SQL_TIMING_EXPOSE_SQL = os.getenv("SQL_TIMING_EXPOSE_SQL", "0") == "1"
+
+logger = logging.getLogger("app.sql")
+
+class RequestQueries:
+    """Sentencias ejecutadas durante una petición."""
+
+    __slots__ = ("path", "count", "total", "slowest", "slowest_statement")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+        self.total = 0.0
+        self.slowest = 0.0
+        self.slowest_statement: Optional[str] = None
+
+    def record(self, statement: str, elapsed: float):
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.slowest:
+            self.slowest = elapsed
+            self.slowest_statement = statement
+
+    def server_timing(self) -> str:
+        value = f'db;dur={self.total * 1000:.2f};desc="{self.count} consultas"'
+        if self.count:
+            value += f", db-slowest;dur={self.slowest * 1000:.2f}"
+            if SQL_TIMING_EXPOSE_SQL and self.slowest_statement:
+                value += f';desc="{_one_line(self.slowest_statement, 200)}"'
+        return value
+
+_current: ContextVar[Optional[RequestQueries]] = ContextVar("request_queries", default=None)
+
+def _one_line(statement: str, limit: int) -> str:
+    text = " ".join(statement.split()).replace('"', "'")
+    return text if len(text) <= limit else text[: limit - 3] + "..."
+
+def _parameter_count(parameters, executemany: bool) -> int:
+    if executemany:
+        return sum(len(p) for p in parameters)
+    return len(parameters) if parameters else 0
+
+def _before(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("sql_timing_start", []).append(time.perf_counter())
+
+def _after(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["sql_timing_start"].pop()
+    queries = _current.get()
+    if queries is not None:
+        queries.record(statement, elapsed)
+    if elapsed * 1000 >= SQL_SLOW_QUERY_MS:
+        logger.warning(json.dumps({
+            "event": "slow_query",
+            "path": queries.path if queries else None,
+            "duration_ms": round(elapsed * 1000, 2),
+            "statement": _one_line(statement, 2000),
+            "parameters": f"<{_parameter_count(parameters, executemany)} redactados>",
+        }, ensure_ascii=False))
+
+def instrument_engine(engine):
+    """Registra la medición en un motor síncrono (o el `sync_engine` de uno asíncrono)."""
+    event.listen(engine, "before_cursor_execute", _before)
+    event.listen(engine, "after_cursor_execute", _after)
+
+class SQLTimingMiddleware:
+    """Abre las estadísticas de cada petición y las publica en Server-Timing y en el log."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        queries = RequestQueries(scope["path"])
+        token = _current.set(queries)
+        status = None
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", queries.server_timing().encode("latin-1", "replace")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            self._log(scope, queries, status, time.perf_counter() - start)
+
+    @staticmethod
+    def _log(scope, queries: RequestQueries, status, elapsed: float):
+        many = queries.count > SQL_MANY_QUERIES
+        level = logging.WARNING if many else logging.INFO
+        if not logger.isEnabledFor(level):
+            return
+        logger.log(level, json.dumps({
+            "event": "many_queries" if many else "request_sql",
+            "method": scope["method"],
+            "path": queries.path,
+            "status": status,
+            "duration_ms": round(elapsed * 1000, 2),
+            "queries": queries.count,
+            "db_ms": round(queries.total * 1000, 2),
+            "slowest_ms": round(queries.slowest * 1000, 2),
+            "slowest_statement": _one_line(queries.slowest_statement, 500) if queries.slowest_statement else None,
+        }, ensure_ascii=False))
@@ -1,6 +1,17 @@
+from typing import List, Optional, Set
 from sqlalchemy.orm import Session
 from app.models.project import Project
 from app.schemas.project import ProjectCreate
+from app.utils.fast_json import column_dicts
+from app.utils.pagination import keyset, selected_fields
+
+# Tablas que lee ProjectOut (versiones para el ETag, ver app.utils.http_cache)
+PROJECT_TABLES = ("projects",)
+# Campos de ProjectOut, para los listados sin objetos ORM
+PROJECT_ROW_FIELDS = (
+    "name", "description", "estimated_time", "price", "type",
+    "db_type", "language", "framework", "is_flash", "is_director", "id",
+)
 
 def create_project(db: Session, project: ProjectCreate):
     db_project = Project(**project.dict())
@@ -9,8 +20,48 @@ def create_project(db: Session, project: ProjectCreate):
     db.refresh(db_project)
     return db_project
 
-def get_all_projects(db: Session):
-    return db.query(Project).all()
+def query_projects(db: Session, type: Optional[str] = None, framework: Optional[str] = None):
+    query = db.query(Project)
+    if type is not None:
+        query = query.filter(Project.type == type)
+    if framework is not None:
+        query = query.filter(Project.framework == framework)
+    return query
+
+def get_all_projects(
+    db: Session,
+    type: Optional[str] = None,
+    framework: Optional[str] = None,
+    after_id: Optional[int] = None,
+    limit: Optional[int] = None,
+):
+    return keyset(query_projects(db, type, framework), Project.id, after_id, limit).all()
+
+def get_project_rows(
+    db: Session,
+    type: Optional[str] = None,
+    framework: Optional[str] = None,
+    after_id: Optional[int] = None,
+    limit: Optional[int] = None,
+    include: Optional[Set[str]] = None,
+) -> List[dict]:
+    """
+    Como get_all_projects, pero como dicts con los campos de ProjectOut (o
+    solo los de `include`, leyendo únicamente esas columnas).
+    """
+    query = keyset(query_projects(db, type, framework), Project.id, after_id, limit)
+    return column_dicts(query, Project, selected_fields(PROJECT_ROW_FIELDS, include))
+
+def stream_projects(
+    db: Session,
+    type: Optional[str] = None,
+    framework: Optional[str] = None,
+    after_id: Optional[int] = None,
+    batch_size: int = 1000,
+):
+    """Proyectos leídos del cursor por lotes, sin materializar la tabla."""
+    query = keyset(query_projects(db, type, framework), Project.id, after_id, None)
+    return query.yield_per(batch_size)
 
 def get_project_by_id(db: Session, project_id: int):
     return db.query(Project).filter(Project.id == project_id).first()
@@ -1,15 +1,41 @@
-from sqlalchemy.orm import Session
+from typing import Optional
+from sqlalchemy.orm import Session, joinedload, selectinload, subqueryload
 from app.models.team import Team
-from app.models.worker import Leader
+from app.models.worker import Leader, Programmer
 from app.schemas.team import TeamCreate, TeamUpdate
+from app.utils.pagination import keyset
 
-def get_all_teams(db: Session):
+# Relaciones que lee TeamOut: el proyecto en la misma consulta; líder,
+# programadores y lenguajes en una consulta adicional cada uno. El líder no
+# se une con joinedload: SQLite materializa entera la unión workers-leaders
+# de la herencia antes de aplicar el LIMIT de la página.
+TEAM_OUT_LOAD = (
+    subqueryload(Team.leader),
+    joinedload(Team.project),
+    subqueryload(Team.programmers).subqueryload(Programmer.languages),
+)
+# Variante compatible con yield_per: una consulta de colecciones por lote.
+TEAM_STREAM_LOAD = (
+    selectinload(Team.leader),
+    joinedload(Team.project),
+    selectinload(Team.programmers).selectinload(Programmer.languages),
+)
+
+# Tablas que lee TeamOut (versiones para el ETag, ver app.utils.http_cache)
+TEAM_TABLES = ("teams", "projects", "workers", "leaders", "programmers", "programmer_language", "languages")
+
+def get_all_teams(db: Session, after_id: Optional[int] = None, limit: Optional[int] = None):
     """Obtener todos los equipos"""
-    return db.query(Team).all()
+    return keyset(db.query(Team).options(*TEAM_OUT_LOAD), Team.id, after_id, limit).all()
+
+def stream_teams(db: Session, after_id: Optional[int] = None, batch_size: int = 1000):
+    """Equipos leídos del cursor por lotes, sin materializar la tabla."""
+    query = keyset(db.query(Team).options(*TEAM_STREAM_LOAD), Team.id, after_id, None)
+    return query.yield_per(batch_size)
 
 def get_team_by_id(db: Session, team_id: int):
     """Obtener un equipo por ID"""
-    return db.query(Team).filter(Team.id == team_id).first()
+    return db.query(Team).options(*TEAM_OUT_LOAD).filter(Team.id == team_id).first()
 
 def get_team_by_leader_id(db: Session, leader_id: int):
     """Obtener el equipo que tiene asignado un líder específico"""
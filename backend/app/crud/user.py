@@ -14,8 +14,8 @@ def get_user_by_username(db: Session, username: str) -> Optional[User]:
 def get_user_by_id(db: Session, user_id: int) -> Optional[User]:
     return db.query(User).filter(User.id == user_id).first()
 
-def create_user(db: Session, user: UserCreate) -> User:
-    # Verificar si ya existe un usuario con ese email o username
+def ensure_user_is_new(db: Session, user: UserCreate):
+    """Rechaza con 400 un email o username ya registrados."""
     email_exists = get_user_by_email(db, user.email)
     username_exists = get_user_by_username(db, user.username)
     
@@ -30,12 +30,16 @@ def create_user(db: Session, user: UserCreate) -> User:
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="El nombre de usuario ya está registrado"
         )
-        
+
+def create_user(db: Session, user: UserCreate, hashed_password: Optional[str] = None) -> User:
+    # Verificar si ya existe un usuario con ese email o username
+    ensure_user_is_new(db, user)
+
     # Crear el nuevo usuario
     db_user = User(
         username=user.username,
         email=user.email,
-        hashed_password=get_password_hash(user.password),
+        hashed_password=hashed_password or get_password_hash(user.password),
         is_active=user.is_active,
         role=user.role
     )
@@ -45,6 +49,11 @@ def create_user(db: Session, user: UserCreate) -> User:
     db.refresh(db_user)
     return db_user
 
+def update_password_hash(db: Session, user: User, hashed_password: str) -> User:
+    user.hashed_password = hashed_password
+    db.commit()
+    return user
+
 def authenticate_user(db: Session, username: str, password: str) -> Optional[User]:
     user = get_user_by_username(db, username)
     if not user:
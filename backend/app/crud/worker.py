@@ -1,9 +1,35 @@
-from sqlalchemy.orm import Session
-from app.models.worker import Programmer, Leader, Language
+from typing import List, Optional, Set
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session, selectinload, subqueryload
+from app.core.language_cache import language_cache
+from app.models.worker import Programmer, Leader, Language, ProgrammerLanguage
 from app.schemas.worker import ProgrammerCreate, LeaderCreate
+from app.utils.fast_json import column_dicts
+from app.utils.pagination import keyset, selected_fields
+
+# ─── Planes de carga ───
+# Relaciones que lee ProgrammerOut; se cargan en una consulta adicional para
+# todo el lote en lugar de una por programador.
+PROGRAMMER_OUT_LOAD = (subqueryload(Programmer.languages),)
+# subqueryload no admite yield_per; al leer por lotes se usa selectinload,
+# que lanza una consulta de lenguajes por lote.
+PROGRAMMER_STREAM_LOAD = (selectinload(Programmer.languages),)
+
+# Tablas que leen los listados (versiones para el ETag, ver app.utils.http_cache)
+PROGRAMMER_TABLES = ("workers", "programmers", "programmer_language", "languages")
+LEADER_TABLES = ("workers", "leaders", "teams")
+
+# Columnas de ProgrammerOut y LeaderOut, para los listados sin objetos ORM
+PROGRAMMER_ROW_FIELDS = ("name", "age", "gender", "base_salary", "id", "type", "category", "team_id")
+LEADER_ROW_FIELDS = ("name", "age", "gender", "base_salary", "id", "type", "experience_years", "directed_projects")
 
 # ─── Crear Programador ───
 def create_programmer(db: Session, programmer: ProgrammerCreate):
+    # Ids de los lenguajes desde la caché del proceso: ninguna consulta si ya
+    # existen y dos para todos los nuevos, sin importar cuántos sean
+    names = list(dict.fromkeys(programmer.languages))
+    language_ids = language_cache.resolve(db, names)
+
     db_programmer = Programmer(
         name=programmer.name,
         age=programmer.age,
@@ -11,16 +37,12 @@ def create_programmer(db: Session, programmer: ProgrammerCreate):
         base_salary=programmer.base_salary,
         category=programmer.category
     )
-
-    db_languages = []
-    for lang in programmer.languages:
-        db_lang = db.query(Language).filter(Language.name == lang).first()
-        if not db_lang:
-            db_lang = Language(name=lang)
-        db_languages.append(db_lang)
-
-    db_programmer.languages = db_languages
     db.add(db_programmer)
+    db.flush()
+    if names:
+        db.execute(insert(ProgrammerLanguage.__table__), [
+            {"programmer_id": db_programmer.id, "language_id": language_ids[name]} for name in names
+        ])
     db.commit()
     db.refresh(db_programmer)
     return db_programmer
@@ -41,11 +63,105 @@ def create_leader(db: Session, leader: LeaderCreate):
     return db_leader
 
 # ─── Obtener todos ───
-def get_all_programmers(db: Session):
-    return db.query(Programmer).all()
+def query_programmers(db: Session, category: Optional[str] = None, language: Optional[str] = None):
+    query = db.query(Programmer)
+    if category is not None:
+        query = query.filter(Programmer.category == category)
+    if language is not None:
+        query = query.filter(Programmer.languages.any(Language.name == language))
+    return query
+
+def get_all_programmers(
+    db: Session,
+    category: Optional[str] = None,
+    language: Optional[str] = None,
+    after_id: Optional[int] = None,
+    limit: Optional[int] = None,
+):
+    query = query_programmers(db, category, language).options(*PROGRAMMER_OUT_LOAD)
+    return keyset(query, Programmer.id, after_id, limit).all()
 
-def get_all_leaders(db: Session):
-    return db.query(Leader).all()
+def get_programmer_rows(
+    db: Session,
+    category: Optional[str] = None,
+    language: Optional[str] = None,
+    after_id: Optional[int] = None,
+    limit: Optional[int] = None,
+    include: Optional[Set[str]] = None,
+) -> List[dict]:
+    """
+    Como get_all_programmers, pero como dicts con los campos de
+    ProgrammerOut (o solo los de `include`). Los lenguajes de toda la página
+    se leen en una segunda consulta que repite la de la página como
+    subconsulta, y solo si se piden.
+    """
+    page = keyset(query_programmers(db, category, language), Programmer.id, after_id, limit)
+    rows = column_dicts(page, Programmer, selected_fields(PROGRAMMER_ROW_FIELDS, include))
+    if not rows or (include is not None and "languages" not in include):
+        return rows
+
+    page_ids = page.with_entities(Programmer.id.label("id")).subquery()
+    languages = {}
+    for programmer_id, name in (
+        db.query(ProgrammerLanguage.programmer_id, Language.name)
+        .join(Language, Language.id == ProgrammerLanguage.language_id)
+        .filter(ProgrammerLanguage.programmer_id.in_(select(page_ids.c.id)))
+    ):
+        languages.setdefault(programmer_id, []).append({"name": name})
+    for row in rows:
+        row["languages"] = languages.get(row["id"], [])
+    return rows
+
+def stream_programmers(
+    db: Session,
+    category: Optional[str] = None,
+    language: Optional[str] = None,
+    after_id: Optional[int] = None,
+    batch_size: int = 1000,
+):
+    query = query_programmers(db, category, language).options(*PROGRAMMER_STREAM_LOAD)
+    return keyset(query, Programmer.id, after_id, None).yield_per(batch_size)
+
+def query_leaders(db: Session, unassigned: bool = False):
+    query = db.query(Leader)
+    if unassigned:
+        query = query.filter(~Leader.team.has())
+    return query
+
+def get_all_leaders(
+    db: Session,
+    unassigned: bool = False,
+    after_id: Optional[int] = None,
+    limit: Optional[int] = None,
+):
+    return keyset(query_leaders(db, unassigned), Leader.id, after_id, limit).all()
+
+def get_leader_rows(
+    db: Session,
+    unassigned: bool = False,
+    after_id: Optional[int] = None,
+    limit: Optional[int] = None,
+    include: Optional[Set[str]] = None,
+) -> List[dict]:
+    """
+    Como get_all_leaders, pero como dicts con los campos de LeaderOut (o
+    solo los de `include`). `team_id` es siempre None, igual que al validar
+    el modelo con LeaderOut.
+    """
+    query = keyset(query_leaders(db, unassigned), Leader.id, after_id, limit)
+    rows = column_dicts(query, Leader, selected_fields(LEADER_ROW_FIELDS, include))
+    if include is None or "team_id" in include:
+        for row in rows:
+            row["team_id"] = None
+    return rows
+
+def stream_leaders(
+    db: Session,
+    unassigned: bool = False,
+    after_id: Optional[int] = None,
+    batch_size: int = 1000,
+):
+    return keyset(query_leaders(db, unassigned), Leader.id, after_id, None).yield_per(batch_size)
 
 # ─── Obtener por ID ───
 def get_worker_by_id(db: Session, worker_id: int):
@@ -53,7 +169,12 @@ def get_worker_by_id(db: Session, worker_id: int):
 
 def get_programmer_by_id(db: Session, programmer_id: int):
     """Obtener programador por ID"""
-    return db.query(Programmer).filter(Programmer.id == programmer_id).first()
+    return (
+        db.query(Programmer)
+        .options(*PROGRAMMER_OUT_LOAD)
+        .filter(Programmer.id == programmer_id)
+        .first()
+    )
 
 def get_leader_by_id(db: Session, leader_id: int):
     """Obtener líder por ID"""
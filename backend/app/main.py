@@ -1,9 +1,38 @@
+from contextlib import asynccontextmanager
+from anyio import to_thread
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import worker, project, team, logic, auth  # Añadir auth aquí
-from app.core.database import create_tables
+from app.routers import worker, project, team, logic, auth, jobs, metrics, profiling  # Añadir auth aquí
+from app.core import hashing, language_cache
+from app.core.database import THREADPOOL_SIZE, prepare_schema, update_statistics
+from app.core.metrics import MetricsMiddleware
+from app.core.sql_timing import SQLTimingMiddleware
+from app.services.jobs import purge_expired, recover_interrupted, shutdown as shutdown_jobs
+from app.utils.compression import CompressionMiddleware
+from app.utils.http_cache import ConditionalGetMiddleware
+from app.utils.pagination import NEXT_CURSOR_HEADER
 
-app = FastAPI(title="Proyecto 43 - Empresa de Software")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Tantos hilos como conexiones en el pool (ver app.core.database)
+    to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    # Una vez por proceso al arrancar, no al importar: importar la aplicación
+    # (tests, herramientas) no toca la base de datos
+    await to_thread.run_sync(prepare_schema)
+    await to_thread.run_sync(language_cache.warm)
+    # Los trabajos en curso se pierden al reiniciar el proceso
+    recover_interrupted()
+    # y los terminados hace más de JOBS_RESULT_TTL se borran con su resultado
+    await to_thread.run_sync(purge_expired)
+    try:
+        yield
+    finally:
+        shutdown_jobs()
+        hashing.shutdown()
+        # PRAGMA optimize al cerrar, como recomienda SQLite
+        await to_thread.run_sync(update_statistics)
+
+app = FastAPI(title="Proyecto 43 - Empresa de Software", lifespan=lifespan)
 
 # Configurar CORS - Coloca esto ANTES de incluir los routers
 app.add_middleware(
@@ -12,9 +41,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],  # Incluye OPTIONS explícitamente
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "Server-Timing"],
 )
-
-create_tables()
+app.add_middleware(ConditionalGetMiddleware)
+# La última añadida es la más externa: comprime ya con el ETag puesto
+app.add_middleware(CompressionMiddleware)
+# Consultas SQL de la petición completa, incluida la compresión y el streaming
+app.add_middleware(SQLTimingMiddleware)
+# La más externa: la latencia incluye el resto de middlewares
+app.add_middleware(MetricsMiddleware)
 
 # Aquí van tus inclusiones de routers
 app.include_router(auth.router)
@@ -22,3 +57,6 @@ app.include_router(worker.router)
 app.include_router(project.router)
 app.include_router(team.router)
 app.include_router(logic.router)
+app.include_router(jobs.router)
+app.include_router(metrics.router)
+app.include_router(profiling.router)
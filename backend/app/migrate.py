@@ -0,0 +1,10 @@
+"""
+Migración explícita del esquema, para ejecutarla una vez antes de arrancar
+los workers con MIGRATE_ON_STARTUP=0:
+
+    python -m app.migrate
+"""
+from app.core.database import migrate
+
+if __name__ == "__main__":
+    print("Esquema actualizado" if migrate() else "El esquema ya estaba al día")
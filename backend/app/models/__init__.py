@@ -2,3 +2,4 @@
 from .project import Project
 from .team import Team
 from .worker import Worker, Programmer, Leader, Language
+from .job import Job
@@ -0,0 +1,28 @@
+# app/models/job.py
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Float, DateTime
+from app.core.database import Base
+
+class Job(Base):
+    __tablename__ = "jobs"
+    id = Column(String, primary_key=True)  # uuid4 en hexadecimal
+    type = Column(String, nullable=False)  # 'import', 'export' o 'report'
+    status = Column(String, nullable=False, default="queued")  # queued, running, succeeded, failed
+    progress = Column(Float, nullable=False, default=0.0)  # 0..1
+    message = Column(String, nullable=True)
+    error = Column(String, nullable=True)
+
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    # Proceso que ejecuta el trabajo (máquina:pid:arranque) y su último latido:
+    # al arrancar solo se dan por interrumpidos los de procesos que ya no existen
+    owner = Column(String, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+
+    # Resultado descargable, en un fichero de JOBS_RESULT_DIR
+    result_path = Column(String, nullable=True)
+    result_media_type = Column(String, nullable=True)
+    result_filename = Column(String, nullable=True)
+    result_size = Column(Integer, nullable=True)
@@ -8,9 +8,9 @@ class Project(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     description = Column(String)
-    estimated_time = Column(Integer, nullable=False)  # en días
+    estimated_time = Column(Integer, nullable=False, index=True)  # en días
     price = Column(Float, nullable=False)
-    type = Column(String, nullable=False)  # 'gestion' o 'multimedia'
+    type = Column(String, nullable=False, index=True)  # 'gestion' o 'multimedia'
 
     # Multimedia
     is_flash = Column(Boolean, nullable=True)
@@ -19,6 +19,6 @@ class Project(Base):
     # Gestión empresarial
     db_type = Column(String, nullable=True)
     language = Column(String, nullable=True)
-    framework = Column(String, nullable=True)  # CodeIgniter, Symfony, etc.
+    framework = Column(String, nullable=True, index=True)  # CodeIgniter, Symfony, etc.
 
     team = relationship("Team", back_populates="project", uselist=False)
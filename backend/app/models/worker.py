@@ -7,7 +7,7 @@ class ProgrammerLanguage(Base):
     __tablename__ = "programmer_language"
     
     programmer_id = Column(Integer, ForeignKey("programmers.id"), primary_key=True)
-    language_id = Column(Integer, ForeignKey("languages.id"), primary_key=True)
+    language_id = Column(Integer, ForeignKey("languages.id"), primary_key=True, index=True)
 
 class Worker(Base):
     __tablename__ = "workers"
@@ -27,7 +27,7 @@ class Programmer(Worker):
     __tablename__ = "programmers"
     id = Column(Integer, ForeignKey("workers.id"), primary_key=True)
     category = Column(String, nullable=False)  # A, B o C
-    team_id = Column(Integer, ForeignKey("teams.id"), nullable=True)
+    team_id = Column(Integer, ForeignKey("teams.id"), nullable=True, index=True)
 
     languages = relationship(
         "Language",
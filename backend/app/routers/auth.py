@@ -1,33 +1,50 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
-from app.core.database import get_db
-from app.crud.user import authenticate_user, create_user, get_user_by_email
-from app.models.user import User
+from app.core.database import get_async_db
+from app.crud.user import create_user, ensure_user_is_new, get_user_by_username, update_password_hash
 from app.schemas.user import Token, UserCreate, UserOut
 from app.core.security import create_access_token, ACCESS_TOKEN_EXPIRE_MINUTES
-from app.core.deps import get_current_active_user
+from app.core import hashing
+from app.core.auth_cache import principal_cache
+from app.core.deps import get_current_active_user, get_current_admin_user
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 @router.post("/register", response_model=UserOut)
-def register_user(user: UserCreate, db: Session = Depends(get_db)):
+async def register_user(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Registra un nuevo usuario
     """
-    return create_user(db, user)
+    # Los duplicados se rechazan antes de ocupar el pool de bcrypt; la
+    # conexión se devuelve al pool mientras se calcula el hash
+    await db.run_sync(ensure_user_is_new, user)
+    await db.rollback()
+    # El hash es costoso en CPU: se calcula en el pool de procesos
+    hashed_password = await hashing.hash_password(user.password)
+    return await db.run_sync(create_user, user, hashed_password)
 
 @router.post("/login", response_model=Token)
-def login_for_access_token(
+async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     OAuth2 compatible token login, obtiene un token para futuras peticiones
     """
-    user = authenticate_user(db, form_data.username, form_data.password)
-    if not user:
+    user = await db.run_sync(get_user_by_username, form_data.username)
+    valid = False
+    if user:
+        # Se copia lo necesario y se devuelve la conexión al pool mientras
+        # se verifica el hash (el rollback expira el objeto)
+        username, role, stored_hash = user.username, user.role, user.hashed_password
+        await db.rollback()
+        valid, new_hash = await hashing.verify_password(form_data.password, stored_hash)
+        if valid and new_hash:
+            # El coste de bcrypt cambió desde que se guardó el hash
+            await db.run_sync(_rehash, username, stored_hash, new_hash)
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Nombre de usuario o contraseña incorrectos",
@@ -36,16 +53,36 @@ def login_for_access_token(
     
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        subject=user.username, 
-        role=user.role,
+        subject=username, 
+        role=role,
         expires_delta=access_token_expires
     )
     
     return {"access_token": access_token, "token_type": "bearer"}
 
+def _rehash(db, username: str, old_hash: str, new_hash: str):
+    """Guarda el hash nuevo si la contraseña no cambió mientras se verificaba."""
+    user = get_user_by_username(db, username)
+    if user is not None and user.hashed_password == old_hash:
+        update_password_hash(db, user, new_hash)
+
 @router.get("/me", response_model=UserOut)
-def read_users_me(current_user: User = Depends(get_current_active_user)):
+async def read_users_me(current_user: UserOut = Depends(get_current_active_user)):
     """
     Obtiene información del usuario actual
     """
-    return current_user
\ No newline at end of file
+    return current_user
+
+@router.get("/cache-stats")
+def auth_cache_stats(current_user: UserOut = Depends(get_current_admin_user)):
+    """
+    Aciertos y fallos de la caché de usuarios autenticados
+    """
+    return principal_cache.stats()
+
+@router.get("/hash-stats")
+def hash_stats(current_user: UserOut = Depends(get_current_admin_user)):
+    """
+    Estado del pool de hash de contraseñas (en curso, en cola, rechazadas)
+    """
+    return hashing.stats()
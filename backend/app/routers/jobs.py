@@ -0,0 +1,113 @@
+import csv
+import io
+import json
+import os
+import shutil
+import tempfile
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+from fastapi.responses import FileResponse
+from sqlalchemy.orm import Session
+from typing import Optional
+from app.core.database import SessionLocal, get_db
+from app.schemas.job import JobOut
+from app.services import jobs, logic
+from app.utils import bulk_import, file_io
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+@router.get("/{job_id}", response_model=JobOut)
+def get_job(job_id: str, db: Session = Depends(get_db)):
+    job = jobs.get_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Trabajo no encontrado")
+    return job
+
+@router.get("/{job_id}/result")
+def get_job_result(job_id: str, db: Session = Depends(get_db)):
+    job = jobs.get_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Trabajo no encontrado")
+    result = jobs.get_result(db, job_id)
+    if result is None:
+        raise HTTPException(status_code=409, detail=f"El trabajo no ha terminado ({job.status})")
+    path, media_type, filename = result
+    if not path or not os.path.exists(path):
+        raise HTTPException(status_code=410, detail="El resultado del trabajo ya no está disponible")
+    # Se envía desde el fichero por trozos, sin cargarlo en memoria
+    return FileResponse(path, media_type=media_type, filename=filename, content_disposition_type="attachment")
+
+@router.post("/import-bulk", response_model=JobOut, status_code=202)
+def import_bulk_job(
+    entity: str,
+    file: UploadFile = File(...),
+    batch_size: int = Query(bulk_import.DEFAULT_BATCH_SIZE, ge=1, le=10000),
+    db: Session = Depends(get_db),
+):
+    """Encola una importación masiva (CSV o NDJSON); el resultado es el informe JSON."""
+    if entity not in bulk_import.ENTITIES:
+        raise HTTPException(status_code=400, detail=f"Entidad no válida: {entity}")
+
+    # El fichero subido se cierra al terminar la petición: se copia a uno
+    # temporal propio del trabajo.
+    upload = tempfile.TemporaryFile()
+    shutil.copyfileobj(file.file, upload)
+    size = upload.tell()
+    upload.seek(0)
+    filename = file.filename or ""
+
+    def run(ctx: jobs.JobContext):
+        with upload, SessionLocal() as job_db:
+            def on_batch(rows: int):
+                ctx.progress(upload.tell() / size if size else 1.0, f"{rows} filas procesadas")
+
+            rows = bulk_import.read_rows(upload, filename)
+            try:
+                report = bulk_import.import_rows(job_db, entity, rows, batch_size, on_batch)
+            except (UnicodeDecodeError, csv.Error) as e:
+                raise ValueError(f"Fichero no válido: {e}")
+        ctx.output.write(json.dumps(report, ensure_ascii=False).encode("utf-8"))
+        return "application/json", f"import_{entity}.json"
+
+    return jobs.get_job(db, jobs.submit("import", run))
+
+@router.post("/export", response_model=JobOut, status_code=202)
+def export_job(
+    ids: Optional[str] = Query(None, description="Ids separados por comas"),
+    type: Optional[str] = None,
+    framework: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    """Encola la exportación de varios proyectos a un ZIP."""
+    try:
+        project_ids = [int(i) for i in ids.split(",") if i.strip()] if ids else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Lista de ids no válida")
+
+    def run(ctx: jobs.JobContext):
+        # El ZIP va directo al fichero del resultado, trozo a trozo
+        with SessionLocal() as job_db:
+            projects = file_io.query_projects_for_export(job_db, project_ids, type=type, framework=framework)
+            for chunk in file_io.iter_projects_zip(projects):
+                ctx.output.write(chunk)
+        return "application/zip", "projects.zip"
+
+    return jobs.get_job(db, jobs.submit("export", run))
+
+@router.post("/payroll-report", response_model=JobOut, status_code=202)
+def payroll_report_job(db: Session = Depends(get_db)):
+    """Encola el informe de nómina en CSV: desglose por trabajador y total."""
+    def run(ctx: jobs.JobContext):
+        out = io.TextIOWrapper(ctx.output, encoding="utf-8", newline="")
+        writer = csv.writer(out)
+        writer.writerow(["worker_id", "name", "type", "base_salary", "project_bonus", "skill_bonus", "bonus", "salary"])
+        with SessionLocal() as job_db:
+            for row in logic.get_salary_report(job_db, sort="worker_id", descending=False):
+                writer.writerow(row)
+            writer.writerow([])
+            writer.writerow(["total", "", "", "", "", "", "", logic.calculate_total_payroll(job_db)])
+        # Sin cerrar ctx.output, que es del trabajo
+        out.flush()
+        out.detach()
+        return "text/csv", "payroll.csv"
+
+    return jobs.get_job(db, jobs.submit("report", run))
@@ -1,10 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException  
+from anyio import from_thread
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from python_multipart.multipart import MultipartParser, parse_options_header
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
+from typing import List, Optional
 from app.services import logic
-from app.core.database import get_db
-from app.utils import file_io
+from app.services.payroll import SALARY_SORT_FIELDS
+from app.utils.schema_utils import SalaryReport
+from app.core.database import SessionLocal, get_db
+from app.utils import bulk_import, file_io
 from fastapi import UploadFile, File
-import os
 import csv
 
 router = APIRouter(prefix="/logic", tags=["Business Logic"])
@@ -13,6 +20,14 @@ router = APIRouter(prefix="/logic", tags=["Business Logic"])
 def project_count(db: Session = Depends(get_db)):
     return logic.count_projects_by_type(db)
 
+@router.get("/statistics")
+def dashboard_statistics(db: Session = Depends(get_db)):
+    """
+    Proyectos por tipo y framework, trabajadores por tipo y categoría,
+    ocupación de los equipos, líderes sin equipo, nómina e ingresos.
+    """
+    return logic.get_statistics(db)
+
 @router.get("/earliest-project")
 def earliest_project(db: Session = Depends(get_db)):
     return logic.get_earliest_project(db)
@@ -25,6 +40,22 @@ def payroll_total(db: Session = Depends(get_db)):
 def top_earners(db: Session = Depends(get_db)):
     return logic.get_highest_paid_workers(db)
 
+@router.get("/salaries", response_model=List[SalaryReport])
+def salaries(
+    sort: str = Query("salary", description=f"Uno de: {', '.join(SALARY_SORT_FIELDS)}"),
+    desc: bool = True,
+    limit: Optional[int] = Query(None, ge=1, le=10000),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+):
+    """
+    Salario efectivo de cada trabajador (base, bonificaciones y total).
+    Para obtener los N mejor pagados basta con `limit=N`.
+    """
+    if sort not in SALARY_SORT_FIELDS:
+        raise HTTPException(status_code=400, detail=f"Campo de ordenación no válido: {sort}")
+    return logic.get_salary_report(db, sort=sort, descending=desc, limit=limit, offset=offset)
+
 @router.get("/programmer-project/{programmer_id}")
 def programmer_project(programmer_id: int, db: Session = Depends(get_db)):
     return logic.get_project_by_programmer_id(db, programmer_id)
@@ -38,20 +69,170 @@ def framework_programmers(framework: str, db: Session = Depends(get_db)):
     return logic.get_programmers_by_framework(db, framework)
 
 @router.get("/export-project/{project_id}")
-def export_project(project_id: int, db: Session = Depends(get_db)):
-    filepath = f"project_{project_id}.json"
-    success = file_io.export_project(db, project_id, filepath)
-    if not success:
+def export_project(project_id: int, gzip: bool = False, db: Session = Depends(get_db)):
+    """
+    Descarga el proyecto con su equipo como JSON compacto (o `.json.gz` con
+    `gzip=true`), generado directamente en la respuesta.
+    """
+    project = file_io.get_project_for_export(db, project_id)
+    if not project or not project.team:
         raise HTTPException(status_code=404, detail="Proyecto o equipo no encontrado.")
-    return {"message": "Proyecto exportado exitosamente", "file": filepath}
-
-@router.post("/import-project")
-def import_project_from_file(file: UploadFile = File(...), db: Session = Depends(get_db)):
-    contents = file.file.read()
-    filepath = f"/tmp/{file.filename}"
-    with open(filepath, "wb") as f:
-        f.write(contents)
-
-    project = file_io.import_project(db, filepath)
-    os.remove(filepath)
-    return {"message": "Proyecto importado exitosamente", "project_id": project.id}
\ No newline at end of file
+
+    chunks = file_io.iter_project_json(project)
+    filename = f"project_{project_id}.json"
+    media_type = "application/json"
+    if gzip:
+        chunks = file_io.gzip_chunks(chunks)
+        filename += ".gz"
+        media_type = "application/gzip"
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+@router.get("/export")
+def export_projects(
+    ids: Optional[str] = Query(None, description="Ids separados por comas"),
+    type: Optional[str] = None,
+    framework: Optional[str] = None,
+):
+    """
+    Descarga varios proyectos (por ids o por filtro) en un único ZIP que se
+    genera mientras se envía.
+    """
+    try:
+        project_ids = [int(i) for i in ids.split(",") if i.strip()] if ids else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Lista de ids no válida")
+
+    def generate():
+        db = SessionLocal()
+        try:
+            projects = file_io.query_projects_for_export(db, project_ids, type=type, framework=framework)
+            yield from file_io.iter_projects_zip(projects)
+        finally:
+            db.close()
+
+    return StreamingResponse(
+        generate(),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="projects.zip"'},
+    )
+
+_IMPORT_PROJECT_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {"schema": {"type": "object"}},
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "properties": {"file": {"type": "string", "format": "binary"}},
+                    "required": ["file"],
+                }
+            },
+        },
+    }
+}
+
+@router.post("/import-project", openapi_extra=_IMPORT_PROJECT_BODY)
+async def import_project_from_file(request: Request, db: Session = Depends(get_db)):
+    """
+    Importa un proyecto exportado. Acepta el JSON como cuerpo de la petición
+    o como fichero en un formulario multipart con el campo `file`; en ambos
+    casos se procesa a medida que llega, sin ficheros temporales.
+    """
+    content_type, options = parse_options_header(request.headers.get("content-type", ""))
+    if content_type == b"multipart/form-data":
+        boundary = options.get(b"boundary")
+        if not boundary:
+            raise HTTPException(status_code=400, detail="Falta el boundary del formulario")
+        chunks = _multipart_file_chunks(_body_chunks(request), boundary)
+    else:
+        chunks = _body_chunks(request)
+
+    try:
+        project = await run_in_threadpool(file_io.import_project_stream, db, chunks)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Fichero no válido: {e}")
+    except SQLAlchemyError as e:
+        raise HTTPException(status_code=400, detail=f"No se pudo importar el proyecto: {getattr(e, 'orig', e)}")
+    return {"message": "Proyecto importado exitosamente", "project_id": project.id}
+
+def _body_chunks(request: Request):
+    """
+    Trozos del cuerpo de la petición para consumirlos desde el threadpool:
+    cada trozo se pide al bucle de eventos según el parser lo necesita.
+    """
+    stream = request.stream().__aiter__()
+    while True:
+        try:
+            chunk = from_thread.run(stream.__anext__)
+        except StopAsyncIteration:
+            return
+        if chunk:
+            yield chunk
+
+def _multipart_file_chunks(body, boundary: bytes):
+    """
+    Contenido del campo `file` de un cuerpo multipart, trozo a trozo: el
+    parser de python-multipart recibe el cuerpo según llega y los datos de
+    la parte se entregan sin pasar por disco.
+    """
+    state = {"header": b"", "value": b"", "is_file": False, "seen": False}
+    pending: List[bytes] = []
+
+    def on_part_begin():
+        state["is_file"] = False
+
+    def on_header_field(data, start, end):
+        state["header"] += data[start:end]
+
+    def on_header_value(data, start, end):
+        state["value"] += data[start:end]
+
+    def on_header_end():
+        if state["header"].lower() == b"content-disposition":
+            _, params = parse_options_header(state["value"])
+            state["is_file"] = params.get(b"name") == b"file"
+            state["seen"] = state["seen"] or state["is_file"]
+        state["header"] = state["value"] = b""
+
+    def on_part_data(data, start, end):
+        if state["is_file"]:
+            pending.append(bytes(data[start:end]))
+
+    parser = MultipartParser(boundary, {
+        "on_part_begin": on_part_begin,
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_part_data": on_part_data,
+    })
+    for chunk in body:
+        parser.write(chunk)
+        yield from pending
+        pending.clear()
+    parser.finalize()
+    if not state["seen"]:
+        raise HTTPException(status_code=400, detail="Falta el fichero 'file'")
+
+@router.post("/import-bulk")
+def import_bulk(
+    entity: str,
+    file: UploadFile = File(...),
+    batch_size: int = Query(bulk_import.DEFAULT_BATCH_SIZE, ge=1, le=10000),
+    db: Session = Depends(get_db),
+):
+    """
+    Importa proyectos, líderes, programadores o equipos desde un CSV o NDJSON.
+    Devuelve el número de filas insertadas y los errores por fila.
+    """
+    if entity not in bulk_import.ENTITIES:
+        raise HTTPException(status_code=400, detail=f"Entidad no válida: {entity}")
+    rows = bulk_import.read_rows(file.file, file.filename or "")
+    try:
+        return bulk_import.import_rows(db, entity, rows, batch_size)
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise HTTPException(status_code=400, detail=f"Fichero no válido: {e}")
@@ -0,0 +1,18 @@
+import secrets
+from fastapi import APIRouter, Header, HTTPException, Response, status
+from typing import Optional
+from app.core import metrics
+
+router = APIRouter(tags=["Metrics"])
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics(authorization: Optional[str] = Header(None)):
+    """
+    Métricas en el formato de texto de Prometheus
+    """
+    # async: el threadpool se consulta desde el bucle de eventos
+    if metrics.METRICS_TOKEN and not secrets.compare_digest(
+        authorization or "", f"Bearer {metrics.METRICS_TOKEN}"
+    ):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token de métricas no válido")
+    return Response(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
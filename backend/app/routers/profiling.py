@@ -0,0 +1,58 @@
+import asyncio
+import time
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from typing import Optional
+from app.core import metrics, profiler
+from app.core.deps import get_current_admin_user
+from app.schemas.user import UserOut
+
+router = APIRouter(prefix="/debug", tags=["Debug"])
+
+@router.get("/profile")
+async def profile(
+    request: Request,
+    seconds: Optional[float] = Query(None, gt=0, le=profiler.PROFILE_MAX_SECONDS),
+    requests: Optional[int] = Query(None, ge=1, description="Parar tras N peticiones terminadas"),
+    route: Optional[str] = Query(None, description="Plantilla de ruta, p. ej. /logic/top-earners"),
+    interval_ms: float = Query(profiler.PROFILE_INTERVAL_MS, ge=1, le=1000),
+    include_idle: bool = False,
+    current_user: UserOut = Depends(get_current_admin_user),
+):
+    """
+    Perfila el proceso durante `seconds` segundos o hasta que terminen
+    `requests` peticiones (de `route` si se indica) y devuelve las pilas en
+    formato collapsed para generar un flamegraph
+    """
+    only_codes = None
+    if route is not None:
+        only_codes = profiler.endpoint_codes(request.app.routes, route)
+        if not only_codes:
+            raise HTTPException(status_code=404, detail=f"Ruta no encontrada: {route}")
+    if seconds is None and requests is None:
+        seconds = 10.0
+    if not profiler.acquire():
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Ya hay un perfil en curso")
+
+    sampler = profiler.SamplingProfiler(interval_ms / 1000, only_codes, include_idle)
+    # Con `requests` el límite de tiempo es solo una salvaguarda
+    deadline = time.monotonic() + (seconds or profiler.PROFILE_MAX_SECONDS)
+    target = metrics.request_count(route) + requests if requests else None
+    sampler.start()
+    try:
+        while time.monotonic() < deadline:
+            if target is not None and metrics.request_count(route) >= target:
+                break
+            await asyncio.sleep(0.05)
+    finally:
+        # join() breve: el hilo termina en cuanto acaba la muestra en curso
+        sampler.stop()
+        profiler.release()
+
+    return Response(
+        sampler.collapsed(),
+        media_type="text/plain; charset=utf-8",
+        headers={
+            "Content-Disposition": 'attachment; filename="profile.folded"',
+            "X-Profile-Ticks": str(sampler.ticks),
+        },
+    )
@@ -1,8 +1,12 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.orm import Session
+from typing import Optional
 from app.schemas.project import ProjectCreate, ProjectOut
 from app.crud import project as crud_project
 from app.core.database import get_db
+from app.utils.http_cache import conditional_get
+from app.utils.pagination import PageParams, parse_fields, rows_response, split_page
+from app.utils.streaming import ndjson_response, wants_stream
 
 router = APIRouter(prefix="/projects", tags=["Projects"])
 
@@ -10,6 +14,29 @@ router = APIRouter(prefix="/projects", tags=["Projects"])
 def create_project(project: ProjectCreate, db: Session = Depends(get_db)):
     return crud_project.create_project(db, project)
 
-@router.get("/", response_model=list[ProjectOut])
-def get_all_projects(db: Session = Depends(get_db)):
-    return crud_project.get_all_projects(db)
+@router.get(
+    "/", response_model=list[ProjectOut],
+    dependencies=[Depends(conditional_get(*crud_project.PROJECT_TABLES))],
+)
+def get_all_projects(
+    request: Request,
+    type: Optional[str] = None,
+    framework: Optional[str] = None,
+    stream: bool = False,
+    page: PageParams = Depends(),
+    db: Session = Depends(get_db)
+):
+    if wants_stream(request, stream):
+        return ndjson_response(
+            lambda db, batch_size: crud_project.stream_projects(
+                db, type=type, framework=framework, after_id=page.after_id, batch_size=batch_size
+            ),
+            ProjectOut,
+            parse_fields(page.fields, ProjectOut),
+        )
+    projects = crud_project.get_project_rows(
+        db, type=type, framework=framework, after_id=page.after_id, limit=page.limit,
+        include=parse_fields(page.fields, ProjectOut),
+    )
+    projects, next_cursor = split_page(projects, page.limit)
+    return rows_response(projects, next_cursor, ProjectOut, page.fields)
@@ -1,40 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.core.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
 from app.crud import team as crud_team
 from app.crud import worker as crud_worker
 from app.schemas.team import *
 from app.schemas.worker import LeaderOut
 from app.core.deps import get_current_active_user
-from app.models.user import User
+from app.schemas.user import UserOut
+from app.utils.http_cache import conditional_get
+from app.utils.pagination import PageParams, page_response, parse_fields, split_page
+from app.utils.schema_utils import orm_to_dict
+from app.utils.streaming import ndjson_response, wants_stream
 
 router = APIRouter(prefix="/teams", tags=["Teams"])
 
-@router.get("/available-leaders/", response_model=list[LeaderOut])
-def get_available_leaders(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+@router.get(
+    "/available-leaders/", response_model=list[LeaderOut],
+    dependencies=[Depends(get_current_active_user), Depends(conditional_get(*crud_worker.LEADER_TABLES))],
+)
+async def get_available_leaders(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserOut = Depends(get_current_active_user)
 ):
     """
     Obtener todos los líderes que no están asignados a ningún equipo
     """
     try:
-        # Obtener todos los líderes
-        all_leaders = crud_worker.get_all_leaders(db)
-        
-        # Obtener todos los equipos con sus líderes asignados
-        all_teams = crud_team.get_all_teams(db)
-        
-        # Extraer los IDs de líderes que ya están asignados
-        assigned_leader_ids = {team.lider_id for team in all_teams if team.lider_id is not None}
-        
-        # Filtrar líderes disponibles (no asignados)
-        available_leaders = [
-            leader for leader in all_leaders 
-            if leader.id not in assigned_leader_ids
-        ]
-        
-        return available_leaders
+        return await db.run_sync(crud_worker.get_all_leaders, unassigned=True)
         
     except Exception as e:
         raise HTTPException(
@@ -42,69 +34,91 @@ def get_available_leaders(
             detail=f"Error al obtener líderes disponibles: {str(e)}"
         )
 
-@router.get("/", response_model=list[TeamOut])
-def get_all_teams(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+@router.get(
+    "/", response_model=list[TeamOut],
+    dependencies=[Depends(get_current_active_user), Depends(conditional_get(*crud_team.TEAM_TABLES))],
+)
+async def get_all_teams(
+    request: Request,
+    response: Response,
+    stream: bool = False,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserOut = Depends(get_current_active_user)
 ):
     """Obtener todos los equipos"""
-    return crud_team.get_all_teams(db)
+    if wants_stream(request, stream):
+        return ndjson_response(
+            lambda db, batch_size: crud_team.stream_teams(db, after_id=page.after_id, batch_size=batch_size),
+            TeamOut,
+            parse_fields(page.fields, TeamOut),
+        )
+
+    def load(session):
+        teams = crud_team.get_all_teams(session, after_id=page.after_id, limit=page.limit)
+        teams, next_cursor = split_page(teams, page.limit)
+        return page_response(response, teams, next_cursor, TeamOut, page.fields, serialize=True)
+    return await db.run_sync(load)
 
 @router.post("/", response_model=TeamOut)
-def create_team(
+async def create_team(
     team: TeamCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserOut = Depends(get_current_active_user)
 ):
     """Crear un nuevo equipo"""
     
     # Validar que el líder no esté ya asignado a otro equipo
     if team.lider_id:
-        existing_team = crud_team.get_team_by_leader_id(db, team.lider_id)
+        existing_team = await db.run_sync(crud_team.get_team_by_leader_id, team.lider_id)
         if existing_team:
             raise HTTPException(
                 status_code=400,
                 detail=f"El líder ya está asignado al equipo '{existing_team.nombre}'"
             )
     
-    return crud_team.create_team(db, team)
+    def create(session):
+        return orm_to_dict(TeamOut, crud_team.create_team(session, team))
+    return await db.run_sync(create)
 
 @router.put("/{team_id}", response_model=TeamOut)
-def update_team(
+async def update_team(
     team_id: int,
     team: TeamUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserOut = Depends(get_current_active_user)
 ):
     """Actualizar un equipo existente"""
     
     # Verificar que el equipo existe
-    existing_team = crud_team.get_team_by_id(db, team_id)
+    existing_team = await db.run_sync(crud_team.get_team_by_id, team_id)
     if not existing_team:
         raise HTTPException(status_code=404, detail="Equipo no encontrado")
     
     # Validar que el nuevo líder no esté ya asignado a otro equipo
     if team.lider_id and team.lider_id != existing_team.lider_id:
-        team_with_leader = crud_team.get_team_by_leader_id(db, team.lider_id)
+        team_with_leader = await db.run_sync(crud_team.get_team_by_leader_id, team.lider_id)
         if team_with_leader and team_with_leader.id != team_id:
             raise HTTPException(
                 status_code=400,
                 detail=f"El líder ya está asignado al equipo '{team_with_leader.nombre}'"
             )
     
-    return crud_team.update_team(db, team_id, team)
+    def update(session):
+        return orm_to_dict(TeamOut, crud_team.update_team(session, team_id, team))
+    return await db.run_sync(update)
 
 @router.delete("/{team_id}")
-def delete_team(
+async def delete_team(
     team_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserOut = Depends(get_current_active_user)
 ):
     """Eliminar un equipo"""
     
-    team = crud_team.get_team_by_id(db, team_id)
+    team = await db.run_sync(crud_team.get_team_by_id, team_id)
     if not team:
         raise HTTPException(status_code=404, detail="Equipo no encontrado")
     
-    crud_team.delete_team(db, team_id)
+    await db.run_sync(crud_team.delete_team, team_id)
     return {"message": f"Equipo '{team.nombre}' eliminado exitosamente"}
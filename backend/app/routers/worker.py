@@ -1,24 +1,31 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
 from app.schemas.worker import *
-from app.core.database import get_db
+from app.core.database import get_async_db
 from app.crud import worker as crud_worker
 from app.core.deps import get_current_active_user, get_current_admin_user
-from app.models.user import User
+from app.schemas.user import UserOut
+from app.utils.http_cache import conditional_get
+from app.utils.pagination import PageParams, parse_fields, rows_response, split_page
+from app.utils.schema_utils import orm_to_dict
+from app.utils.streaming import ndjson_response, wants_stream
 
 router = APIRouter(prefix="/workers", tags=["Workers"])
 
 @router.post("/programmers", response_model=ProgrammerOut)
-def create_programmer(
+async def create_programmer(
     programmer: ProgrammerCreate, 
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserOut = Depends(get_current_active_user)
 ):
-    return crud_worker.create_programmer(db, programmer)
+    def create(session):
+        return orm_to_dict(ProgrammerOut, crud_worker.create_programmer(session, programmer))
+    return await db.run_sync(create)
 
 @router.post("/leaders", response_model=LeaderResponse)
-def create_leader(leader: LeaderCreate, db: Session = Depends(get_db)):
-    db_leader = crud_worker.create_leader(db, leader)
+async def create_leader(leader: LeaderCreate, db: AsyncSession = Depends(get_async_db)):
+    db_leader = await db.run_sync(crud_worker.create_leader, leader)
     return {
         "id": db_leader.id,
         "name": db_leader.name,
@@ -30,40 +37,91 @@ def create_leader(leader: LeaderCreate, db: Session = Depends(get_db)):
         "team_id": None
     }
 
-@router.get("/programmers", response_model=list[ProgrammerOut])
-def list_programmers(db: Session = Depends(get_db)):
-    return crud_worker.get_all_programmers(db)
+@router.get(
+    "/programmers", response_model=list[ProgrammerOut],
+    dependencies=[Depends(conditional_get(*crud_worker.PROGRAMMER_TABLES))],
+)
+async def list_programmers(
+    request: Request,
+    category: Optional[str] = None,
+    language: Optional[str] = None,
+    stream: bool = False,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db)
+):
+    if wants_stream(request, stream):
+        return ndjson_response(
+            lambda db, batch_size: crud_worker.stream_programmers(
+                db, category=category, language=language, after_id=page.after_id, batch_size=batch_size
+            ),
+            ProgrammerOut,
+            parse_fields(page.fields, ProgrammerOut),
+        )
+
+    def load(session):
+        programmers = crud_worker.get_programmer_rows(
+            session, category=category, language=language, after_id=page.after_id, limit=page.limit,
+            include=parse_fields(page.fields, ProgrammerOut),
+        )
+        programmers, next_cursor = split_page(programmers, page.limit)
+        return rows_response(programmers, next_cursor, ProgrammerOut, page.fields)
+    return await db.run_sync(load)
+
+@router.get(
+    "/leaders", response_model=list[LeaderOut],
+    dependencies=[Depends(conditional_get(*crud_worker.LEADER_TABLES))],
+)
+async def list_leaders(
+    request: Request,
+    unassigned: bool = False,
+    stream: bool = False,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db)
+):
+    if wants_stream(request, stream):
+        return ndjson_response(
+            lambda db, batch_size: crud_worker.stream_leaders(
+                db, unassigned=unassigned, after_id=page.after_id, batch_size=batch_size
+            ),
+            LeaderOut,
+            parse_fields(page.fields, LeaderOut),
+        )
 
-@router.get("/leaders", response_model=list[LeaderOut])
-def list_leaders(db: Session = Depends(get_db)):
-    return crud_worker.get_all_leaders(db)
+    def load(session):
+        leaders = crud_worker.get_leader_rows(
+            session, unassigned=unassigned, after_id=page.after_id, limit=page.limit,
+            include=parse_fields(page.fields, LeaderOut),
+        )
+        leaders, next_cursor = split_page(leaders, page.limit)
+        return rows_response(leaders, next_cursor, LeaderOut, page.fields)
+    return await db.run_sync(load)
 
 # ========== NUEVOS ENDPOINTS DELETE ==========
 
 @router.delete("/programmers/{programmer_id}")
-def delete_programmer(
+async def delete_programmer(
     programmer_id: int, 
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserOut = Depends(get_current_active_user)
 ):
     """Eliminar un programador por ID"""
-    programmer = crud_worker.get_programmer_by_id(db, programmer_id)
+    programmer = await db.run_sync(crud_worker.get_programmer_by_id, programmer_id)
     if not programmer:
         raise HTTPException(status_code=404, detail="Programador no encontrado")
     
-    crud_worker.delete_programmer(db, programmer_id)
+    await db.run_sync(crud_worker.delete_programmer, programmer_id)
     return {"message": f"Programador con ID {programmer_id} eliminado exitosamente"}
 
 @router.delete("/leaders/{leader_id}")
-def delete_leader(
+async def delete_leader(
     leader_id: int, 
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserOut = Depends(get_current_active_user)
 ):
     """Eliminar un líder por ID"""
-    leader = crud_worker.get_leader_by_id(db, leader_id)
+    leader = await db.run_sync(crud_worker.get_leader_by_id, leader_id)
     if not leader:
         raise HTTPException(status_code=404, detail="Líder no encontrado")
     
-    crud_worker.delete_leader(db, leader_id)
+    await db.run_sync(crud_worker.delete_leader, leader_id)
     return {"message": f"Líder con ID {leader_id} eliminado exitosamente"}
@@ -0,0 +1,19 @@
+from datetime import datetime
+from pydantic import BaseModel
+from typing import Optional
+
+class JobOut(BaseModel):
+    id: str
+    type: str
+    status: str
+    progress: float
+    message: Optional[str] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    result_filename: Optional[str] = None
+    result_size: Optional[int] = None
+
+    class Config:
+        orm_mode = True
@@ -3,7 +3,7 @@ from typing import Optional
 
 class ProjectBase(BaseModel):
     name: str
-    description: Optional[str]
+    description: Optional[str] = None
     estimated_time: int
     price: float
     type: str  # 'gestion' o 'multimedia'
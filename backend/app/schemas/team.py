@@ -16,6 +16,11 @@ class TeamUpdate(BaseModel):
     descripcion: Optional[str] = None
     lider_id: Optional[int] = None
 
+class TeamImportRow(BaseModel):
+    """Fila de importación masiva de equipos"""
+    project_id: Optional[int] = None
+    leader_id: Optional[int] = None
+
 class TeamOut(TeamBase):
     id: int
     leader: Optional[LeaderOut]
@@ -0,0 +1,277 @@
+"""
+Ejecución en segundo plano de importaciones, exportaciones e informes.
+
+Los trabajos se registran en la tabla `jobs` y se ejecutan en un pool de
+hilos propio de cada tipo, separado del threadpool que atiende las
+peticiones, así que un trabajo pesado no deja a la API sin hilos. No hace
+falta ningún broker externo.
+
+Cada trabajo guarda qué proceso lo ejecuta y un latido que ese proceso
+renueva mientras el trabajo está en cola o en marcha. Con varios workers,
+el arranque de uno solo da por interrumpidos los trabajos de procesos que
+ya no existen o que dejaron de latir. El resultado se escribe en un fichero
+de JOBS_RESULT_DIR (compartido por los workers) y se descarga desde ahí,
+sin pasar entero por memoria. Pasados JOBS_RESULT_TTL segundos desde que
+terminan, los trabajos se borran junto con su fichero.
+"""
+import os
+import socket
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import BinaryIO, Callable, Dict, Optional, Set, Tuple
+from app.core.database import SessionLocal
+from app.models.job import Job
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, default))
+
+# Trabajos simultáneos por tipo
+JOB_CONCURRENCY: Dict[str, int] = {
+    "import": _env_int("JOBS_IMPORT_CONCURRENCY", 1),
+    "export": _env_int("JOBS_EXPORT_CONCURRENCY", 2),
+    "report": _env_int("JOBS_REPORT_CONCURRENCY", 2),
+}
+PROGRESS_INTERVAL = 0.5  # segundos entre actualizaciones de progreso
+# Segundos entre latidos, y sin latido a partir de los cuales un trabajo se
+# da por interrumpido
+JOBS_HEARTBEAT_INTERVAL = _env_int("JOBS_HEARTBEAT_INTERVAL", 10)
+JOBS_HEARTBEAT_TIMEOUT = _env_int("JOBS_HEARTBEAT_TIMEOUT", 60)
+# Con workers en varias máquinas debe ser un directorio compartido
+JOBS_RESULT_DIR = os.getenv("JOBS_RESULT_DIR", os.path.join(tempfile.gettempdir(), "app-job-results"))
+# Segundos que se conservan los trabajos terminados y su resultado (0: sin
+# límite), y cada cuánto se buscan los caducados mientras hay latido
+JOBS_RESULT_TTL = _env_int("JOBS_RESULT_TTL", 24 * 3600)
+JOBS_PURGE_INTERVAL = _env_int("JOBS_PURGE_INTERVAL", 3600)
+
+# Identifica este proceso: el pid solo no basta (se reutiliza tras reiniciar)
+BOOT_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+_executors: Dict[str, ThreadPoolExecutor] = {}
+
+# Trabajos de este proceso en cola o en marcha, que necesitan latido
+_active: Set[str] = set()
+_active_lock = threading.Lock()
+_heartbeat_stop = threading.Event()
+_heartbeat_thread: Optional[threading.Thread] = None
+
+# Resultado de un trabajo: (media type, nombre de fichero); el contenido se
+# escribe en `JobContext.output`
+JobResult = Tuple[str, str]
+
+class JobContext:
+    """
+    Lo que recibe la función de un trabajo: su id, cómo informar del progreso
+    y el fichero binario donde escribir el resultado.
+    """
+
+    def __init__(self, job_id: str, output: BinaryIO):
+        self.job_id = job_id
+        self.output = output
+        self._last_update = 0.0
+
+    def progress(self, fraction: float, message: Optional[str] = None, force: bool = False):
+        """
+        Guarda el progreso (0..1) en una sesión aparte, de modo que sea visible
+        aunque el trabajo tenga su propia transacción abierta.
+        """
+        now = time.monotonic()
+        if not force and now - self._last_update < PROGRESS_INTERVAL:
+            return
+        self._last_update = now
+        _update(self.job_id, progress=min(max(fraction, 0.0), 1.0), message=message)
+
+def _executor(job_type: str) -> ThreadPoolExecutor:
+    if job_type not in _executors:
+        _executors[job_type] = ThreadPoolExecutor(
+            max_workers=JOB_CONCURRENCY[job_type], thread_name_prefix=f"job-{job_type}"
+        )
+    return _executors[job_type]
+
+def _update(job_id: str, **values):
+    with SessionLocal() as db:
+        db.query(Job).filter(Job.id == job_id).update(values, synchronize_session=False)
+        db.commit()
+
+def submit(job_type: str, func: Callable[[JobContext], JobResult]) -> str:
+    """Registra un trabajo y lo encola; devuelve su id."""
+    if job_type not in JOB_CONCURRENCY:
+        raise ValueError(f"Tipo de trabajo no válido: {job_type}")
+
+    job_id = uuid.uuid4().hex
+    with SessionLocal() as db:
+        db.add(Job(
+            id=job_id, type=job_type, status="queued", progress=0.0,
+            owner=BOOT_ID, heartbeat_at=datetime.utcnow(),
+        ))
+        db.commit()
+    with _active_lock:
+        _active.add(job_id)
+    _start_heartbeat()
+    _executor(job_type).submit(_run, job_id, func)
+    return job_id
+
+def _run(job_id: str, func: Callable[[JobContext], JobResult]):
+    try:
+        _execute(job_id, func)
+    finally:
+        with _active_lock:
+            _active.discard(job_id)
+
+def _execute(job_id: str, func: Callable[[JobContext], JobResult]):
+    _update(job_id, status="running", started_at=datetime.utcnow())
+    os.makedirs(JOBS_RESULT_DIR, exist_ok=True)
+    path = os.path.join(JOBS_RESULT_DIR, job_id)
+    # Se escribe en un fichero aparte y se renombra al terminar: nunca se
+    # sirve un resultado a medias
+    partial = path + ".part"
+    try:
+        with open(partial, "wb") as output:
+            media_type, filename = func(JobContext(job_id, output))
+        os.replace(partial, path)
+    except Exception as e:
+        if os.path.exists(partial):
+            os.remove(partial)
+        _update(job_id, status="failed", error=str(e), finished_at=datetime.utcnow())
+        return
+    _update(
+        job_id,
+        status="succeeded",
+        progress=1.0,
+        message=None,
+        result_path=path,
+        result_media_type=media_type,
+        result_filename=filename,
+        result_size=os.path.getsize(path),
+        finished_at=datetime.utcnow(),
+    )
+
+def get_job(db, job_id: str) -> Optional[Job]:
+    return db.query(Job).filter(Job.id == job_id).first()
+
+def get_result(db, job_id: str) -> Optional[Tuple[str, str, str]]:
+    """(ruta del fichero, media type, nombre) de un trabajo terminado."""
+    row = (
+        db.query(Job.result_path, Job.result_media_type, Job.result_filename)
+        .filter(Job.id == job_id, Job.status == "succeeded")
+        .first()
+    )
+    return tuple(row) if row else None
+
+# ─── Latido y recuperación ───
+
+def _start_heartbeat():
+    global _heartbeat_thread
+    with _active_lock:
+        if _heartbeat_thread is not None and _heartbeat_thread.is_alive():
+            return
+        _heartbeat_stop.clear()
+        _heartbeat_thread = threading.Thread(target=_heartbeat_loop, name="job-heartbeat", daemon=True)
+        _heartbeat_thread.start()
+
+def _heartbeat_loop():
+    last_purge = time.monotonic()
+    while not _heartbeat_stop.wait(JOBS_HEARTBEAT_INTERVAL):
+        if time.monotonic() - last_purge >= JOBS_PURGE_INTERVAL:
+            last_purge = time.monotonic()
+            try:
+                purge_expired()
+            except Exception:
+                pass  # se reintenta en la siguiente pasada
+        with _active_lock:
+            job_ids = list(_active)
+        if not job_ids:
+            continue
+        try:
+            with SessionLocal() as db:
+                db.query(Job).filter(Job.id.in_(job_ids)).update(
+                    {"heartbeat_at": datetime.utcnow()}, synchronize_session=False
+                )
+                db.commit()
+        except Exception:
+            # Un latido perdido no debe parar el hilo: el siguiente lo repone
+            pass
+
+def _owner_gone(owner: Optional[str]) -> bool:
+    """El proceso dueño era de esta máquina y ya no existe (o es este mismo, reiniciado)."""
+    if not owner:
+        return True
+    host, _, rest = owner.partition(":")
+    pid = rest.partition(":")[0]
+    if host != socket.gethostname() or not pid.isdigit():
+        return False
+    if int(pid) == os.getpid():
+        return owner != BOOT_ID
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return True
+    except OSError:
+        return False  # existe pero es de otro usuario
+    return False
+
+def recover_interrupted():
+    """
+    Marca como fallidos los trabajos en cola o en marcha cuyo proceso ya no
+    existe o que llevan más de JOBS_HEARTBEAT_TIMEOUT segundos sin latir.
+    Los de otros workers vivos no se tocan.
+    """
+    expired = datetime.utcnow() - timedelta(seconds=JOBS_HEARTBEAT_TIMEOUT)
+    with SessionLocal() as db:
+        candidates = db.query(Job.id, Job.owner, Job.heartbeat_at).filter(
+            Job.status.in_(("queued", "running"))
+        ).all()
+        interrupted = [
+            job_id for job_id, owner, heartbeat_at in candidates
+            if heartbeat_at is None or heartbeat_at < expired or _owner_gone(owner)
+        ]
+        if not interrupted:
+            return
+        db.query(Job).filter(
+            Job.id.in_(interrupted), Job.status.in_(("queued", "running"))
+        ).update(
+            {"status": "failed", "error": "Interrumpido por un reinicio del servidor",
+             "finished_at": datetime.utcnow()},
+            synchronize_session=False,
+        )
+        db.commit()
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass  # ya lo borró otro worker
+
+def purge_expired():
+    """
+    Borra los trabajos terminados hace más de JOBS_RESULT_TTL segundos y sus
+    ficheros, incluido el `.part` que deja un trabajo interrumpido.
+    """
+    if JOBS_RESULT_TTL <= 0:
+        return
+    expired = datetime.utcnow() - timedelta(seconds=JOBS_RESULT_TTL)
+    with SessionLocal() as db:
+        rows = db.query(Job.id, Job.result_path).filter(
+            Job.status.in_(("succeeded", "failed")), Job.finished_at < expired
+        ).all()
+        if not rows:
+            return
+        db.query(Job).filter(Job.id.in_([job_id for job_id, _ in rows])).delete(synchronize_session=False)
+        db.commit()
+    # Primero las filas: un fichero sin fila no se puede pedir, y si falla
+    # el borrado del fichero solo queda un resto en disco
+    for job_id, result_path in rows:
+        path = os.path.join(JOBS_RESULT_DIR, job_id)
+        _remove(path + ".part")
+        _remove(path)
+        if result_path and result_path != path:
+            _remove(result_path)
+
+def shutdown():
+    for executor in _executors.values():
+        executor.shutdown(wait=False, cancel_futures=True)
+    _executors.clear()
+    _heartbeat_stop.set()
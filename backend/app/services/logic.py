@@ -1,62 +1,64 @@
+from sqlalchemy import func
+from sqlalchemy.orm import with_polymorphic
+from app.core.cache import cached
 from app.models.project import Project
 from app.models.worker import Worker, Programmer, Leader 
+from app.services import payroll, statistics
 
+# Tablas de las que depende cada grupo de funciones (ver app.core.cache)
+STAFF_TABLES = ("projects", "teams", "workers", "programmers")
+PAYROLL_TABLES = STAFF_TABLES + ("leaders", "programmer_language")
+
+@cached("projects")
 def count_projects_by_type(db):
-    gestion = db.query(Project).filter(Project.type == "gestion").count()
-    multimedia = db.query(Project).filter(Project.type == "multimedia").count()
-    return {"gestion": gestion, "multimedia": multimedia}
+    counts = {"gestion": 0, "multimedia": 0}
+    counts.update(db.query(Project.type, func.count(Project.id)).group_by(Project.type).all())
+    return counts
+
+@cached(*statistics.STATISTICS_TABLES)
+def get_statistics(db):
+    return statistics.dashboard_statistics(db)
 
+@cached("projects")
 def get_earliest_project(db):
     return db.query(Project).order_by(Project.estimated_time).first()
 
+@cached(*PAYROLL_TABLES)
 def calculate_total_payroll(db):
-    total = 0
-    workers = db.query(Worker).all()
-    for w in workers:
-        if isinstance(w, Programmer):
-            if w.team and w.team.project:
-                bonus = 0.05 * w.team.project.price + 3 * len(w.languages)
-                total += w.base_salary + bonus
-            else:
-                total += w.base_salary
-        elif isinstance(w, Leader):
-            if w.team and w.team.project:
-                bonus = 0.10 * w.team.project.price + 5 * w.experience_years
-                total += w.base_salary + bonus
-            else:
-                total += w.base_salary
-    return total
+    return payroll.total_payroll(db)
 
+@cached(*PAYROLL_TABLES)
 def get_highest_paid_workers(db):
-    workers = db.query(Worker).all()
-    salaries = []
-
-    for w in workers:
-        salary = w.base_salary
-        if isinstance(w, Programmer) and w.team and w.team.project:
-            salary += 0.05 * w.team.project.price + 3 * len(w.languages)
-        elif isinstance(w, Leader) and w.team and w.team.project:
-            salary += 0.10 * w.team.project.price + 5 * w.experience_years
-        salaries.append((w, salary))
-    
-    if not salaries:
+    top = payroll.highest_salary_ids(db)
+    if not top:
         return []
 
-    max_salary = max(salaries, key=lambda x: x[1])[1]
-    return [{"worker": w, "salary": s} for w, s in salaries if s == max_salary]
+    workers = (
+        db.query(with_polymorphic(Worker, "*"))
+        .filter(Worker.id.in_([worker_id for worker_id, _ in top]))
+        .all()
+    )
+    by_id = {w.id: w for w in workers}
+    return [{"worker": by_id[worker_id], "salary": s} for worker_id, s in top]
+
+def get_salary_report(db, sort: str = "salary", descending: bool = True, limit=None, offset: int = 0):
+    return payroll.salary_breakdown(db, sort=sort, descending=descending, limit=limit, offset=offset)
 
+@cached(*STAFF_TABLES)
 def get_project_by_programmer_id(db, programmer_id: int):
     prog = db.query(Programmer).filter(Programmer.id == programmer_id).first()
     if not prog or not prog.team or not prog.team.project:
         return None
     return prog.team.project
 
+@cached(*STAFF_TABLES)
 def get_programmers_by_project_id(db, project_id: int):
     project = db.query(Project).filter(Project.id == project_id).first()
     if not project or not project.team:
         return []
     return project.team.programmers
 
+@cached(*STAFF_TABLES)
 def get_programmers_by_framework(db, framework: str):
     projects = db.query(Project).filter(
         Project.type == "gestion", Project.framework == framework
@@ -0,0 +1,169 @@
+from typing import List, Optional, Tuple
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session, aliased
+from app.models.project import Project
+from app.models.team import Team
+from app.models.worker import Worker, Programmer, Leader, ProgrammerLanguage
+
+# Reglas de bonificación
+PROGRAMMER_PROJECT_RATE = 0.05
+PROGRAMMER_LANGUAGE_BONUS = 3
+LEADER_PROJECT_RATE = 0.10
+LEADER_EXPERIENCE_BONUS = 5
+
+def salary_subquery(db: Session):
+    """
+    Subconsulta con el desglose salarial de cada trabajador, calculado en SQL.
+
+    Columnas: worker_id, name, type, base_salary, project_bonus, skill_bonus,
+    bonus y salary. Los trabajadores sin equipo o cuyo equipo no tiene
+    proyecto cobran solo el salario base, igual que el cálculo original.
+    """
+    workers = Worker.__table__
+    programmers = Programmer.__table__
+    leaders = Leader.__table__
+
+    programmer_team = aliased(Team)
+    leader_team = aliased(Team)
+    programmer_project = aliased(Project)
+    leader_project = aliased(Project)
+
+    language_counts = (
+        db.query(
+            ProgrammerLanguage.programmer_id.label("programmer_id"),
+            func.count(ProgrammerLanguage.language_id).label("languages"),
+        )
+        .group_by(ProgrammerLanguage.programmer_id)
+        .subquery()
+    )
+
+    is_programmer = (workers.c.type == "programmer") & programmer_project.price.isnot(None)
+    is_leader = (workers.c.type == "leader") & leader_project.price.isnot(None)
+
+    project_bonus = case(
+        (is_programmer, PROGRAMMER_PROJECT_RATE * programmer_project.price),
+        (is_leader, LEADER_PROJECT_RATE * leader_project.price),
+        else_=0,
+    )
+    skill_bonus = case(
+        (is_programmer, PROGRAMMER_LANGUAGE_BONUS * func.coalesce(language_counts.c.languages, 0)),
+        (is_leader, LEADER_EXPERIENCE_BONUS * leaders.c.experience_years),
+        else_=0,
+    )
+
+    breakdown = (
+        db.query(
+            workers.c.id.label("worker_id"),
+            workers.c.name.label("name"),
+            workers.c.type.label("type"),
+            workers.c.base_salary.label("base_salary"),
+            project_bonus.label("project_bonus"),
+            skill_bonus.label("skill_bonus"),
+            (project_bonus + skill_bonus).label("bonus"),
+            (is_programmer | is_leader).label("has_project"),
+        )
+        .select_from(workers)
+        .outerjoin(programmers, programmers.c.id == workers.c.id)
+        .outerjoin(leaders, leaders.c.id == workers.c.id)
+        .outerjoin(programmer_team, programmer_team.id == programmers.c.team_id)
+        .outerjoin(programmer_project, programmer_project.id == programmer_team.project_id)
+        .outerjoin(leader_team, leader_team.leader_id == leaders.c.id)
+        .outerjoin(leader_project, leader_project.id == leader_team.project_id)
+        .outerjoin(language_counts, language_counts.c.programmer_id == programmers.c.id)
+        .subquery()
+    )
+
+    # El total se calcula sobre la subconsulta para que el orden de las
+    # operaciones de coma flotante sea base + (proyecto + extra), exactamente
+    # como en el cálculo original en Python.
+    salary = case(
+        (breakdown.c.has_project, breakdown.c.base_salary + breakdown.c.bonus),
+        else_=breakdown.c.base_salary,
+    )
+
+    return (
+        db.query(
+            breakdown.c.worker_id,
+            breakdown.c.name,
+            breakdown.c.type,
+            breakdown.c.base_salary,
+            breakdown.c.project_bonus,
+            breakdown.c.skill_bonus,
+            breakdown.c.bonus,
+            salary.label("salary"),
+        )
+        .subquery()
+    )
+
+def total_payroll(db: Session) -> float:
+    """
+    Nómina total de programadores y líderes con una sola consulta.
+
+    Se suman las filas en Python, en orden de id, para obtener el mismo
+    resultado de coma flotante que la suma acumulada original.
+    """
+    salaries = salary_subquery(db)
+    rows = (
+        db.query(salaries.c.salary)
+        .filter(salaries.c.type.in_(("programmer", "leader")))
+        .order_by(salaries.c.worker_id)
+    )
+    total = 0
+    for (salary,) in rows:
+        total += salary
+    return total
+
+def payroll_sum(db: Session):
+    """
+    Nómina total como subconsulta escalar (SUM en SQL), para añadirla a otras
+    consultas. La base de datos decide el orden de la suma, así que puede
+    diferir de total_payroll en los últimos decimales.
+    """
+    salaries = salary_subquery(db)
+    return (
+        select(func.coalesce(func.sum(salaries.c.salary), 0))
+        .where(salaries.c.type.in_(("programmer", "leader")))
+        .scalar_subquery()
+    )
+
+SALARY_SORT_FIELDS = ("salary", "base_salary", "bonus", "name", "worker_id")
+
+def salary_breakdown(
+    db: Session,
+    sort: str = "salary",
+    descending: bool = True,
+    limit: Optional[int] = None,
+    offset: int = 0,
+):
+    """
+    Desglose salarial por trabajador, ordenado y paginado en SQL.
+
+    Con `limit` el motor de SQLite usa un ordenamiento acotado, de modo que
+    obtener los N mejor pagados cuesta O(n log N) en lugar de ordenar toda
+    la tabla.
+    """
+    if sort not in SALARY_SORT_FIELDS:
+        raise ValueError(f"Campo de ordenación no válido: {sort}")
+
+    salaries = salary_subquery(db)
+    column = salaries.c[sort]
+    query = db.query(salaries).order_by(
+        column.desc() if descending else column.asc(),
+        salaries.c.worker_id,
+    )
+    if offset:
+        query = query.offset(offset)
+    if limit is not None:
+        query = query.limit(limit)
+    return query.all()
+
+def highest_salary_ids(db: Session) -> List[Tuple[int, float]]:
+    """Ids y salario de los trabajadores que cobran el salario máximo."""
+    salaries = salary_subquery(db)
+    max_salary = db.query(func.max(salaries.c.salary)).scalar_subquery()
+    return (
+        db.query(salaries.c.worker_id, salaries.c.salary)
+        .filter(salaries.c.salary == max_salary)
+        .order_by(salaries.c.worker_id)
+        .all()
+    )
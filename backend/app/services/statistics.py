@@ -0,0 +1,118 @@
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.models.project import Project
+from app.models.team import Team
+from app.models.worker import Worker, Programmer, Leader
+from app.services import payroll
+
+# Tablas de las que dependen las estadísticas (ver app.core.cache)
+STATISTICS_TABLES = ("projects", "teams", "workers", "programmers", "leaders", "programmer_language")
+
+def project_statistics(db: Session) -> dict:
+    """Proyectos por tipo y framework, e ingresos (suma de precios), en una consulta."""
+    rows = (
+        db.query(Project.type, Project.framework, func.count(Project.id), func.sum(Project.price))
+        .group_by(Project.type, Project.framework)
+        .all()
+    )
+    by_type = {"gestion": 0, "multimedia": 0}
+    by_framework = {}
+    total = 0
+    revenue = 0.0
+    for type_, framework, count, price_sum in rows:
+        by_type[type_] = by_type.get(type_, 0) + count
+        if framework is not None:
+            by_framework[framework] = by_framework.get(framework, 0) + count
+        total += count
+        revenue += price_sum or 0.0
+    return {"total": total, "by_type": by_type, "by_framework": by_framework, "revenue": revenue}
+
+def staff_statistics(db: Session) -> dict:
+    """
+    Trabajadores por tipo y categoría junto con la ocupación de los equipos
+    y la nómina total, en una consulta: el agrupado de trabajadores lleva los
+    totales de equipos y la suma de salarios como subconsultas escalares.
+    """
+    programmers = Programmer.__table__
+    leaders = Leader.__table__
+    teams = Team.__table__
+
+    team_total = select(func.count()).select_from(teams).scalar_subquery()
+    teams_with_leader = select(func.count()).select_from(teams).where(teams.c.leader_id.isnot(None)).scalar_subquery()
+    teams_with_project = select(func.count()).select_from(teams).where(teams.c.project_id.isnot(None)).scalar_subquery()
+    assigned_programmers = (
+        select(func.count()).select_from(programmers).where(programmers.c.team_id.isnot(None)).scalar_subquery()
+    )
+    unassigned_leaders = (
+        select(func.count())
+        .select_from(leaders)
+        .where(~select(teams.c.id).where(teams.c.leader_id == leaders.c.id).exists())
+        .scalar_subquery()
+    )
+    payroll_total = payroll.payroll_sum(db)
+
+    rows = (
+        db.query(
+            Worker.type,
+            programmers.c.category,
+            func.count(Worker.id),
+            team_total,
+            teams_with_leader,
+            teams_with_project,
+            assigned_programmers,
+            unassigned_leaders,
+            payroll_total,
+        )
+        .select_from(Worker)
+        .outerjoin(programmers, programmers.c.id == Worker.id)
+        .group_by(Worker.type, programmers.c.category)
+        .all()
+    )
+
+    if rows:
+        _, _, _, team_count, with_leader, with_project, assigned, unassigned, total_payroll = rows[0]
+    else:
+        # Sin trabajadores no hay filas: los totales de equipos se piden aparte
+        team_count, with_leader, with_project = db.execute(
+            select(team_total, teams_with_leader, teams_with_project)
+        ).one()
+        assigned, unassigned, total_payroll = 0, 0, 0
+
+    by_type = {}
+    by_category = {}
+    for type_, category, count, *_ in rows:
+        by_type[type_] = by_type.get(type_, 0) + count
+        if type_ == "programmer":
+            by_category[category] = by_category.get(category, 0) + count
+
+    def rate(part):
+        return part / team_count if team_count else 0.0
+
+    return {
+        "workers": {
+            "total": sum(by_type.values()),
+            "by_type": by_type,
+            "programmers_by_category": by_category,
+        },
+        "teams": {
+            "total": team_count,
+            "with_leader": with_leader,
+            "with_project": with_project,
+            "leader_fill_rate": rate(with_leader),
+            "project_fill_rate": rate(with_project),
+            "assigned_programmers": assigned,
+            "avg_programmers": rate(assigned),
+        },
+        "unassigned_leaders": unassigned,
+        "payroll_total": total_payroll,
+    }
+
+def dashboard_statistics(db: Session) -> dict:
+    staff = staff_statistics(db)
+    return {
+        "projects": project_statistics(db),
+        "workers": staff["workers"],
+        "teams": staff["teams"],
+        "unassigned_leaders": staff["unassigned_leaders"],
+        "payroll_total": staff["payroll_total"],
+    }
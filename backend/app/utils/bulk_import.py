@@ -0,0 +1,248 @@
+"""
+Importación masiva de proyectos, trabajadores y equipos desde CSV o NDJSON.
+
+Las filas se leen del flujo de entrada sin cargar el fichero completo, se
+validan una a una y se insertan en lotes de tamaño acotado con una única
+transacción por lote. Una fila inválida se anota en el informe y no detiene
+la importación.
+
+Uso desde la línea de comandos:
+
+    python -m app.utils.bulk_import programmer programadores.csv
+"""
+import argparse
+import csv
+import io
+import json
+from itertools import islice
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from app.core.language_cache import language_cache
+from app.models.project import Project
+from app.models.team import Team
+from app.models.worker import Leader, Programmer, ProgrammerLanguage, Worker
+from app.schemas.project import ProjectCreate
+from app.schemas.team import TeamImportRow
+from app.schemas.worker import LeaderCreate, ProgrammerCreate
+
+DEFAULT_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+LANGUAGE_SEPARATOR = ";"
+
+# entidad -> (esquema de validación, modelo)
+ENTITIES: Dict[str, Tuple[type, type]] = {
+    "project": (ProjectCreate, Project),
+    "leader": (LeaderCreate, Leader),
+    "programmer": (ProgrammerCreate, Programmer),
+    "team": (TeamImportRow, Team),
+}
+
+class ImportReport:
+    def __init__(self, entity: str):
+        self.entity = entity
+        self.rows = 0
+        self.inserted = 0
+        self.error_count = 0
+        self.errors: List[dict] = []
+
+    def add_error(self, line: int, message: str):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": line, "error": message})
+
+    def as_dict(self) -> dict:
+        return {
+            "entity": self.entity,
+            "rows": self.rows,
+            "inserted": self.inserted,
+            "error_count": self.error_count,
+            "errors": self.errors,
+        }
+
+# ─── Lectura ───
+def read_rows(stream: BinaryIO, filename: str = "") -> Iterator[Union[dict, str]]:
+    """
+    Itera las filas de un CSV o NDJSON (según la extensión) sin leerlo entero.
+    Las líneas NDJSON se decodifican al validarlas para que una línea mal
+    formada cuente como error de esa fila.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if filename.lower().endswith((".ndjson", ".jsonl")):
+        for line in text:
+            if line.strip():
+                yield line
+    else:
+        yield from csv.DictReader(text)
+
+def _clean(raw: dict) -> dict:
+    """Las celdas vacías de un CSV equivalen a valores ausentes."""
+    return {k: v for k, v in raw.items() if k is not None and v != ""}
+
+def validate_row(entity: str, raw: Union[dict, str]) -> dict:
+    schema, _ = ENTITIES[entity]
+    if isinstance(raw, str):
+        raw = json.loads(raw)
+        if not isinstance(raw, dict):
+            raise ValueError("Se esperaba un objeto JSON")
+    data = _clean(raw)
+    team_id = data.pop("team_id", None)
+    if entity == "programmer" and isinstance(data.get("languages"), str):
+        data["languages"] = [
+            name.strip() for name in data["languages"].split(LANGUAGE_SEPARATOR) if name.strip()
+        ]
+    elif entity == "programmer" and "languages" not in data:
+        data["languages"] = []
+    mapping = schema(**data).dict()
+    if entity == "programmer":
+        mapping["type"] = "programmer"
+        mapping["team_id"] = int(team_id) if team_id is not None else None
+    elif entity == "leader":
+        mapping["type"] = "leader"
+    return mapping
+
+def _error_message(exc: Exception) -> str:
+    if isinstance(exc, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in exc.errors()
+        )
+    if isinstance(exc, SQLAlchemyError):
+        return str(getattr(exc, "orig", exc))
+    return str(exc)
+
+# ─── Lenguajes ───
+class LanguageMap:
+    """Nombre -> id de los lenguajes de una importación, resueltos con app.core.language_cache."""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.ids: Dict[str, int] = {}
+
+    def resolve(self, names: Iterable[str], commit: bool = True) -> Dict[str, int]:
+        """
+        Garantiza que existen todos los nombres. Con `commit=False` los nuevos
+        lenguajes quedan en la transacción en curso y el mapa solo es válido
+        mientras no se haga rollback.
+        """
+        missing = {name for name in names if name not in self.ids}
+        if missing:
+            self.ids.update(language_cache.resolve(self.db, missing))
+            if commit:
+                self.db.commit()
+        return self.ids
+
+# ─── Escritura ───
+def insert_workers(db: Session, model, mappings: List[dict]) -> List[int]:
+    """
+    Inserta trabajadores (herencia por tablas unidas) con dos executemany:
+    primero `workers`, recuperando los ids en el orden de los parámetros, y
+    después la tabla del subtipo.
+    """
+    base, sub = Worker.__table__, model.__table__
+    base_rows = [{c: m.get(c) for c in base.c.keys() if c != "id"} for m in mappings]
+    ids = db.execute(
+        insert(base).returning(base.c.id, sort_by_parameter_order=True), base_rows
+    ).scalars().all()
+    sub_rows = [
+        {**{c: m.get(c) for c in sub.c.keys()}, "id": worker_id}
+        for m, worker_id in zip(mappings, ids)
+    ]
+    db.execute(insert(sub), sub_rows)
+    return ids
+
+def insert_programmers(db: Session, mappings: List[dict], languages: "LanguageMap") -> List[int]:
+    """Inserta programadores y sus lenguajes (ya resueltos en `languages`)."""
+    ids = insert_workers(db, Programmer, mappings)
+    language_ids = languages.ids
+    links = [
+        {"programmer_id": worker_id, "language_id": language_ids[name]}
+        for worker_id, m in zip(ids, mappings)
+        for name in dict.fromkeys(m["languages"])
+    ]
+    if links:
+        db.execute(insert(ProgrammerLanguage.__table__), links)
+    return ids
+
+def _write(db: Session, entity: str, mappings: List[dict], languages: "LanguageMap"):
+    _, model = ENTITIES[entity]
+    if entity in ("project", "team"):
+        db.execute(insert(model.__table__), mappings)
+    elif entity == "leader":
+        insert_workers(db, Leader, mappings)
+    else:
+        insert_programmers(db, mappings, languages)
+
+def _insert_batch(db: Session, entity: str, batch: List[Tuple[int, dict]], languages, report):
+    if entity == "programmer":
+        languages.resolve(name for _, m in batch for name in m["languages"])
+
+    try:
+        _write(db, entity, [m for _, m in batch], languages)
+        db.commit()
+        report.inserted += len(batch)
+        return
+    except SQLAlchemyError:
+        db.rollback()
+
+    # El lote tiene alguna fila que viola restricciones: se reintenta fila a
+    # fila para aislarla sin perder el resto.
+    for line, mapping in batch:
+        try:
+            _write(db, entity, [mapping], languages)
+            db.commit()
+            report.inserted += 1
+        except SQLAlchemyError as exc:
+            db.rollback()
+            report.add_error(line, _error_message(exc))
+
+def import_rows(
+    db: Session,
+    entity: str,
+    rows: Iterable[Union[dict, str]],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    on_batch: Optional[Callable[[int], None]] = None,
+) -> dict:
+    """
+    Valida e inserta las filas por lotes. `on_batch`, si se indica, recibe el
+    número de filas procesadas tras cada lote (para informar del progreso).
+    """
+    if entity not in ENTITIES:
+        raise ValueError(f"Entidad no válida: {entity}")
+
+    report = ImportReport(entity)
+    languages = LanguageMap(db) if entity == "programmer" else None
+    numbered = enumerate(rows, start=1)
+    while True:
+        chunk = list(islice(numbered, batch_size))
+        if not chunk:
+            break
+        report.rows += len(chunk)
+        batch = []
+        for line, raw in chunk:
+            try:
+                batch.append((line, validate_row(entity, raw)))
+            except (ValidationError, ValueError, TypeError) as exc:
+                report.add_error(line, _error_message(exc))
+        if batch:
+            _insert_batch(db, entity, batch, languages, report)
+        if on_batch is not None:
+            on_batch(report.rows)
+    return report.as_dict()
+
+def main():
+    from app.core.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Importación masiva desde CSV o NDJSON")
+    parser.add_argument("entity", choices=sorted(ENTITIES))
+    parser.add_argument("path")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    with open(args.path, "rb") as f, SessionLocal() as db:
+        report = import_rows(db, args.entity, read_rows(f, args.path), args.batch_size)
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+if __name__ == "__main__":
+    main()
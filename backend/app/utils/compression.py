@@ -0,0 +1,301 @@
+# app/utils/compression.py
+"""
+Compresión de respuestas según Accept-Encoding: brotli o zstd si están
+instalados (paquetes `brotli` y `zstandard`, opcionales) y gzip siempre.
+
+Solo se comprimen los tipos de texto (JSON, NDJSON, CSV...) de al menos
+COMPRESSION_MIN_SIZE bytes; las respuestas en streaming se comprimen por
+trozos. Las respuestas con ETag (ver app.utils.http_cache) identifican una
+versión concreta de los datos, así que sus bytes comprimidos se guardan en
+una LRU y las peticiones repetidas no vuelven a comprimir.
+"""
+import gzip
+import os
+import zlib
+from collections import OrderedDict
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+from anyio import to_thread
+
+try:
+    import brotli
+except ImportError:  # dependencia opcional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # dependencia opcional
+    zstandard = None
+
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", 1024))
+GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", 6))
+BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", 4))
+ZSTD_LEVEL = int(os.getenv("COMPRESSION_ZSTD_LEVEL", 3))
+# Memoria para las respuestas comprimidas con ETag (0 la desactiva)
+COMPRESSION_CACHE_BYTES = int(os.getenv("COMPRESSION_CACHE_BYTES", 32 * 1024 * 1024))
+# A partir de este tamaño se comprime en el threadpool para no bloquear el bucle
+THREAD_THRESHOLD = 256 * 1024
+
+COMPRESSIBLE_TYPES = {
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+}
+
+class Codec(NamedTuple):
+    name: str
+    compress: Callable[[bytes], bytes]
+    # Objeto con compress(bytes), sync() y flush() para las respuestas en streaming
+    stream: Callable[[], object]
+
+# Compresores por trozos. sync() vacía lo pendiente sin cerrar el flujo, para
+# que el cliente pueda descomprimir cada trozo en cuanto llega; flush() lo cierra.
+
+class _GzipStream:
+    def __init__(self):
+        self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)  # 31: cabecera gzip
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def sync(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+class _BrotliStream:
+    def __init__(self):
+        self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def sync(self) -> bytes:
+        return self._compressor.flush()
+
+    def flush(self) -> bytes:
+        return self._compressor.finish()
+
+class _ZstdStream:
+    def __init__(self):
+        self._compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def sync(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+def _codecs() -> Dict[str, Codec]:
+    # En orden de preferencia del servidor
+    codecs = {}
+    if brotli is not None:
+        codecs["br"] = Codec("br", lambda data: brotli.compress(data, quality=BROTLI_QUALITY), _BrotliStream)
+    if zstandard is not None:
+        codecs["zstd"] = Codec(
+            "zstd", lambda data: zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data), _ZstdStream
+        )
+    codecs["gzip"] = Codec("gzip", lambda data: gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0), _GzipStream)
+    return codecs
+
+CODECS = _codecs()
+
+def _qualities(accept_encoding: str) -> Dict[str, float]:
+    """Codificación -> q de una cabecera Accept-Encoding (q inválido: se ignora)."""
+    qualities = {}
+    for part in accept_encoding.lower().split(","):
+        name, *params = part.split(";")
+        name = name.strip()
+        if not name:
+            continue
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = None
+        if quality is not None:
+            qualities[name] = quality
+    return qualities
+
+def negotiate(accept_encoding: str) -> Optional[Codec]:
+    """
+    Codificación preferida por el servidor entre las que acepta el cliente.
+    Una con q=0 queda rechazada aunque `*` acepte el resto; sin `*`, las no
+    mencionadas tampoco se aceptan.
+    """
+    qualities = _qualities(accept_encoding)
+    wildcard = qualities.get("*", 0.0)
+    for name, codec in CODECS.items():
+        if qualities.get(name, wildcard) > 0:
+            return codec
+    # `identity;q=0`: el cliente no admite la respuesta sin comprimir, así que
+    # se usa cualquier codificación que no haya rechazado expresamente
+    if qualities.get("identity", 1.0) <= 0:
+        fallback = qualities.get("*", 1.0)
+        for name, codec in CODECS.items():
+            if qualities.get(name, fallback) > 0:
+                return codec
+    return None
+
+def is_compressible(content_type: str) -> bool:
+    media_type = content_type.split(";")[0].strip().lower()
+    return media_type.startswith("text/") or media_type in COMPRESSIBLE_TYPES or media_type.endswith("+json")
+
+class CompressedCache:
+    """LRU de respuestas comprimidas por (ETag, codificación), limitada en bytes."""
+
+    def __init__(self, max_bytes: int = COMPRESSION_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: "OrderedDict[Tuple, bytes]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple) -> Optional[bytes]:
+        data = self._entries.get(key)
+        if data is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return data
+
+    def put(self, key: Tuple, data: bytes):
+        if len(data) > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.size -= len(old)
+        self._entries[key] = data
+        self.size += len(data)
+        while self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= len(evicted)
+
+    def clear(self):
+        self._entries.clear()
+        self.size = 0
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "bytes": self.size, "hits": self.hits, "misses": self.misses}
+
+# Solo se usa desde el bucle de eventos, no necesita cerrojo
+compressed_cache = CompressedCache()
+
+def _header(headers, name: bytes) -> Optional[bytes]:
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+def _chunk(compressor, body: bytes, more_body: bool) -> bytes:
+    """
+    Trozo comprimido de una respuesta en streaming. Cada trozo se envía
+    completo (sync) en vez de esperar a llenar el bloque del compresor: los
+    trozos de NDJSON o de una exportación llegan al cliente sin retraso.
+    """
+    data = compressor.compress(body)
+    if not more_body:
+        return data + compressor.flush()
+    return data + compressor.sync() if body else data
+
+class CompressionMiddleware:
+    """Comprime las respuestas de texto con la mejor codificación aceptada."""
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept = dict(scope["headers"]).get(b"accept-encoding", b"").decode("latin-1")
+        codec = negotiate(accept) if accept else None
+        if codec is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        compressor = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start_message, compressor, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                headers = message.get("headers", [])
+                content_type = (_header(headers, b"content-type") or b"").decode("latin-1")
+                passthrough = (
+                    _header(headers, b"content-encoding") is not None
+                    or not is_compressible(content_type)
+                )
+                if passthrough:
+                    await send(message)
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if compressor is not None:
+                # Siguientes trozos de una respuesta en streaming
+                data = _chunk(compressor, body, more_body)
+                await send({"type": "http.response.body", "body": data, "more_body": more_body})
+                return
+
+            headers = list(start_message.get("headers", []))
+            if not more_body:
+                if len(body) < self.minimum_size:
+                    await send(start_message)
+                    await send(message)
+                    return
+                data = await self._compress(codec, body, _header(headers, b"etag"))
+                await send({**start_message, "headers": self._headers(headers, codec, len(data))})
+                await send({"type": "http.response.body", "body": data})
+                return
+
+            # Streaming: tamaño total desconocido, se comprime siempre por trozos
+            compressor = codec.stream()
+            await send({**start_message, "headers": self._headers(headers, codec, None)})
+            await send({"type": "http.response.body", "body": _chunk(compressor, body, True), "more_body": True})
+
+        await self.app(scope, receive, send_compressed)
+
+    @staticmethod
+    def _headers(headers, codec: Codec, length: Optional[int]):
+        vary = [v.decode("latin-1") for k, v in headers if k.lower() == b"vary"]
+        headers = [(k, v) for k, v in headers if k.lower() not in (b"content-length", b"vary")]
+        headers.append((b"content-encoding", codec.name.encode()))
+        if length is not None:
+            headers.append((b"content-length", str(length).encode()))
+        vary_values = [v.strip() for value in vary for v in value.split(",") if v.strip()]
+        if "accept-encoding" not in (v.lower() for v in vary_values):
+            vary_values.append("Accept-Encoding")
+        headers.append((b"vary", ", ".join(vary_values).encode("latin-1")))
+        return headers
+
+    @staticmethod
+    async def _compress(codec: Codec, body: bytes, etag: Optional[bytes]) -> bytes:
+        # El tamaño sin comprimir acompaña al ETag como comprobación adicional
+        key = (etag, codec.name, len(body)) if etag and compressed_cache.max_bytes > 0 else None
+        if key is not None:
+            cached = compressed_cache.get(key)
+            if cached is not None:
+                return cached
+        if len(body) >= THREAD_THRESHOLD:
+            data = await to_thread.run_sync(codec.compress, body)
+        else:
+            data = codec.compress(body)
+        if key is not None:
+            compressed_cache.put(key, data)
+        return data
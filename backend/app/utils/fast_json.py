@@ -0,0 +1,38 @@
+# app/utils/fast_json.py
+"""
+Serialización rápida de listados grandes.
+
+El camino habitual crea un objeto ORM por fila y lo valida con su esquema
+Pydantic (`orm_mode`) antes de convertirlo a JSON. Para los listados se
+leen directamente las columnas que pide el esquema, se construyen dicts y
+se codifican de una vez con orjson (o con `json` si no está instalado).
+El endpoint conserva su `response_model`, así que el esquema OpenAPI no
+cambia.
+"""
+import json
+from typing import List, Sequence
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # dependencia opcional
+    orjson = None
+
+def dumps(content) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse codificada con orjson cuando está disponible."""
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+def column_dicts(query, model, fields: Sequence[str]) -> List[dict]:
+    """
+    Ejecuta `query` leyendo solo las columnas `fields` de `model` (con sus
+    filtros, orden y límite) y devuelve una lista de dicts, sin objetos ORM.
+    """
+    rows = query.with_entities(*(getattr(model, field) for field in fields))
+    return [dict(zip(fields, row)) for row in rows]
@@ -1,98 +1,232 @@
 import json
+import zipfile
+import zlib
+from typing import Iterable, Iterator, List, Optional
 from app.models import Project, Team, Programmer, Leader
-from sqlalchemy.orm import Session
+from app.schemas.project import ProjectCreate
+from app.schemas.worker import LeaderCreate
+from app.utils.bulk_import import LanguageMap, insert_programmers, validate_row
+from app.utils.json_stream import ITEM, iter_values
+from sqlalchemy.orm import Session, joinedload
 
-def export_project(db: Session, project_id: int, filepath: str) -> bool:
-    project = db.query(Project).filter(Project.id == project_id).first()
-    if not project:
-        return False
+# Todo lo que se exporta de un proyecto, cargado junto: equipo y líder en la
+# misma consulta; programadores y lenguajes en una consulta por lote.
+EXPORT_LOAD = (
+    joinedload(Project.team).joinedload(Team.leader),
+    joinedload(Project.team).selectinload(Team.programmers).selectinload(Programmer.languages),
+)
+EXPORT_BATCH_SIZE = 100
+EXPORT_CHUNK_ROWS = 500
 
-    team = project.team
-    if not team:
-        return False
+def get_project_for_export(db: Session, project_id: int) -> Optional[Project]:
+    return db.query(Project).options(*EXPORT_LOAD).filter(Project.id == project_id).first()
+
+def query_projects_for_export(
+    db: Session,
+    project_ids: Optional[List[int]] = None,
+    type: Optional[str] = None,
+    framework: Optional[str] = None,
+):
+    """Proyectos a exportar, leídos por lotes con todo su equipo."""
+    query = db.query(Project).options(*EXPORT_LOAD)
+    if project_ids:
+        query = query.filter(Project.id.in_(project_ids))
+    if type is not None:
+        query = query.filter(Project.type == type)
+    if framework is not None:
+        query = query.filter(Project.framework == framework)
+    return query.order_by(Project.id).yield_per(EXPORT_BATCH_SIZE)
+
+def _dumps(value) -> bytes:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+def _project_data(project: Project) -> dict:
+    return {
+        "id": project.id,
+        "name": project.name,
+        "description": project.description,
+        "estimated_time": project.estimated_time,
+        "price": project.price,
+        "type": project.type,
+        "is_flash": project.is_flash,
+        "is_director": project.is_director,
+        "db_type": project.db_type,
+        "language": project.language,
+        "framework": project.framework
+    }
 
-    data = {
-        "project": {
-            "id": project.id,
-            "name": project.name,
-            "description": project.description,
-            "estimated_time": project.estimated_time,
-            "price": project.price,
-            "type": project.type,
-            "is_flash": project.is_flash,
-            "is_director": project.is_director,
-            "db_type": project.db_type,
-            "language": project.language,
-            "framework": project.framework
-        },
-        "team": {
-            "leader": {
-                "id": team.leader.id,
-                "name": team.leader.name,
-                "age": team.leader.age,
-                "gender": team.leader.gender,
-                "base_salary": team.leader.base_salary,
-                "experience_years": team.leader.experience_years,
-                "projects_led": team.leader.projects_led
-            },
-            "programmers": [
-                {
-                    "id": p.id,
-                    "name": p.name,
-                    "age": p.age,
-                    "gender": p.gender,
-                    "base_salary": p.base_salary,
-                    "languages": p.languages,
-                    "category": p.category
-                } for p in team.programmers
-            ]
-        }
+def _leader_data(leader: Optional[Leader]) -> Optional[dict]:
+    if leader is None:
+        return None
+    return {
+        "id": leader.id,
+        "name": leader.name,
+        "age": leader.age,
+        "gender": leader.gender,
+        "base_salary": leader.base_salary,
+        "experience_years": leader.experience_years,
+        "directed_projects": leader.directed_projects
     }
 
-    with open(filepath, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4)
-    
+def _programmer_data(p: Programmer) -> dict:
+    return {
+        "id": p.id,
+        "name": p.name,
+        "age": p.age,
+        "gender": p.gender,
+        "base_salary": p.base_salary,
+        "languages": [lang.name for lang in p.languages],
+        "category": p.category
+    }
+
+def iter_project_json(project: Project) -> Iterator[bytes]:
+    """
+    JSON compacto de un proyecto con su equipo, en trozos: la cabecera y
+    después cada programador, para no construir el documento completo.
+    """
+    yield b'{"project":' + _dumps(_project_data(project))
+    team = project.team
+    if team is None:
+        yield b',"team":null}'
+        return
+    yield b',"team":{"leader":' + _dumps(_leader_data(team.leader)) + b',"programmers":['
+    programmers = team.programmers
+    # Se agrupan varios programadores por trozo: cada trozo enviado tiene un
+    # coste fijo en el servidor.
+    for start in range(0, len(programmers), EXPORT_CHUNK_ROWS):
+        batch = programmers[start:start + EXPORT_CHUNK_ROWS]
+        data = b",".join(_dumps(_programmer_data(p)) for p in batch)
+        yield (b"," if start else b"") + data
+    yield b"]}}"
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Comprime al vuelo en formato gzip."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+class _ZipSink:
+    """Destino no posicionable para zipfile: acumula lo escrito hasta vaciarlo."""
+
+    def __init__(self):
+        self._parts = []
+
+    def write(self, data: bytes) -> int:
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+def iter_projects_zip(projects: Iterable[Project]) -> Iterator[bytes]:
+    """
+    Archivo ZIP con un `project_<id>.json` por proyecto, generado en memoria
+    a medida que se envía; nunca se escribe en el disco del servidor.
+    """
+    sink = _ZipSink()
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for project in projects:
+            with archive.open(f"project_{project.id}.json", mode="w", force_zip64=True) as member:
+                for chunk in iter_project_json(project):
+                    member.write(chunk)
+                    data = sink.drain()
+                    if data:
+                        yield data
+            yield sink.drain()
+    yield sink.drain()
+
+def export_project(db: Session, project_id: int, filepath: str) -> bool:
+    project = get_project_for_export(db, project_id)
+    if not project or not project.team:
+        return False
+
+    with open(filepath, "wb") as f:
+        for chunk in iter_project_json(project):
+            f.write(chunk)
     return True
 
+# Rutas del fichero de exportación que se procesan a medida que llegan
+_IMPORT_PATHS = {("project",), ("team", "leader"), ("team", "programmers", ITEM)}
+PROGRAMMER_BATCH_SIZE = 500
+READ_CHUNK_SIZE = 64 * 1024
+
 def import_project(db: Session, filepath: str) -> Project:
-    with open(filepath, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    p_data = data["project"]
-    t_data = data["team"]
-
-    # Crear proyecto
-    project = Project(**p_data)
-    db.add(project)
-    db.commit()
-    db.refresh(project)
-
-    # Crear líder
-    leader_data = t_data["leader"]
-    leader = Leader(**leader_data)
-    db.add(leader)
-    db.commit()
-    db.refresh(leader)
-
-    # Crear programadores
-    programmers = []
-    for p in t_data["programmers"]:
-        prog = Programmer(**p)
-        db.add(prog)
-        db.commit()
-        db.refresh(prog)
-        programmers.append(prog)
+    with open(filepath, "rb") as f:
+        return import_project_stream(db, iter(lambda: f.read(READ_CHUNK_SIZE), b""))
+
+def import_project_stream(db: Session, chunks: Iterable) -> Project:
+    """
+    Importa un proyecto exportado leyendo el JSON por trozos.
+
+    El proyecto, el líder y cada programador se insertan en cuanto se
+    completan en el flujo (los programadores en lotes), de modo que la
+    memoria usada no depende del tamaño del equipo. Todo ocurre en una
+    única transacción: si algo falla no queda nada a medias.
+    """
+    languages = LanguageMap(db)
+    project = None
+    team = None
+    pending = []
 
-    # Crear equipo
-    from app.models import Team
-    team = Team(project_id=project.id, leader_id=leader.id)
-    db.add(team)
-    db.commit()
-    db.refresh(team)
+    def get_team() -> Team:
+        nonlocal team
+        if team is None:
+            team = Team()
+            db.add(team)
+            db.flush()
+        return team
 
-    for prog in programmers:
-        prog.team_id = team.id
-        db.add(prog)
+    def flush_programmers():
+        if not pending:
+            return
+        languages.resolve((name for m in pending for name in m["languages"]), commit=False)
+        team_id = get_team().id
+        for mapping in pending:
+            mapping["team_id"] = team_id
+        insert_programmers(db, pending, languages)
+        pending.clear()
 
-    db.commit()
+    try:
+        for path, value in iter_values(chunks, _IMPORT_PATHS):
+            if not isinstance(value, dict):
+                raise ValueError(f"Se esperaba un objeto en {'.'.join(path)}")
+
+            if path == ("project",):
+                project = Project(**ProjectCreate(**value).dict())
+                db.add(project)
+                db.flush()
+                get_team().project_id = project.id
+            elif path == ("team", "leader"):
+                data = dict(value)
+                # Exportaciones antiguas usaban "projects_led"
+                data.setdefault("directed_projects", data.get("projects_led"))
+                leader = Leader(**LeaderCreate(**data).dict())
+                db.add(leader)
+                db.flush()
+                get_team().leader_id = leader.id
+            else:
+                data = dict(value)
+                data["languages"] = [
+                    lang["name"] if isinstance(lang, dict) else lang
+                    for lang in data.get("languages") or []
+                ]
+                pending.append(validate_row("programmer", data))
+                if len(pending) >= PROGRAMMER_BATCH_SIZE:
+                    flush_programmers()
+
+        flush_programmers()
+        if project is None:
+            raise ValueError("El fichero no contiene ningún proyecto")
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
     return project
@@ -0,0 +1,95 @@
+# app/utils/http_cache.py
+"""
+GET condicionales (ETag / If-None-Match) a partir de las versiones de tabla
+de app.core.cache.
+
+El ETag de una colección no se calcula sobre el cuerpo: combina la época del
+almacén de versiones con la versión de cada tabla que la respuesta lee, así
+que obtenerlo no consulta las tablas. El almacén es el compartido por todos
+los procesos que escriben, de modo que un commit hecho en otro worker o desde
+la línea de órdenes también cambia el ETag. Si el cliente ya tiene esa
+versión se contesta 304 antes de consultar ni serializar nada:
+
+    @router.get("/", dependencies=[Depends(conditional_get("projects"))])
+
+`ConditionalGetMiddleware` añade ETag y Cache-Control a las respuestas 200,
+sea cual sea su tipo (listas, JSONResponse o NDJSON en streaming).
+"""
+import hashlib
+import os
+from typing import Optional
+from fastapi import HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from app.core.cache import table_versions
+
+# Segundos que el cliente puede reutilizar la respuesta sin revalidar
+HTTP_CACHE_MAX_AGE = int(os.getenv("HTTP_CACHE_MAX_AGE", 0))
+
+_STATE_KEY = "etag"
+
+def cache_control() -> str:
+    if HTTP_CACHE_MAX_AGE > 0:
+        return f"private, max-age={HTTP_CACHE_MAX_AGE}"
+    return "private, no-cache"
+
+def compute_etag(request: Request, tables) -> str:
+    """
+    ETag débil de la respuesta: época, versiones de `tables` y la cabecera
+    Accept (JSON y NDJSON son representaciones distintas de la misma URL).
+    """
+    versions = table_versions.get(tables)
+    key = f"{request.url.path}?{request.url.query}|{request.headers.get('accept', '')}|{tables}|{versions}"
+    digest = hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+    return f'W/"{table_versions.epoch}-{digest}"'
+
+def _matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # La comparación débil ignora el prefijo W/
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+def conditional_get(*tables: str):
+    """
+    Dependencia que contesta 304 si el If-None-Match del cliente coincide con
+    el ETag actual de `tables`; si no, deja el ETag para el middleware.
+    """
+    # Asíncrona para no ocupar un hilo del threadpool en cada petición; con
+    # las versiones en un servidor de base de datos la lectura sí va a un hilo
+    async def dependency(request: Request):
+        if table_versions.remote:
+            etag = await run_in_threadpool(compute_etag, request, tables)
+        else:
+            etag = compute_etag(request, tables)
+        if _matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(
+                status_code=304, headers={"ETag": etag, "Cache-Control": cache_control()}
+            )
+        request.state.etag = etag
+    return dependency
+
+class ConditionalGetMiddleware:
+    """Añade ETag y Cache-Control a las respuestas 200 de `conditional_get`."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_etag(message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                etag = scope.get("state", {}).get(_STATE_KEY)
+                if etag:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"etag", etag.encode("latin-1")))
+                    headers.append((b"cache-control", cache_control().encode("latin-1")))
+                    headers.append((b"vary", b"Accept"))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
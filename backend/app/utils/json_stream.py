@@ -0,0 +1,130 @@
+"""
+Lector incremental de JSON.
+
+Recorre un documento JSON que llega por trozos y entrega los valores que se
+encuentran en unas rutas concretas en cuanto se completan, sin construir el
+documento entero en memoria. Solo se materializa cada valor pedido (p. ej.
+un programador de un equipo), nunca el array que los contiene.
+
+    for path, value in iter_values(chunks, {("team", "programmers", ITEM)}):
+        ...
+"""
+import codecs
+import json
+from typing import Iterable, Iterator, Set, Tuple
+
+# Segmento de ruta que representa cualquier elemento de un array
+ITEM = "item"
+_WHITESPACE = " \t\n\r"
+_NUMBER_CHARS = set("0123456789.eE+-")
+_decoder = json.JSONDecoder()
+
+class _Reader:
+    def __init__(self, chunks: Iterable):
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self.eof = True
+            text = self._utf8.decode(b"", final=True)
+        elif isinstance(chunk, bytes):
+            text = self._utf8.decode(chunk)
+        else:
+            text = chunk
+        # Se descarta lo ya consumido para que el buffer no crezca
+        self.buf = self.buf[self.pos:] + text
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Siguiente carácter significativo ("" al final del documento)."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError(f"JSON no válido: se esperaba '{char}' en la posición {self.pos}")
+        self.pos += 1
+
+    def value(self):
+        """Decodifica el siguiente valor completo, pidiendo más datos si hace falta."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # Un número al final del buffer puede continuar en el siguiente trozo
+            if (
+                isinstance(value, (int, float))
+                and not isinstance(value, bool)
+                and not self.eof
+                and all(c in _NUMBER_CHARS for c in self.buf[end:])
+                and self._fill()
+            ):
+                continue
+            self.pos = end
+            return value
+
+def iter_values(chunks: Iterable, paths: Set[Tuple[str, ...]]) -> Iterator[Tuple[Tuple[str, ...], object]]:
+    """
+    Entrega `(ruta, valor)` para cada valor del documento cuya ruta esté en
+    `paths`. Las claves de objeto forman la ruta y los elementos de un array
+    usan el segmento `ITEM`.
+    """
+    reader = _Reader(chunks)
+    prefixes = {path[:i] for path in paths for i in range(len(path))}
+    yield from _walk(reader, (), paths, prefixes)
+    if reader.peek() != "":
+        raise ValueError("JSON no válido: datos después del documento")
+
+def _walk(reader: _Reader, path, paths, prefixes):
+    char = reader.peek()
+    if char == "":
+        raise ValueError("JSON no válido: el documento está incompleto")
+    if path in paths:
+        yield path, reader.value()
+    elif path not in prefixes or char not in "{[":
+        reader.value()
+    elif char == "{":
+        reader.expect("{")
+        if reader.peek() == "}":
+            reader.pos += 1
+            return
+        while True:
+            key = reader.value()
+            if not isinstance(key, str):
+                raise ValueError("JSON no válido: clave de objeto no es una cadena")
+            reader.expect(":")
+            yield from _walk(reader, path + (key,), paths, prefixes)
+            if reader.peek() == ",":
+                reader.pos += 1
+                continue
+            reader.expect("}")
+            return
+    else:
+        reader.expect("[")
+        if reader.peek() == "]":
+            reader.pos += 1
+            return
+        while True:
+            yield from _walk(reader, path + (ITEM,), paths, prefixes)
+            if reader.peek() == ",":
+                reader.pos += 1
+                continue
+            reader.expect("]")
+            return
@@ -0,0 +1,123 @@
+import base64
+import json
+from typing import Iterable, List, Optional, Sequence, Set, Tuple, Type
+from fastapi import HTTPException, Query, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from app.utils.fast_json import FastJSONResponse
+from app.utils.schema_utils import orm_to_dict
+
+# Cabecera con el cursor de la página siguiente. Las respuestas siguen siendo
+# listas para no romper a los clientes existentes.
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+MAX_PAGE_SIZE = 1000
+
+class PageParams:
+    """Parámetros comunes de paginación por cursor y selección de campos."""
+
+    def __init__(
+        self,
+        cursor: Optional[str] = Query(None, description="Cursor devuelto en X-Next-Cursor"),
+        limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+        fields: Optional[str] = Query(None, description="Campos separados por comas"),
+    ):
+        self.after_id = decode_cursor(cursor) if cursor else None
+        self.limit = limit
+        self.fields = fields
+
+def encode_cursor(last_id: int) -> str:
+    """Cursor opaco con el último id entregado."""
+    raw = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        last_id = json.loads(base64.urlsafe_b64decode(padded))["id"]
+        if not isinstance(last_id, int):
+            raise ValueError
+        return last_id
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Cursor no válido")
+
+def keyset(query, id_column, after_id: Optional[int], limit: Optional[int]):
+    """
+    Aplica paginación por clave (id > último id) a una consulta.
+
+    Al filtrar por id en lugar de usar OFFSET, las filas insertadas durante
+    el recorrido no desplazan las páginas ya entregadas. Se pide una fila de
+    más para saber si existe una página siguiente.
+    """
+    if after_id is not None:
+        query = query.filter(id_column > after_id)
+    query = query.order_by(id_column)
+    if limit is not None:
+        query = query.limit(limit + 1)
+    return query
+
+def split_page(rows: List, limit: Optional[int]) -> Tuple[List, Optional[str]]:
+    """Separa la fila extra pedida por `keyset` y calcula el cursor siguiente."""
+    if limit is None or len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(last["id"] if isinstance(last, dict) else last.id)
+
+def parse_fields(fields: Optional[str], schema: Type[BaseModel]) -> Optional[Set[str]]:
+    if not fields:
+        return None
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = requested - set(schema.__fields__)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Campos no válidos: {', '.join(sorted(unknown))}"
+        )
+    return requested
+
+def selected_fields(fields: Sequence[str], include: Optional[Set[str]]) -> Tuple[str, ...]:
+    """
+    Columnas de `fields` que hay que leer para `include` (todas si es None).
+    `id` se lee siempre: de él sale el cursor de la página siguiente.
+    """
+    if include is None:
+        return tuple(fields)
+    return tuple(field for field in fields if field in include or field == "id")
+
+def page_response(
+    response: Response,
+    rows: Iterable,
+    next_cursor: Optional[str],
+    schema: Type[BaseModel],
+    fields: Optional[str],
+    serialize: bool = False,
+):
+    """
+    Devuelve la página tal cual (validada por el response_model del endpoint)
+    o, si se pidieron campos concretos, solo esas columnas.
+
+    Con `serialize=True` la página se convierte a JSON aquí mismo; los
+    endpoints asíncronos lo usan para leer los objetos ORM dentro de
+    `run_sync`, donde todavía se permite una carga diferida.
+    """
+    include = parse_fields(fields, schema)
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else {}
+    if include is None and not serialize:
+        response.headers.update(headers)
+        return rows
+    data = [orm_to_dict(schema, row, include) for row in rows]
+    return JSONResponse(content=jsonable_encoder(data), headers=headers)
+
+def rows_response(rows: List[dict], next_cursor: Optional[str], schema: Type[BaseModel], fields: Optional[str]):
+    """
+    Como `page_response`, para filas que ya son dicts con los campos de
+    `schema` (ver app.utils.fast_json): se codifican sin validarlas una a una.
+    Con `fields` las filas traen solo esas columnas más `id` (ver
+    `selected_fields`), que se quita si no se pidió.
+    """
+    include = parse_fields(fields, schema)
+    if include is not None:
+        rows = [{key: value for key, value in row.items() if key in include} for row in rows]
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else {}
+    return FastJSONResponse(content=rows, headers=headers)
@@ -0,0 +1,54 @@
+import time
+from contextlib import contextmanager
+from typing import List, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+class QueryCounter:
+    """Sentencias SQL ejecutadas por un motor mientras el contador está activo."""
+
+    def __init__(self):
+        self.statements: List[Tuple[str, float]] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        start = conn.info["query_start"].pop()
+        self.statements.append((statement, time.perf_counter() - start))
+
+@contextmanager
+def count_queries(engine: Engine):
+    """
+    Cuenta las sentencias que se ejecutan dentro del bloque:
+
+        with count_queries(engine) as counter:
+            client.get("/teams/")
+        print(counter.count)
+
+    Con la clase `Engine` en lugar de un motor concreto se cuentan las de
+    todos los motores, incluido el síncrono que hay bajo uno asíncrono.
+    """
+    counter = QueryCounter()
+    event.listen(engine, "before_cursor_execute", counter._before)
+    event.listen(engine, "after_cursor_execute", counter._after)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", counter._before)
+        event.remove(engine, "after_cursor_execute", counter._after)
+
+@contextmanager
+def assert_max_queries(engine: Engine, maximum: int):
+    """Falla si el bloque ejecuta más de `maximum` sentencias SQL."""
+    with count_queries(engine) as counter:
+        yield counter
+    if counter.count > maximum:
+        statements = "\n".join(sql for sql, _ in counter.statements)
+        raise AssertionError(
+            f"Se esperaban como máximo {maximum} consultas y se ejecutaron {counter.count}:\n{statements}"
+        )
@@ -0,0 +1,100 @@
+import re
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import event, inspect
+from sqlalchemy.engine import Engine
+
+# "SCAN projects" o "SCAN teams_1"; con "USING ... INDEX" no es un recorrido
+# de la tabla sino de un índice (p. ej. ORDER BY columna_indexada LIMIT 1)
+_SCAN = re.compile(r"^SCAN (\w+)$")
+_TABLE_REF = re.compile(r"\b(?:FROM|JOIN)\s+(\w+)(?:\s+AS\s+(\w+))?", re.IGNORECASE)
+_LIMIT_END = re.compile(r"LIMIT \?(?: OFFSET \?)?\s*$")
+_LIMITED_SUBQUERY = re.compile(r"LIMIT \?(?: OFFSET \?)?\)\s+AS\s+(\w+)")
+
+class PlanChecker:
+    """Sentencias SELECT ejecutadas por un motor, con sus parámetros."""
+
+    def __init__(self):
+        self.statements: Dict[str, object] = {}
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith("SELECT"):
+            self.statements.setdefault(statement, parameters)
+
+def explain(connection, statement: str, parameters=()) -> List[Tuple[int, int, str]]:
+    """(id, padre, detalle) de cada paso de EXPLAIN QUERY PLAN (solo SQLite)."""
+    rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters or ())
+    return [(row[0], row[1], row[-1]) for row in rows]
+
+def _bounded_scopes(statement: str, plan) -> Set[int]:
+    """
+    Nodos del plan cuyo primer bucle se corta con un LIMIT: la consulta
+    principal si termina en LIMIT y no ordena en un B-tree temporal, y las
+    subconsultas con LIMIT materializadas (las páginas que repiten
+    subqueryload). Recorrer la tabla en ese bucle lee solo una página.
+    """
+    scopes = set()
+    sorts = {parent for _, parent, detail in plan if detail.startswith("USE TEMP B-TREE FOR")}
+    if _LIMIT_END.search(statement) and 0 not in sorts:
+        scopes.add(0)
+    limited = set(_LIMITED_SUBQUERY.findall(statement))
+    for node, _, detail in plan:
+        if detail.startswith(("MATERIALIZE ", "CO-ROUTINE ")) and detail.split()[1] in limited and node not in sorts:
+            scopes.add(node)
+    return scopes
+
+def full_scans(connection, statement: str, parameters=()) -> List[Tuple[str, str]]:
+    """(tabla, paso del plan) de cada recorrido completo de una tabla real."""
+    aliases = {}
+    for table, alias in _TABLE_REF.findall(statement):
+        aliases[table] = table
+        if alias:
+            aliases[alias] = table
+    plan = explain(connection, statement, parameters)
+    bounded = _bounded_scopes(statement, plan)
+    first_loop = {}
+    for node, parent, detail in plan:
+        if detail.startswith(("SCAN ", "SEARCH ")):
+            first_loop.setdefault(parent, node)
+    scans = []
+    for node, parent, detail in plan:
+        match = _SCAN.match(detail)
+        if not match or match.group(1) not in aliases:
+            continue
+        if parent in bounded and first_loop[parent] == node:
+            continue
+        scans.append((aliases[match.group(1)], detail))
+    return scans
+
+@contextmanager
+def check_query_plans(engine: Engine, min_rows: int = 1000, allow: Iterable[str] = ()):
+    """
+    Falla si alguna consulta del bloque recorre entera una tabla con más de
+    `min_rows` filas. `allow` lista las tablas que el bloque lee enteras a
+    propósito (listados completos, agregados de nómina...):
+
+        with check_query_plans(engine, allow={"workers"}):
+            logic.calculate_total_payroll(db)
+    """
+    checker = PlanChecker()
+    event.listen(engine, "before_cursor_execute", checker._before)
+    try:
+        yield checker
+    finally:
+        event.remove(engine, "before_cursor_execute", checker._before)
+
+    allowed = set(allow)
+    sizes: Dict[str, Optional[int]] = {}
+    violations = []
+    with engine.connect() as connection:
+        existing = set(inspect(connection).get_table_names())
+        for statement, parameters in checker.statements.items():
+            for table, detail in full_scans(connection, statement, parameters):
+                if table in allowed or table not in existing:
+                    continue
+                if table not in sizes:
+                    sizes[table] = connection.exec_driver_sql(f"SELECT count(*) FROM {table}").scalar()
+                if sizes[table] > min_rows:
+                    violations.append(f"{detail} ({sizes[table]} filas)\n    {statement}")
+    if violations:
+        raise AssertionError("Recorridos completos de tablas grandes:\n" + "\n".join(violations))
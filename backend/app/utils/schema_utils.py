@@ -1,11 +1,25 @@
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional, Set, Type
 
 class SalaryReport(BaseModel):
     worker_id: int
     name: str
+    type: Optional[str] = None
+    base_salary: float
+    project_bonus: float
+    skill_bonus: float  # lenguajes (programador) o experiencia (líder)
+    bonus: float
     salary: float
 
+    class Config:
+        orm_mode = True
+
 class ProjectCountByType(BaseModel):
     gestion: int
     multimedia: int
+
+def orm_to_dict(schema: Type[BaseModel], obj, include: Optional[Set[str]] = None) -> dict:
+    """Valida un objeto ORM con `schema` y lo devuelve como dict serializable."""
+    if hasattr(schema, "model_validate"):  # Pydantic v2
+        return schema.model_validate(obj, from_attributes=True).model_dump(mode="json", include=include)
+    return schema.from_orm(obj).dict(include=include)
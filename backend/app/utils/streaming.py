@@ -0,0 +1,45 @@
+import json
+from typing import Callable, Iterable, Optional, Set, Type
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+from app.core.database import SessionLocal
+from app.utils.schema_utils import orm_to_dict
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+STREAM_BATCH_SIZE = 1000
+
+def wants_stream(request: Request, stream: bool) -> bool:
+    """El cliente pide streaming con `stream=true` o `Accept: application/x-ndjson`."""
+    return stream or NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+def ndjson_response(
+    build_query: Callable[[Session, int], Iterable],
+    schema: Type[BaseModel],
+    include: Optional[Set[str]] = None,
+) -> StreamingResponse:
+    """
+    Respuesta NDJSON (un objeto JSON por línea) que se serializa mientras se
+    leen las filas.
+
+    `build_query(db, batch_size)` debe devolver una consulta con `yield_per`
+    para que el ORM no cargue la tabla completa. La sesión se abre dentro del
+    generador porque la de la petición puede cerrarse antes de terminar de
+    enviar la respuesta.
+    """
+    def generate():
+        db = SessionLocal()
+        try:
+            lines = []
+            for row in build_query(db, STREAM_BATCH_SIZE):
+                lines.append(json.dumps(orm_to_dict(schema, row, include), separators=(",", ":")))
+                if len(lines) >= STREAM_BATCH_SIZE:
+                    yield "\n".join(lines) + "\n"
+                    lines = []
+            if lines:
+                yield "\n".join(lines) + "\n"
+        finally:
+            db.close()
+
+    return StreamingResponse(generate(), media_type=NDJSON_MEDIA_TYPE)
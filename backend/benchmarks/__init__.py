@@ -0,0 +1,9 @@
+"""
+Benchmarks del backend. Se ejecutan como módulos desde backend/:
+
+    python -m benchmarks.api_suite --workers 10000 --output base.json
+
+`synthetic` genera los datos (deterministas a partir de una semilla) y
+`api_suite` mide todos los routers y guarda los resultados en JSON para
+comparar commits. El resto de módulos mide una optimización concreta.
+"""
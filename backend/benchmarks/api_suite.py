@@ -0,0 +1,255 @@
+"""
+Suite de rendimiento de toda la API, en proceso.
+
+Genera la base sintética de benchmarks.synthetic a la escala pedida (de 1k a
+1M trabajadores, con la misma semilla siempre los mismos datos), lanza las
+peticiones de cada router a través de httpx.ASGITransport y mide
+peticiones/s, latencias p50/p95/p99 y pico de RSS por escenario. Los
+resultados se guardan en JSON para comparar commits; con `--compare` la
+suite falla si algún escenario empeora más de `--tolerance`:
+
+    python -m benchmarks.api_suite --workers 10000 --output base.json
+    python -m benchmarks.api_suite --workers 10000 --compare base.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from typing import List, NamedTuple, Optional
+from benchmarks.async_load import percentile
+
+class Scenario(NamedTuple):
+    router: str
+    name: str
+    method: str
+    path: str
+    data: Optional[dict] = None
+    # Fracción de --requests: los listados completos y el login son caros
+    share: float = 1.0
+
+    @property
+    def key(self) -> str:
+        return f"{self.router}:{self.name}"
+
+def scenarios(info: dict, job_id: str) -> List[Scenario]:
+    """Peticiones representativas de cada router para los datos generados."""
+    programmer_id = info["teams"] + 1  # los primeros ids son de líderes
+    return [
+        Scenario("auth", "login", "POST", "/auth/login", {"username": "bench", "password": "bench"}, 0.1),
+        Scenario("auth", "me", "GET", "/auth/me"),
+        Scenario("workers", "programmers-page", "GET", "/workers/programmers?limit=100"),
+        Scenario("workers", "programmers-all", "GET", "/workers/programmers", share=0.1),
+        Scenario("workers", "leaders-page", "GET", "/workers/leaders?limit=100"),
+        Scenario("projects", "page", "GET", "/projects/?limit=100"),
+        Scenario("projects", "all", "GET", "/projects/", share=0.1),
+        Scenario("teams", "page", "GET", "/teams/?limit=50"),
+        Scenario("teams", "available-leaders", "GET", "/teams/available-leaders/"),
+        Scenario("logic", "statistics", "GET", "/logic/statistics"),
+        Scenario("logic", "project-count", "GET", "/logic/project-count"),
+        Scenario("logic", "payroll-total", "GET", "/logic/payroll-total"),
+        Scenario("logic", "top-earners", "GET", "/logic/top-earners"),
+        Scenario("logic", "salaries-page", "GET", "/logic/salaries?limit=100"),
+        Scenario("logic", "framework-programmers", "GET", "/logic/framework-programmers/Django"),
+        Scenario("logic", "programmer-project", "GET", f"/logic/programmer-project/{programmer_id}"),
+        Scenario("jobs", "status", "GET", f"/jobs/{job_id}"),
+    ]
+
+class RssSampler:
+    """Pico de memoria residente (MB) mientras dura el bloque."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.peak = 0.0
+        self._stop = threading.Event()
+
+    @staticmethod
+    def current() -> Optional[float]:
+        try:
+            with open("/proc/self/status") as status:
+                for line in status:
+                    if line.startswith("VmRSS:"):
+                        return int(line.split()[1]) / 1024
+        except OSError:
+            return None
+        return None
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self.current() or 0.0)
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        if self.current() is None:
+            self._thread = None
+        else:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        if self._thread is None:
+            # Sin /proc: pico de todo el proceso (KiB en Linux, bytes en macOS)
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            self.peak = peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+        else:
+            self._stop.set()
+            self._thread.join()
+
+async def run_scenario(client, scenario: Scenario, headers: dict, requests: int, concurrency: int) -> dict:
+    latencies = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.request(scenario.method, scenario.path, headers=headers, data=scenario.data)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    count = max(1, int(requests * scenario.share))
+    with RssSampler() as rss:
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(count)))
+        elapsed = time.perf_counter() - start
+    return {
+        "router": scenario.router,
+        "name": scenario.name,
+        "method": scenario.method,
+        "path": scenario.path,
+        "requests": count,
+        "errors": errors,
+        "rps": count / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "peak_rss_mb": rss.peak,
+    }
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(results: List[dict], baseline: dict, tolerance: float) -> List[str]:
+    """Escenarios más lentos que en `baseline` por encima de la tolerancia."""
+    previous = {f"{r['router']}:{r['name']}": r for r in baseline["results"]}
+    regressions = []
+    for result in results:
+        key = f"{result['router']}:{result['name']}"
+        before = previous.get(key)
+        if before is None:
+            continue
+        if result["rps"] < before["rps"] * (1 - tolerance):
+            regressions.append(f"{key}: {before['rps']:.1f} → {result['rps']:.1f} pet/s")
+        if result["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{key}: p95 {before['p95_ms']:.1f} → {result['p95_ms']:.1f} ms")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=10000, help="de 1000 a 1000000")
+    parser.add_argument("--seed", type=int, default=43)
+    parser.add_argument("--team-size", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200, help="peticiones por escenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--only", help="routers separados por comas (auth,workers,projects,teams,logic,jobs)")
+    parser.add_argument("--cold", action="store_true", help="sin cachés de resultados ni de compresión")
+    parser.add_argument("--output", help="fichero JSON de resultados")
+    parser.add_argument("--compare", help="JSON de una ejecución anterior")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        # La aplicación lee la configuración al importarse
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(directory, 'suite.db')}"
+        os.environ.setdefault("DB_POOL_SIZE", str(args.concurrency))
+        if args.cold:
+            os.environ["CACHE_MAX_ENTRIES"] = "0"
+            os.environ["COMPRESSION_CACHE_BYTES"] = "0"
+        import httpx
+        from app.core import hashing
+        from app.core.database import SessionLocal, create_tables, engine
+        from app.core.security import create_access_token, get_password_hash
+        from app.main import app
+        from app.models.user import User
+        from app.services import jobs
+        from benchmarks.synthetic import populate
+
+        create_tables(engine)
+        start = time.perf_counter()
+        info = populate(engine, workers=args.workers, team_size=args.team_size, seed=args.seed)
+        print(f"datos: {info} en {time.perf_counter() - start:.1f} s")
+        with SessionLocal() as db:
+            db.add(User(username="bench", email="bench@example.com",
+                        hashed_password=get_password_hash("bench"), role="admin"))
+            db.commit()
+        headers = {"Authorization": "Bearer " + create_access_token(subject="bench", role="admin")}
+        routers = set(args.only.split(",")) if args.only else None
+
+        async def run_all():
+            # Un error 500 cuenta como error del escenario, no detiene la suite
+            transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+                job = (await client.post("/jobs/payroll-report", headers=headers)).json()
+                results = []
+                for scenario in scenarios(info, job["id"]):
+                    if routers and scenario.router not in routers:
+                        continue
+                    result = await run_scenario(client, scenario, headers, args.requests, args.concurrency)
+                    results.append(result)
+                    print(
+                        f"{scenario.key:<32} {result['rps']:>8.1f} pet/s  p50={result['p50_ms']:>8.1f}  "
+                        f"p95={result['p95_ms']:>8.1f}  p99={result['p99_ms']:>8.1f} ms  "
+                        f"RSS={result['peak_rss_mb']:>7.1f} MB" + (f"  errores={result['errors']}" if result["errors"] else "")
+                    )
+                return results
+
+        try:
+            results = asyncio.run(run_all())
+        finally:
+            jobs.shutdown()
+            hashing.shutdown()
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "workers": args.workers,
+            "seed": args.seed,
+            "team_size": args.team_size,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "cold": args.cold,
+            "data": info,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("Regresiones:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+        print("Sin regresiones")
+
+if __name__ == "__main__":
+    main()
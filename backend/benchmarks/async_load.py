@@ -0,0 +1,102 @@
+"""
+Latencia de endpoints autenticados con muchos clientes concurrentes.
+
+Compara la dependencia de autenticación original (declarada `async` pero
+con una consulta síncrona que bloquea el bucle de eventos) con la actual
+basada en AsyncSession, lanzando `--clients` peticiones simultáneas contra
+la aplicación en proceso:
+
+    python -m benchmarks.async_load --clients 500 --rounds 5
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+def percentile(values, pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+async def run_load(app, path: str, headers: dict, clients: int, rounds: int):
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    latencies = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one():
+            start = time.perf_counter()
+            response = await client.get(path, headers=headers)
+            latencies.append(time.perf_counter() - start)
+            assert response.status_code == 200, response.text
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            await asyncio.gather(*(one() for _ in range(clients)))
+        elapsed = time.perf_counter() - start
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50": statistics.median(latencies) * 1000,
+        "p99": percentile(latencies, 99) * 1000,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        # La aplicación lee la configuración al importarse. El pool síncrono
+        # tiene una conexión por cliente: con menos, la versión original agota
+        # el pool esperando en el propio bucle de eventos y se queda bloqueada.
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(directory, 'load.db')}"
+        os.environ["DB_POOL_SIZE"] = str(args.clients)
+        from fastapi import Depends
+        from sqlalchemy.orm import Session
+        from app.core import deps
+        from app.core.database import SessionLocal, create_tables, engine, get_db
+        from app.core.security import create_access_token, get_password_hash
+        from app.crud.user import get_user_by_username
+        from app.main import app
+        from app.models.user import User
+        from benchmarks.synthetic import populate
+
+        create_tables(engine)
+        populate(engine, workers=args.workers)
+        with SessionLocal() as db:
+            db.add(User(username="bench", email="bench@example.com",
+                        hashed_password=get_password_hash("bench"), role="admin"))
+            db.commit()
+        headers = {"Authorization": "Bearer " + create_access_token(subject="bench", role="admin")}
+
+        async def blocking_current_user(
+            db: Session = Depends(get_db), token: str = Depends(deps.oauth2_scheme)
+        ):
+            """Dependencia original: consulta síncrona dentro de una función async."""
+            from jose import jwt
+            from app.core.security import ALGORITHM, SECRET_KEY
+
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+            return get_user_by_username(db, username=payload.get("sub"))
+
+        async def compare():
+            # Un único bucle de eventos: el pool asíncrono queda ligado a él
+            for path in ("/auth/me", "/teams/available-leaders/"):
+                for name in ("original", "asíncrono"):
+                    if name == "original":
+                        app.dependency_overrides[deps.get_current_user] = blocking_current_user
+                    result = await run_load(app, path, headers, args.clients, args.rounds)
+                    app.dependency_overrides.clear()
+                    print(
+                        f"{path:<28} {name:<10} {result['rps']:>8.0f} pet/s  "
+                        f"p50={result['p50']:>8.1f} ms  p99={result['p99']:>8.1f} ms"
+                    )
+
+        asyncio.run(compare())
+
+if __name__ == "__main__":
+    main()
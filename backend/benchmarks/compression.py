@@ -0,0 +1,56 @@
+"""
+Tamaño y tiempo de las listas grandes según la codificación negociada.
+
+Para cada Accept-Encoding pide `/workers/programmers` y `/workers/leaders`
+completos; la primera petición comprime y las siguientes, con el mismo
+ETag, salen de la caché de respuestas comprimidas:
+
+    python -m benchmarks.compression --workers 20000 --repeat 5
+"""
+import argparse
+import os
+import tempfile
+import time
+
+URLS = ["/workers/programmers", "/workers/leaders"]
+ENCODINGS = ["identity", "gzip", "br", "zstd"]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(directory, 'compression.db')}"
+        from fastapi.testclient import TestClient
+        from app.core.database import create_tables, engine
+        from app.main import app
+        from app.utils.compression import CODECS, compressed_cache
+        from benchmarks.synthetic import populate
+
+        create_tables(engine)
+        populate(engine, workers=args.workers)
+        client = TestClient(app)
+
+        print(f"{'url':<22} {'codificación':<12} {'bytes':>10} {'1ª ms':>8} {'caché ms':>9}")
+        for url in URLS:
+            for encoding in ENCODINGS:
+                if encoding != "identity" and encoding not in CODECS:
+                    print(f"{url:<22} {encoding:<12} {'(no instalado)':>10}")
+                    continue
+                headers = {"Accept-Encoding": encoding}
+                compressed_cache.clear()
+                timings = []
+                for _ in range(args.repeat + 1):
+                    start = time.perf_counter()
+                    # stream() para medir los bytes tal como llegan, sin descomprimir
+                    with client.stream("GET", url, headers=headers) as response:
+                        size = sum(len(chunk) for chunk in response.iter_raw())
+                    timings.append((time.perf_counter() - start) * 1000)
+                cached = sum(timings[1:]) / args.repeat
+                print(f"{url:<22} {encoding:<12} {size:>10} {timings[0]:>8.1f} {cached:>9.1f}")
+        print(compressed_cache.stats())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Bytes y CPU por petición de las colecciones sin cambios, con y sin ETag.
+
+Pide cada colección completa `--repeat` veces como lo hace hoy el frontend
+(sin If-None-Match) y revalidando con el ETag de la primera respuesta:
+
+    python -m benchmarks.conditional_get --workers 20000 --repeat 20
+"""
+import argparse
+import os
+import tempfile
+import time
+
+COLLECTIONS = ["/projects/", "/workers/programmers", "/workers/leaders"]
+
+def measure(client, url: str, repeat: int, etag=None) -> dict:
+    headers = {"If-None-Match": etag} if etag else {}
+    received = 0
+    cpu = time.process_time()
+    wall = time.perf_counter()
+    for _ in range(repeat):
+        response = client.get(url, headers=headers)
+        assert response.status_code == (304 if etag else 200), response.status_code
+        received += len(response.content)
+    return {
+        "bytes": received / repeat,
+        "cpu_ms": (time.process_time() - cpu) / repeat * 1000,
+        "wall_ms": (time.perf_counter() - wall) / repeat * 1000,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(directory, 'etag.db')}"
+        from fastapi.testclient import TestClient
+        from app.core.database import create_tables, engine
+        from app.main import app
+        from benchmarks.synthetic import populate
+
+        create_tables(engine)
+        populate(engine, workers=args.workers)
+        client = TestClient(app)
+
+        print(f"{'colección':<22} {'modo':<8} {'bytes/pet':>12} {'CPU ms/pet':>11} {'ms/pet':>9}")
+        for url in COLLECTIONS:
+            etag = client.get(url).headers["ETag"]
+            for mode, tag in (("200", None), ("304", etag)):
+                result = measure(client, url, args.repeat, tag)
+                print(f"{url:<22} {mode:<8} {result['bytes']:>12.0f} {result['cpu_ms']:>11.2f} {result['wall_ms']:>9.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Lecturas de los endpoints de /logic con y sin la caché de app.core.cache.
+
+Cada ronda pide `--reads` veces los endpoints de lectura y luego modifica un
+proyecto (commit), así que cada ronda invalida la caché una vez. Comprueba
+además que tras cada escritura la respuesta coincide con la calculada sin
+caché, también tras crear un equipo con sus programadores:
+
+    python -m benchmarks.logic_cache --workers 5000 --rounds 20 --reads 200
+"""
+import argparse
+import os
+import tempfile
+import time
+
+ENDPOINTS = [
+    "/logic/earliest-project",
+    "/logic/top-earners",
+    "/logic/payroll-total",
+    "/logic/framework-programmers/Django",
+]
+
+def run_rounds(client, db_factory, rounds: int, reads: int, check=None) -> float:
+    from app.models.project import Project
+
+    start = time.perf_counter()
+    for round_ in range(rounds):
+        for i in range(reads):
+            response = client.get(ENDPOINTS[i % len(ENDPOINTS)])
+            assert response.status_code == 200, response.text
+        with db_factory() as db:
+            project = db.get(Project, round_ % 50 + 1)
+            project.estimated_time = project.estimated_time % 700 + 1
+            project.price += 1
+            db.commit()
+        if check:
+            check()
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--reads", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(directory, 'logic.db')}"
+        from fastapi.testclient import TestClient
+        from app.core.cache import result_cache
+        from app.core.database import SessionLocal, create_tables, engine
+        from app.main import app
+        from benchmarks.synthetic import populate
+
+        create_tables(engine)
+        populate(engine, workers=args.workers)
+        client = TestClient(app)
+        maxsize = result_cache.maxsize
+
+        def check():
+            """Tras la escritura, la caché debe dar lo mismo que un cálculo nuevo."""
+            cached = [client.get(url).json() for url in ENDPOINTS]
+            result_cache.maxsize = 0
+            fresh = [client.get(url).json() for url in ENDPOINTS]
+            result_cache.maxsize = maxsize
+            assert cached == fresh, "la caché ha servido datos anteriores a un commit"
+
+        total = args.rounds * args.reads
+        for name, size, round_check in (("sin caché", 0, None), ("con caché", maxsize, check)):
+            result_cache.maxsize = size
+            result_cache.clear()
+            elapsed = run_rounds(client, SessionLocal, args.rounds, args.reads, round_check)
+            print(f"{name:<10} {total / elapsed:>8.1f} lecturas/s  ({elapsed:.2f} s)")
+        print(result_cache.stats())
+        check_new_team(SessionLocal, check)
+
+def check_new_team(db_factory, check):
+    """
+    Un equipo nuevo con sus programadores: la relación team → programmers
+    apunta a una clase con herencia por tablas y el flush debe registrarla.
+    """
+    from app.models.team import Team
+    from app.models.worker import Programmer
+
+    with db_factory() as db:
+        programmers = [
+            Programmer(name=f"Nuevo {i}", age=30, gender="F", base_salary=1000.0, category="A")
+            for i in range(3)
+        ]
+        db.add(Team(programmers=programmers))
+        db.commit()
+    check()
+    print("equipo nuevo con programadores: OK")
+
+if __name__ == "__main__":
+    main()
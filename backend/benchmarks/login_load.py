@@ -0,0 +1,92 @@
+"""
+Inicios de sesión concurrentes y su efecto sobre la latencia del CRUD.
+
+Lanza a la vez una ráfaga de `/auth/login` y `--readers` clientes que piden
+`/projects/` en bucle mientras dura la ráfaga, con bcrypt en el threadpool
+(como antes) y en el pool de procesos de app.core.hashing:
+
+    python -m benchmarks.login_load --logins 64 --readers 16
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from benchmarks.async_load import percentile
+
+async def run_mixed(app, logins: int, readers: int) -> dict:
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    read_times = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        pending = logins
+
+        async def login():
+            nonlocal pending
+            response = await client.post("/auth/login", data={"username": "bench", "password": "bench"})
+            pending -= 1
+            assert response.status_code == 200, response.text
+
+        async def reader():
+            while pending:
+                start = time.perf_counter()
+                response = await client.get("/projects/?limit=50")
+                read_times.append(time.perf_counter() - start)
+                assert response.status_code == 200, response.text
+
+        start = time.perf_counter()
+        await asyncio.gather(*[login() for _ in range(logins)], *[reader() for _ in range(readers)])
+        elapsed = time.perf_counter() - start
+    return {
+        "logins_per_s": logins / elapsed,
+        "reads": len(read_times),
+        "read_p50": statistics.median(read_times) * 1000,
+        "read_p99": percentile(read_times, 99) * 1000,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--readers", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(directory, 'login.db')}"
+        from fastapi.concurrency import run_in_threadpool
+        from app.core import hashing
+        from app.core.database import SessionLocal, create_tables, engine
+        from app.core.security import get_password_hash
+        from app.main import app
+        from app.models.user import User
+        from benchmarks.synthetic import populate
+
+        create_tables(engine)
+        populate(engine, workers=args.workers)
+        with SessionLocal() as db:
+            db.add(User(username="bench", email="bench@example.com",
+                        hashed_password=get_password_hash("bench"), role="admin"))
+            db.commit()
+
+        async def threadpool_run(func, *func_args):
+            """bcrypt en el threadpool, como antes del pool de procesos."""
+            return await run_in_threadpool(func, *func_args)
+
+        process_run = hashing._run
+        async def compare():
+            for name, runner in (("threadpool", threadpool_run), ("procesos", process_run)):
+                hashing._run = runner
+                result = await run_mixed(app, args.logins, args.readers)
+                print(
+                    f"{name:<11} logins/s={result['logins_per_s']:>6.1f}  "
+                    f"/projects/ n={result['reads']:>5}  p50={result['read_p50']:>7.1f} ms  p99={result['read_p99']:>7.1f} ms"
+                )
+            hashing._run = process_run
+            hashing.shutdown()
+
+        asyncio.run(compare())
+
+if __name__ == "__main__":
+    main()
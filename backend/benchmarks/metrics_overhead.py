@@ -0,0 +1,69 @@
+"""
+Coste de MetricsMiddleware por petición.
+
+Envuelve una aplicación ASGI mínima (responde sin hacer nada más, con la
+ruta ya resuelta como haría el router) y la llama directamente, con y sin
+el middleware, sin httpx ni servidor: a esta escala su ruido taparía lo que
+se mide. Las rondas se alternan y se toma la mejor de cada variante. También
+mide `render()` con las series ya creadas:
+
+    python -m benchmarks.metrics_overhead --requests 200000
+"""
+import argparse
+import asyncio
+import time
+
+class _Route:
+    path = "/ping/{item}"
+
+_ROUTE = _Route()
+_START = {"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain")]}
+_BODY = {"type": "http.response.body", "body": b"pong"}
+
+async def endpoint(scope, receive, send):
+    scope["route"] = _ROUTE
+    await send(_START)
+    await send(_BODY)
+
+async def _receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+async def _send(message):
+    pass
+
+async def per_request(app, requests: int) -> float:
+    scope = {"type": "http", "method": "GET", "path": "/ping/1"}
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), _receive, _send)
+    return (time.perf_counter() - start) / requests
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=200000)
+    parser.add_argument("--rounds", type=int, default=7)
+    args = parser.parse_args()
+
+    from app.core import metrics
+
+    async def run():
+        instrumented = metrics.MetricsMiddleware(endpoint)
+        base = with_metrics = float("inf")
+        for _ in range(args.rounds):
+            base = min(base, await per_request(endpoint, args.requests))
+            with_metrics = min(with_metrics, await per_request(instrumented, args.requests))
+        # render() lee el threadpool de anyio: necesita el bucle en marcha.
+        # La primera llamada importa los módulos de las cachés y bcrypt.
+        metrics.render()
+        start = time.perf_counter()
+        text = metrics.render()
+        return base, with_metrics, time.perf_counter() - start, text
+
+    base, with_metrics, render_time, text = asyncio.run(run())
+    print(f"sin métricas: {base * 1e6:8.2f} µs/petición")
+    print(f"con métricas: {with_metrics * 1e6:8.2f} µs/petición")
+    print(f"coste:        {(with_metrics - base) * 1e6:8.2f} µs/petición")
+    print(f"render():     {render_time * 1000:8.2f} ms ({len(text.splitlines())} líneas)")
+
+if __name__ == "__main__":
+    main()
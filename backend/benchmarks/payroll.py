@@ -0,0 +1,62 @@
+"""
+Paridad y tiempos del cálculo de nómina.
+
+Compara el motor de nómina basado en consultas agregadas con el bucle
+original por trabajador sobre un conjunto sintético grande:
+
+    python -m benchmarks.payroll --workers 50000
+"""
+import argparse
+import time
+from sqlalchemy.orm import sessionmaker
+from app.models.worker import Worker, Programmer, Leader
+from app.services import payroll
+from benchmarks.synthetic import make_engine, populate
+
+def reference_total_payroll(db):
+    """Bucle original por trabajador, usado como referencia."""
+    total = 0
+    workers = db.query(Worker).all()
+    for w in workers:
+        if isinstance(w, Programmer):
+            if w.team and w.team.project:
+                bonus = 0.05 * w.team.project.price + 3 * len(w.languages)
+                total += w.base_salary + bonus
+            else:
+                total += w.base_salary
+        elif isinstance(w, Leader):
+            if w.team and w.team.project:
+                bonus = 0.10 * w.team.project.price + 5 * w.experience_years
+                total += w.base_salary + bonus
+            else:
+                total += w.base_salary
+    return total
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=50000)
+    parser.add_argument("--seed", type=int, default=43)
+    args = parser.parse_args()
+
+    engine = make_engine()
+    populate(engine, workers=args.workers, seed=args.seed)
+    Session = sessionmaker(bind=engine)
+
+    with Session() as db:
+        start = time.perf_counter()
+        expected = reference_total_payroll(db)
+        loop_time = time.perf_counter() - start
+
+    with Session() as db:
+        start = time.perf_counter()
+        total = payroll.total_payroll(db)
+        engine_time = time.perf_counter() - start
+
+    print(f"bucle por trabajador: {expected!r} en {loop_time:.3f}s")
+    print(f"consulta agregada:    {total!r} en {engine_time:.3f}s")
+    if total != expected:
+        raise SystemExit("ERROR: los totales no coinciden")
+    print("OK: resultados idénticos")
+
+if __name__ == "__main__":
+    main()
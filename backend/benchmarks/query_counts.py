@@ -0,0 +1,81 @@
+"""
+Comprueba que los listados ejecutan un número constante de consultas.
+
+Carga los listados con dos tamaños de datos distintos y falla si el número
+de sentencias SQL crece con el número de filas (problema N+1):
+
+    python -m benchmarks.query_counts
+"""
+import os
+import tempfile
+from fastapi.testclient import TestClient
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+from app.core.database import get_async_db, get_db, make_async_engine
+from app.crud import team as crud_team
+from app.main import app
+from app.utils.query_counter import assert_max_queries
+from benchmarks.synthetic import make_engine, populate
+
+# Máximo de sentencias por listado, independiente del tamaño.
+BUDGETS = {
+    "/workers/programmers": 2,  # programadores + lenguajes
+    "/workers/leaders": 1,
+    "/projects/": 1,
+    "crud_team.get_all_teams": 4,  # equipos (+ proyecto) + líderes + programadores + lenguajes
+}
+
+def _touch_team(team):
+    """Recorre lo mismo que serializa TeamOut."""
+    team.leader, team.project
+    for programmer in team.programmers:
+        list(programmer.languages)
+
+def check(workers: int, directory: str):
+    # En disco: los endpoints asíncronos abren su propio motor (aiosqlite)
+    # sobre la misma base de datos.
+    url = f"sqlite:///{os.path.join(directory, f'query_counts_{workers}.db')}"
+    engine = make_engine(url)
+    populate(engine, workers=workers)
+    Session = sessionmaker(bind=engine)
+    async_engine = make_async_engine(url, "default")
+
+    def override_get_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_get_async_db():
+        from sqlalchemy.ext.asyncio import AsyncSession
+
+        async with AsyncSession(async_engine, expire_on_commit=False) as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    client = TestClient(app)
+    try:
+        for path, budget in BUDGETS.items():
+            if not path.startswith("/"):
+                continue
+            # Se cuentan las sentencias de los dos motores (síncrono y asíncrono)
+            with assert_max_queries(Engine, budget) as counter:
+                assert client.get(path).status_code == 200
+            print(f"{workers:>6} trabajadores  {path:<28} {counter.count} consultas")
+
+        with Session() as db, assert_max_queries(engine, BUDGETS["crud_team.get_all_teams"]) as counter:
+            for team in crud_team.get_all_teams(db):
+                _touch_team(team)
+        print(f"{workers:>6} trabajadores  {'crud_team.get_all_teams':<28} {counter.count} consultas")
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        app.dependency_overrides.pop(get_async_db, None)
+        engine.dispose()
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as directory:
+        for size in (100, 5000):
+            check(size, directory)
+    print("OK")
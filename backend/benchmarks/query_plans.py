@@ -0,0 +1,73 @@
+"""
+Comprueba los planes de las consultas de app.services.logic y app.crud.
+
+Ejecuta cada función sobre un conjunto sintético y falla si alguna consulta
+recorre entera una tabla de más de `--min-rows` filas sin que esté previsto
+(los listados completos y los agregados de nómina leen tablas enteras por
+diseño y se declaran en `allow`):
+
+    python -m benchmarks.query_plans --workers 20000
+"""
+import argparse
+import sys
+from sqlalchemy.orm import sessionmaker
+from app.core.database import update_statistics
+from app.crud import project as crud_project
+from app.crud import team as crud_team
+from app.crud import user as crud_user
+from app.crud import worker as crud_worker
+from app.services import logic
+from app.utils.query_plan import check_query_plans
+from benchmarks.synthetic import make_engine, populate
+
+# (nombre, función(db), tablas que puede recorrer enteras)
+CHECKS = [
+    ("logic.count_projects_by_type", logic.count_projects_by_type, ()),
+    ("logic.get_statistics", logic.get_statistics, ("projects", "workers", "programmers", "leaders", "teams")),
+    ("logic.get_earliest_project", logic.get_earliest_project, ()),
+    ("logic.calculate_total_payroll", logic.calculate_total_payroll, ("workers",)),
+    ("logic.get_highest_paid_workers", logic.get_highest_paid_workers, ("workers",)),
+    ("logic.get_salary_report(limit=10)", lambda db: logic.get_salary_report(db, limit=10), ("workers",)),
+    ("logic.get_project_by_programmer_id", lambda db: logic.get_project_by_programmer_id(db, 2), ()),
+    ("logic.get_programmers_by_project_id", lambda db: logic.get_programmers_by_project_id(db, 1), ()),
+    ("logic.get_programmers_by_framework", lambda db: logic.get_programmers_by_framework(db, "Django"), ()),
+    ("crud_project.get_all_projects(limit=50)", lambda db: crud_project.get_all_projects(db, limit=50), ()),
+    ("crud_project.get_all_projects(type)", lambda db: crud_project.get_all_projects(db, type="gestion", limit=50), ()),
+    ("crud_project.get_project_rows(limit=50)", lambda db: crud_project.get_project_rows(db, limit=50), ()),
+    ("crud_project.get_project_by_id", lambda db: crud_project.get_project_by_id(db, 1), ()),
+    ("crud_worker.get_all_programmers(limit=50)", lambda db: crud_worker.get_all_programmers(db, limit=50), ()),
+    ("crud_worker.get_programmer_rows(limit=50)", lambda db: crud_worker.get_programmer_rows(db, limit=50), ()),
+    ("crud_worker.get_leader_rows(limit=50)", lambda db: crud_worker.get_leader_rows(db, limit=50), ()),
+    ("crud_worker.get_all_leaders(limit=50)", lambda db: crud_worker.get_all_leaders(db, limit=50), ()),
+    ("crud_worker.get_programmer_by_id", lambda db: crud_worker.get_programmer_by_id(db, 2), ()),
+    ("crud_worker.get_leader_by_id", lambda db: crud_worker.get_leader_by_id(db, 1), ()),
+    ("crud_team.get_all_teams(limit=50)", lambda db: crud_team.get_all_teams(db, limit=50), ()),
+    ("crud_team.get_team_by_id", lambda db: crud_team.get_team_by_id(db, 1), ()),
+    ("crud_user.get_user_by_username", lambda db: crud_user.get_user_by_username(db, "admin"), ()),
+]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=20000)
+    parser.add_argument("--min-rows", type=int, default=1000)
+    args = parser.parse_args()
+
+    engine = make_engine()
+    populate(engine, workers=args.workers)
+    update_statistics(engine)
+    Session = sessionmaker(bind=engine)
+
+    failures = 0
+    for name, func, allow in CHECKS:
+        try:
+            with Session() as db, check_query_plans(engine, args.min_rows, allow) as checker:
+                func(db)
+            print(f"OK    {name} ({len(checker.statements)} consultas)")
+        except AssertionError as e:
+            failures += 1
+            print(f"FALLO {name}\n{e}")
+    if failures:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
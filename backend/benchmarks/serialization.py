@@ -0,0 +1,70 @@
+"""
+Listado de programadores: camino response_model (objetos ORM validados con
+ProgrammerOut) frente a filas leídas como dicts y codificadas con orjson
+(app.utils.fast_json), a 1k, 10k y 100k filas:
+
+    python -m benchmarks.serialization --sizes 1000,10000,100000
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+def build_app(SessionLocal):
+    from fastapi import Depends, FastAPI
+    from app.crud import worker as crud_worker
+    from app.schemas.worker import ProgrammerOut
+    from app.utils.pagination import rows_response
+
+    app = FastAPI()
+
+    def get_db():
+        with SessionLocal() as db:
+            yield db
+
+    @app.get("/response-model", response_model=list[ProgrammerOut])
+    def response_model(limit: int, db=Depends(get_db)):
+        return crud_worker.get_all_programmers(db, limit=limit)
+
+    @app.get("/fast", response_model=list[ProgrammerOut])
+    def fast(limit: int, db=Depends(get_db)):
+        return rows_response(crud_worker.get_programmer_rows(db, limit=limit), None, ProgrammerOut, None)
+
+    return app
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(directory, 'serialization.db')}"
+        from fastapi.testclient import TestClient
+        from app.core.database import SessionLocal, create_tables, engine
+        from app.utils import fast_json
+        from benchmarks.synthetic import populate
+
+        create_tables(engine)
+        # ~89 % de los trabajadores sintéticos son programadores
+        populate(engine, workers=int(max(sizes) * 1.15))
+        client = TestClient(build_app(SessionLocal))
+
+        print(f"codificador: {'orjson' if fast_json.orjson else 'json'}")
+        print(f"{'filas':>7} {'camino':<15} {'filas/s':>10} {'ms/pet':>9}")
+        for size in sizes:
+            bodies = {}
+            for path in ("/response-model", "/fast"):
+                start = time.perf_counter()
+                for _ in range(args.repeat):
+                    response = client.get(path, params={"limit": size})
+                    assert response.status_code == 200, response.text
+                elapsed = (time.perf_counter() - start) / args.repeat
+                bodies[path] = json.loads(response.content)
+                print(f"{size:>7} {path:<15} {size / elapsed:>10.0f} {elapsed * 1000:>9.1f}")
+            assert bodies["/response-model"] == bodies["/fast"], "las respuestas no coinciden"
+
+if __name__ == "__main__":
+    main()
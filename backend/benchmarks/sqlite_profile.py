@@ -0,0 +1,95 @@
+"""
+Rendimiento de lectura/escritura concurrente según el perfil de SQLite.
+
+Compara el motor original (diario de rollback, sin PRAGMA) con el perfil
+`production` de app.core.database sobre una base en disco: varios hilos leen
+listas de proyectos mientras otros insertan y hacen commit, como en la API.
+
+    python -m benchmarks.sqlite_profile --workers 5000 --threads 16 --seconds 10
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from app.core import database
+from app.models import Project
+from benchmarks.synthetic import make_engine, populate
+
+def baseline_engine(url: str):
+    """Motor tal como se creaba antes del perfil de ajuste."""
+    return create_engine(url, connect_args={"check_same_thread": False})
+
+def run_workload(engine, threads: int, writers: int, seconds: float) -> dict:
+    Session = sessionmaker(bind=engine)
+    counts = {"reads": 0, "writes": 0, "errors": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def reader():
+        while time.perf_counter() < deadline:
+            try:
+                with Session() as db:
+                    db.query(Project).filter(Project.type == "gestion").order_by(Project.id).limit(50).all()
+                key = "reads"
+            except OperationalError:
+                key = "errors"
+            with lock:
+                counts[key] += 1
+
+    def writer(n: int):
+        i = 0
+        while time.perf_counter() < deadline:
+            i += 1
+            try:
+                with Session() as db:
+                    db.add(Project(
+                        name=f"bench-{n}-{i}", description=None, estimated_time=10,
+                        price=1000.0, type="multimedia", is_flash=False, is_director=False,
+                    ))
+                    db.commit()
+                key = "writes"
+            except OperationalError:
+                key = "errors"
+            with lock:
+                counts[key] += 1
+
+    pool = [threading.Thread(target=writer, args=(n,)) for n in range(writers)]
+    pool += [threading.Thread(target=reader) for _ in range(threads - writers)]
+    start = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - start
+    return {
+        "reads_per_s": round(counts["reads"] / elapsed, 1),
+        "writes_per_s": round(counts["writes"] / elapsed, 1),
+        "errors": counts["errors"],
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=5000)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in ("original", "production"):
+            url = f"sqlite:///{os.path.join(tmp, name + '.db')}"
+            populate(make_engine(url), workers=args.workers)
+            engine = baseline_engine(url) if name == "original" else database.make_engine(url, "production")
+            result = run_workload(engine, args.threads, args.writers, args.seconds)
+            engine.dispose()
+            print(
+                f"{name:<11} lecturas/s={result['reads_per_s']:>9}  "
+                f"escrituras/s={result['writes_per_s']:>8}  errores={result['errors']}"
+            )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Arranque en frío de un proceso de la API, como el de cada worker nuevo de
+uvicorn.
+
+Genera una vez la base sintética (el caso de un redespliegue: el esquema ya
+existe) y lanza `--repeat` procesos nuevos que importan app.main, ejecutan
+el arranque (lifespan) y sirven una primera petición. Muestra la mediana
+de cada fase y del proceso completo, e indica si passlib y python-jose se
+llegaron a importar:
+
+    python -m benchmarks.startup --workers 100000 --repeat 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Se ejecuta en el proceso hijo; el cliente de pruebas se importa antes de
+# empezar a medir porque no forma parte del arranque de la API
+PROBE = """
+import json, sys, time
+from fastapi.testclient import TestClient
+start = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+with TestClient(app) as client:
+    started = time.perf_counter()
+    status = client.get("/projects/?limit=1").status_code
+    served = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "startup_ms": (started - imported) * 1000,
+    "first_request_ms": (served - started) * 1000,
+    "status": status,
+    "passlib": "passlib" in sys.modules,
+    "jose": "jose" in sys.modules,
+}))
+"""
+
+def run_probe(env: dict) -> dict:
+    start = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE], env=env, capture_output=True, text=True, check=True
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result["process_ms"] = (time.perf_counter() - start) * 1000
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{os.path.join(directory, 'startup.db')}"
+        from app.core.database import create_tables
+        from benchmarks.synthetic import make_engine, populate
+
+        engine = make_engine(url)
+        create_tables(engine)
+        populate(engine, workers=args.workers)
+        engine.dispose()
+
+        env = {**os.environ, "DATABASE_URL": url, "PYTHONWARNINGS": "ignore"}
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [os.getcwd(), env.get("PYTHONPATH")]))
+        # El primer proceso hace la migración (si la hay) y calienta la caché de disco
+        first = run_probe(env)
+        runs = [run_probe(env) for _ in range(args.repeat)]
+
+    print(f"primer arranque: {first['process_ms']:.0f} ms")
+    for key in ("import_ms", "startup_ms", "first_request_ms", "process_ms"):
+        values = [run[key] for run in runs]
+        print(f"{key:<18} mediana {statistics.median(values):8.1f}  mín {min(values):8.1f}")
+    print(f"passlib importado: {runs[-1]['passlib']}  python-jose importado: {runs[-1]['jose']}")
+    assert all(run["status"] == 200 for run in runs), "la primera petición falló"
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Generador determinista de datos sintéticos para benchmarks.
+
+Rellena el esquema de app.models con inserciones masivas (executemany) a
+partir de una semilla, de forma que dos ejecuciones con los mismos
+parámetros producen exactamente la misma base de datos.
+"""
+import random
+from itertools import accumulate
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+from app.core import database
+from app.core.database import Base
+from app.models import Project, Team, Programmer, Leader, Language
+from app.models.worker import Worker, ProgrammerLanguage
+
+LANGUAGES = ["Python", "Java", "C#", "JavaScript", "PHP", "Go", "Ruby", "C++", "Kotlin", "TypeScript"]
+# Popularidad relativa de cada lenguaje entre los programadores
+LANGUAGE_WEIGHTS = [20, 16, 10, 18, 9, 6, 3, 6, 4, 8]
+# Probabilidad de conocer 0, 1, 2, 3 o 4 lenguajes
+LANGUAGE_COUNT_WEIGHTS = [5, 30, 35, 20, 10]
+FRAMEWORKS = ["CodeIgniter", "Symfony", "Laravel", "Django", "Spring"]
+DB_TYPES = ["MySQL", "PostgreSQL", "SQLite", "Oracle"]
+CATEGORIES = ["A", "B", "C"]
+CATEGORY_WEIGHTS = [20, 45, 35]
+GENDERS = ["M", "F"]
+# Programadores generados e insertados por lote, para acotar la memoria
+INSERT_BATCH = 50000
+
+def make_engine(url: str = "sqlite://", profile: str = "default"):
+    """
+    Crea un motor con todas las tablas de la aplicación. Por defecto sin
+    PRAGMA de ajuste, como el motor original.
+    """
+    engine = database.make_engine(url, profile)
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+def populate(
+    engine,
+    workers: int = 1000,
+    team_size: int = 8,
+    seed: int = 43,
+    gestion_ratio: float = 0.6,
+):
+    """
+    Inserta `workers` trabajadores repartidos en equipos de `team_size` de
+    media (entre la mitad y vez y media), con lenguajes y categorías según
+    su popularidad y un `gestion_ratio` de proyectos de gestión.
+
+    Aproximadamente uno de cada `team_size + 1` trabajadores es líder. Parte
+    de los equipos queda sin proyecto y parte de los trabajadores sin equipo,
+    para cubrir también los casos sin bonificación. Los programadores se
+    generan e insertan por lotes, así que escala hasta millones de filas.
+    """
+    rng = random.Random(seed)
+    teams = max(1, workers // (team_size + 1))
+    leaders = teams
+    programmers = workers - leaders
+
+    project_rows = []
+    for i in range(1, teams + 1):
+        is_gestion = rng.random() < gestion_ratio
+        project_rows.append({
+            "id": i,
+            "name": f"Proyecto {i}",
+            "description": None,
+            "estimated_time": rng.randint(10, 720),
+            "price": round(rng.uniform(1000, 250000), 2),
+            "type": "gestion" if is_gestion else "multimedia",
+            "is_flash": None if is_gestion else rng.random() < 0.5,
+            "is_director": None if is_gestion else rng.random() < 0.5,
+            "db_type": rng.choice(DB_TYPES) if is_gestion else None,
+            "language": rng.choice(LANGUAGES) if is_gestion else None,
+            "framework": rng.choice(FRAMEWORKS) if is_gestion else None,
+        })
+
+    worker_rows, leader_rows, team_rows = [], [], []
+    worker_id = 0
+    for t in range(1, teams + 1):
+        worker_id += 1
+        worker_rows.append(_worker(rng, worker_id, "leader"))
+        leader_rows.append({
+            "id": worker_id,
+            "experience_years": rng.randint(1, 30),
+            "directed_projects": rng.randint(0, 20),
+        })
+        # ~10% de equipos sin proyecto asignado
+        project_id = t if rng.random() < 0.9 else None
+        team_rows.append({"id": t, "project_id": project_id, "leader_id": worker_id})
+
+    # Tamaño objetivo de cada equipo: los programadores se reparten en proporción
+    team_ids = list(range(1, teams + 1))
+    team_weights = list(accumulate(rng.randint(max(1, team_size // 2), team_size * 3 // 2) for _ in team_ids))
+    language_ids = list(range(1, len(LANGUAGES) + 1))
+    language_rows = [{"id": i, "name": name} for i, name in zip(language_ids, LANGUAGES)]
+
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        for model, rows in (
+            (Project, project_rows),
+            (Language, language_rows),
+            (Worker, worker_rows),
+            (Leader, leader_rows),
+            (Team, team_rows),
+        ):
+            if rows:
+                db.execute(insert(model.__table__), rows)
+
+        remaining = programmers
+        while remaining > 0:
+            worker_rows, programmer_rows, pl_rows = [], [], []
+            for _ in range(min(INSERT_BATCH, remaining)):
+                worker_id += 1
+                worker_rows.append(_worker(rng, worker_id, "programmer"))
+                # ~5% de programadores sin equipo
+                team_id = rng.choices(team_ids, cum_weights=team_weights)[0] if rng.random() < 0.95 else None
+                programmer_rows.append({
+                    "id": worker_id,
+                    "category": rng.choices(CATEGORIES, weights=CATEGORY_WEIGHTS)[0],
+                    "team_id": team_id,
+                })
+                count = rng.choices(range(len(LANGUAGE_COUNT_WEIGHTS)), weights=LANGUAGE_COUNT_WEIGHTS)[0]
+                known = set()
+                while len(known) < count:
+                    known.add(rng.choices(language_ids, weights=LANGUAGE_WEIGHTS)[0])
+                pl_rows.extend({"programmer_id": worker_id, "language_id": lang} for lang in sorted(known))
+            for model, rows in ((Worker, worker_rows), (Programmer, programmer_rows), (ProgrammerLanguage, pl_rows)):
+                if rows:
+                    db.execute(insert(model.__table__), rows)
+            remaining -= len(programmer_rows)
+        db.commit()
+
+    return {"projects": len(project_rows), "teams": len(team_rows), "workers": worker_id}
+
+def _worker(rng, worker_id: int, worker_type: str) -> dict:
+    return {
+        "id": worker_id,
+        "name": f"Trabajador {worker_id}",
+        "age": rng.randint(20, 65),
+        "gender": rng.choice(GENDERS),
+        "base_salary": round(rng.uniform(800, 6000), 2),
+        "type": worker_type,
+    }
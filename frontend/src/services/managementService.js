@@ -46,7 +46,7 @@ export const managementService = {
   
   // Estadísticas
   getStatistics: async () => {
-    const res = await api.get('/management/statistics');
+    const res = await api.get('/logic/statistics');
     return res.data;
   },
   